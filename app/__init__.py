@@ -1,12 +1,34 @@
-from flask import Flask, jsonify, current_app
+from flask import Flask, jsonify, current_app, has_app_context
 from flask_sqlalchemy import SQLAlchemy
-from flask_jwt_extended import JWTManager
+from flask_sqlalchemy.session import Session
+from flask_jwt_extended import JWTManager, jwt_required
 from flask_cors import CORS
 from flask_mail import Mail
 from config import Config
 
+class RoutingSession(Session):
+    """Session that lets ReplicaRouter send eligible reads to the replica bind.
+    
+    While ``info['defer_commit']`` is set, ``commit()`` only flushes, so the
+    views run by an atomic ``/api/batch`` share one transaction that the
+    batch commits or rolls back at the end.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context():
+            router = current_app.extensions.get('replica_router')
+            if router is not None and router.routes_to_replica(self, clause):
+                return router.engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+    
+    def commit(self):
+        if self.info.get('defer_commit'):
+            self.flush()
+            return
+        super().commit()
+
 # Initialize extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
 mail = Mail()
 
@@ -15,33 +37,79 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
+    # orjson-backed JSON responses when available
+    from app.utils.json_provider import make_json_provider
+    app.json = make_json_provider(app)
+    
     # Initialize extensions with app
     db.init_app(app)
     jwt.init_app(app)
     mail.init_app(app)
     
+    # Routes reads of authenticated GET requests to the read replica, if configured
+    from app.utils.replica import ReplicaRouter
+    ReplicaRouter(app)
+    
+    # Response cache for todo reads (stored in app.extensions)
+    from app.utils.cache import ResponseCache
+    ResponseCache(app)
+    
+    # Cached user identities so authenticated requests skip the users table
+    from app.utils.identity import IdentityCache
+    IdentityCache(app)
+    
+    # gzip/brotli/zstd response compression negotiated from Accept-Encoding
+    from app.utils.compression import Compression
+    Compression(app)
+    
+    # Pooled outbound HTTP session for Google OAuth and certs
+    from app.utils.http import HTTPClient
+    HTTPClient(app)
+    
+    # Password hashing in a bounded process pool
+    from app.utils.passwords import PasswordHasher
+    PasswordHasher(app)
+    
+    # Delivers queued notification email from the outbox table
+    from app.utils.mail_worker import OutboxWorker
+    OutboxWorker(app)
+    
     # Configure CORS
     CORS(app, 
          origins=app.config['CORS_ORIGINS'], 
          supports_credentials=True,
-         allow_headers=['Content-Type', 'Authorization'],
+         allow_headers=['Content-Type', 'Authorization', 'If-None-Match', 'If-Modified-Since'],
+         expose_headers=['ETag', 'Last-Modified'],
          methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'])
     
     # Import and register blueprints
     from app.routes.auth import auth_bp
     from app.routes.todos import todos_bp
+    from app.routes.batch import batch_bp
     
     # Import models to register them with SQLAlchemy
     from app.models import User, Todo
     
     app.register_blueprint(auth_bp, url_prefix='/api')
     app.register_blueprint(todos_bp, url_prefix='/api')
+    app.register_blueprint(batch_bp, url_prefix='/api')
     
     # Add a simple health check endpoint
     @app.route('/')
     def health_check():
         return jsonify({'message': 'Todo API is running!', 'status': 'healthy'})
     
+    # Process-wide counters reveal other users' activity; only for internal deployments
+    if app.config['METRICS_ENABLED']:
+        @app.route('/api/metrics/cache')
+        @jwt_required()
+        def cache_metrics():
+            from app.utils.filters import plan_cache_metrics
+            metrics = app.extensions['response_cache'].metrics()
+            metrics['identity'] = app.extensions['identity_cache'].metrics()
+            metrics['query_plans'] = plan_cache_metrics()
+            return jsonify(metrics)
+    
     @app.route('/api')
     def api_info():
         return jsonify({
@@ -50,7 +118,8 @@ def create_app(config_class=Config):
                 '/api/register',
                 '/api/login',
                 '/api/google-auth',
-                '/api/todos'
+                '/api/todos',
+                '/api/batch'
             ]
         })
     
@@ -1,29 +1,33 @@
+from flask import current_app
 from app import db
-from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 
 class User(db.Model):
     """User model for authentication and todo ownership."""
     __tablename__ = 'users'
     
+    NOTIFICATION_MODES = ['instant', 'digest', 'off']
+    
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(255), nullable=True)
     google_id = db.Column(db.String(100), unique=True, nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # How todo notifications are delivered: instant, digest or off
+    notification_mode = db.Column(db.String(10), default='instant', nullable=False)
     
     # Relationship with todos
     todos = db.relationship('Todo', backref='user', lazy=True, cascade='all, delete-orphan')
     
     def set_password(self, password):
         """Hash and set the user's password."""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = current_app.extensions['password_hasher'].hash(password)
     
     def check_password(self, password):
         """Check if the provided password matches the user's password."""
         if not self.password_hash:
             return False
-        return check_password_hash(self.password_hash, password)
+        return current_app.extensions['password_hasher'].verify(self.password_hash, password)
     
     def to_dict(self):
         """Convert user object to dictionary."""
@@ -39,6 +43,17 @@ class User(db.Model):
 class Todo(db.Model):
     """Todo model for managing user tasks."""
     __tablename__ = 'todos'
+    __table_args__ = (
+        # One index per sort option so keyset pages are index range scans
+        db.Index('ix_todos_user_created_id', 'user_id', 'created_at', 'id'),
+        db.Index('ix_todos_user_updated_id', 'user_id', 'updated_at', 'id'),
+        db.Index('ix_todos_user_title_id', 'user_id', 'title', 'id'),
+        db.Index('ix_todos_user_completed_id', 'user_id', 'completed', 'id'),
+        # Completion filter combined with the default created_at sort
+        db.Index('ix_todos_user_completed_created', 'user_id', 'completed', 'created_at', 'id'),
+        # Completion history for the stats timeline and time-to-complete
+        db.Index('ix_todos_user_completed_at', 'user_id', 'completed_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -46,10 +61,19 @@ class Todo(db.Model):
     completed = db.Column(db.Boolean, default=False, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = db.Column(db.DateTime, nullable=True)
     
     # Foreign key to User
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     
+    def set_completed(self, completed):
+        """Set the completion flag, stamping or clearing completed_at on change."""
+        if completed and not self.completed:
+            self.completed_at = datetime.utcnow()
+        elif not completed:
+            self.completed_at = None
+        self.completed = completed
+    
     def to_dict(self):
         """Convert todo object to dictionary."""
         return {
@@ -62,5 +86,109 @@ class Todo(db.Model):
             'user_id': self.user_id
         }
     
+    @staticmethod
+    def row_to_dict(row):
+        """Convert a result row selecting the to_dict() columns to a dictionary."""
+        return {
+            'id': row.id,
+            'title': row.title,
+            'description': row.description,
+            'completed': row.completed,
+            'created_at': row.created_at.isoformat() if row.created_at else None,
+            'updated_at': row.updated_at.isoformat() if row.updated_at else None,
+            'user_id': row.user_id
+        }
+    
     def __repr__(self):
         return f'<Todo {self.title}>'
+
+class TodoTombstone(db.Model):
+    """Record of a deleted todo, so sync clients can drop their local copy."""
+    __tablename__ = 'todo_tombstones'
+    __table_args__ = (
+        db.Index('ix_todo_tombstones_user_deleted', 'user_id', 'deleted_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    todo_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<TodoTombstone {self.todo_id}>'
+
+class TodoStats(db.Model):
+    """Per-user todo counters, maintained on every todo write."""
+    __tablename__ = 'todo_stats'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    total_count = db.Column(db.Integer, default=0, nullable=False)
+    completed_count = db.Column(db.Integer, default=0, nullable=False)
+    # Bumped on every write to the user's todos; used as the collection ETag
+    version = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert stats row to the /todos/stats response shape."""
+        total = self.total_count
+        completed = self.completed_count
+        completion_rate = (completed / total * 100) if total > 0 else 0
+        return {
+            'total_todos': total,
+            'completed_todos': completed,
+            'pending_todos': total - completed,
+            'completion_rate': round(completion_rate, 2)
+        }
+    
+    def __repr__(self):
+        return f'<TodoStats user={self.user_id} {self.completed_count}/{self.total_count}>'
+
+class PendingNotification(db.Model):
+    """Todo creation event buffered for a user's next digest email."""
+    __tablename__ = 'pending_notifications'
+    __table_args__ = (
+        db.Index('ix_pending_notifications_user_created', 'user_id', 'created_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    todo_title = db.Column(db.String(200), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<PendingNotification {self.user_id} {self.todo_title}>'
+
+class EmailOutbox(db.Model):
+    """Outgoing email queued in the same transaction as the change it reports."""
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        db.Index('ix_email_outbox_status_next', 'status', 'next_attempt_at'),
+        db.Index('ix_email_outbox_claim_token', 'claim_token'),
+    )
+    
+    STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(255), nullable=False)
+    sender = db.Column(db.String(120), nullable=True)
+    recipients = db.Column(db.Text, nullable=False)
+    text_body = db.Column(db.Text, nullable=False)
+    html_body = db.Column(db.Text, nullable=True)
+    status = db.Column(db.String(20), default=STATUS_PENDING, nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    claim_token = db.Column(db.String(36), nullable=True)
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+    
+    def recipient_list(self):
+        """Return the recipients as a list of addresses."""
+        return [address for address in self.recipients.split(',') if address]
+    
+    def __repr__(self):
+        return f'<EmailOutbox {self.id} {self.status}>'
@@ -1,5 +1,6 @@
 # Routes modules
 from .auth import auth_bp
 from .todos import todos_bp
+from .batch import batch_bp
 
-__all__ = ['auth_bp', 'todos_bp']
+__all__ = ['auth_bp', 'todos_bp', 'batch_bp']
@@ -3,6 +3,11 @@ from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identi
 from app import db
 from app.models import User
 from app.utils.google_oauth import GoogleOAuth
+from app.utils.google_certs import verify_google_id_token
+from app.utils.notifications import flush_digest, discard_digest
+from app.utils.identity import get_identity, invalidate_identity
+from app.utils.passwords import PasswordHasherBusy, get_password_hasher
+from app.utils.stats import create_todo_stats
 import re
 
 auth_bp = Blueprint('auth', __name__)
@@ -51,6 +56,8 @@ def register():
         user.set_password(password)
         
         db.session.add(user)
+        db.session.flush()
+        create_todo_stats(user.id)
         db.session.commit()
         
         # Create access token
@@ -62,6 +69,9 @@ def register():
             'user': user.to_dict()
         }), 201
         
+    except PasswordHasherBusy:
+        db.session.rollback()
+        return jsonify({'error': 'Server busy, please retry'}), 503
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Registration error: {str(e)}")
@@ -89,6 +99,9 @@ def login():
         if not user or not user.check_password(password):
             return jsonify({'error': 'Invalid email or password'}), 401
         
+        # Upgrade hashes made with older parameters without delaying the response
+        get_password_hasher().rehash_in_background(user.id, user.password_hash, password)
+        
         # Create access token
         access_token = create_access_token(identity=str(user.id))
         
@@ -98,6 +111,8 @@ def login():
             'user': user.to_dict()
         }), 200
         
+    except PasswordHasherBusy:
+        return jsonify({'error': 'Server busy, please retry'}), 503
     except Exception as e:
         current_app.logger.error(f"Login error: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -156,8 +171,11 @@ def google_callback():
                 # Create new user
                 user = User(email=email.lower(), google_id=google_id)
                 db.session.add(user)
+                db.session.flush()
+                create_todo_stats(user.id)
         
         db.session.commit()
+        invalidate_identity(user.id)
         
         # Create access token
         jwt_token = create_access_token(identity=str(user.id))
@@ -177,14 +195,14 @@ def verify_token():
     """Verify JWT token and return user info."""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        identity = get_identity(current_user_id)
         
-        if not user:
+        if not identity:
             return jsonify({'error': 'User not found'}), 404
         
         return jsonify({
             'valid': True,
-            'user': user.to_dict()
+            'user': identity.to_dict()
         }), 200
         
     except Exception as e:
@@ -197,24 +215,76 @@ def get_current_user():
     """Get current user information."""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        identity = get_identity(current_user_id)
         
-        if not user:
+        if not identity:
             return jsonify({'error': 'User not found'}), 404
         
-        return jsonify({'user': user.to_dict()}), 200
+        return jsonify({'user': identity.to_dict()}), 200
         
     except Exception as e:
         current_app.logger.error(f"Get current user error: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@auth_bp.route('/me/notifications', methods=['GET'])
+@jwt_required()
+def get_notification_settings():
+    """Get the current user's todo notification preference."""
+    try:
+        current_user_id = get_jwt_identity()
+        identity = get_identity(current_user_id)
+        
+        if not identity:
+            return jsonify({'error': 'User not found'}), 404
+        
+        return jsonify({'mode': identity.notification_mode, 'modes': User.NOTIFICATION_MODES}), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Get notification settings error: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@auth_bp.route('/me/notifications', methods=['PUT'])
+@jwt_required()
+def update_notification_settings():
+    """Set how todo notifications are delivered: instant, digest or off."""
+    try:
+        current_user_id = get_jwt_identity()
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        mode = data.get('mode')
+        if mode not in User.NOTIFICATION_MODES:
+            return jsonify({'error': f"Mode must be one of: {', '.join(User.NOTIFICATION_MODES)}"}), 400
+        
+        user = User.query.get(current_user_id)
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        # Leaving digest mode: send what is buffered, or drop it when turning off
+        if user.notification_mode == 'digest' and mode != 'digest':
+            if mode == 'off':
+                discard_digest(user)
+            elif not flush_digest(user):
+                db.session.rollback()
+                return jsonify({'error': 'Notification settings changed concurrently, please retry'}), 409
+        
+        user.notification_mode = mode
+        db.session.commit()
+        invalidate_identity(user.id)
+        
+        return jsonify({'message': 'Notification settings updated', 'mode': mode}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Update notification settings error: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @auth_bp.route('/auth/google-verify', methods=['POST'])
 def google_verify():
     """Verify Google credential and login/register user."""
     try:
-        from google.oauth2 import id_token
-        from google.auth.transport import requests
-        
         data = request.get_json()
         if not data or 'credential' not in data:
             return jsonify({'error': 'Google credential is required'}), 400
@@ -224,19 +294,11 @@ def google_verify():
         
         # Verify the Google ID token
         try:
-            idinfo = id_token.verify_oauth2_token(
-                credential, 
-                requests.Request(), 
-                current_app.config['GOOGLE_CLIENT_ID']
-            )
+            # Certs are cached process-wide for the max-age Google sends
+            idinfo = verify_google_id_token(credential)
             
             current_app.logger.info(f"Token verification successful for email: {idinfo.get('email')}")
             
-            # Check if the token issuer is Google
-            if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
-                current_app.logger.error(f"Invalid issuer: {idinfo['iss']}")
-                raise ValueError('Wrong issuer.')
-                
         except ValueError as e:
             current_app.logger.error(f"Token verification failed: {str(e)}")
             return jsonify({'error': f'Invalid Google token: {str(e)}'}), 400
@@ -259,6 +321,8 @@ def google_verify():
             current_app.logger.info(f"Creating new user for email: {email}")
             user = User(email=email.lower(), google_id=google_id)
             db.session.add(user)
+            db.session.flush()
+            create_todo_stats(user.id)
         else:
             # Update Google ID if not set
             current_app.logger.info(f"Existing user found for email: {email}")
@@ -266,6 +330,7 @@ def google_verify():
                 user.google_id = google_id
         
         db.session.commit()
+        invalidate_identity(user.id)
         
         # Create access token
         access_token = create_access_token(identity=str(user.id))
@@ -0,0 +1,161 @@
+from flask import Blueprint, request, jsonify, current_app, g
+from flask_jwt_extended import jwt_required
+from werkzeug.exceptions import HTTPException
+from app import db
+from app.routes.todos import get_current_user_id
+from app.utils.cache import invalidate_user_cache
+from app.utils.identity import invalidate_identity
+from app.utils.replica import use_primary
+
+batch_bp = Blueprint('batch', __name__)
+
+METHODS = {'GET', 'POST', 'PUT', 'DELETE'}
+
+# Sub-requests may target these blueprints, except for the endpoints below
+BATCH_BLUEPRINTS = {'auth', 'todos'}
+
+# Token-issuing, redirecting and streaming endpoints only make sense as top-level requests
+EXCLUDED_ENDPOINTS = {
+    'auth.register', 'auth.login', 'auth.google_login', 'auth.google_callback',
+    'auth.google_verify', 'todos.import_todos', 'todos.export_todos'
+}
+
+def parse_operations(data):
+    """Validate the ``requests`` list of a batch body.
+    
+    Returns ``(operations, None)`` with normalized method, path and body
+    for each sub-request, or ``(None, error)``.
+    """
+    operations = data.get('requests')
+    if not isinstance(operations, list) or not operations:
+        return None, 'requests must be a non-empty list'
+    limit = current_app.config['BATCH_MAX_OPERATIONS']
+    if len(operations) > limit:
+        return None, f'A batch can contain at most {limit} requests'
+    
+    parsed = []
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            return None, f'Request {index} must be an object'
+        method = str(operation.get('method', 'GET')).upper()
+        path = operation.get('path')
+        if method not in METHODS:
+            return None, f"Request {index}: method must be one of: {', '.join(sorted(METHODS))}"
+        if not isinstance(path, str) or not path.startswith('/api/'):
+            return None, f'Request {index}: path must start with /api/'
+        parsed.append({'method': method, 'path': path, 'body': operation.get('body')})
+    return parsed, None
+
+def resolve(method, path):
+    """Match a sub-request to an endpoint.
+    
+    Returns ``(endpoint, None)`` or ``(None, result)`` with the error result
+    to report for the sub-request.
+    """
+    adapter = current_app.url_map.bind('')
+    try:
+        endpoint, _ = adapter.match(path.partition('?')[0], method)
+    except HTTPException as e:
+        return None, {'status': e.code, 'body': {'error': e.name}}
+    if endpoint.partition('.')[0] not in BATCH_BLUEPRINTS or endpoint in EXCLUDED_ENDPOINTS:
+        return None, {'status': 400, 'body': {'error': 'This endpoint cannot be used in a batch'}}
+    return endpoint, None
+
+def run_operation(operation, headers):
+    """Dispatch one sub-request inside the current app context.
+    
+    The database session, ``g`` and the caller's token are shared with the
+    batch request. ``after_request`` hooks are not run, so sub-responses
+    are never compressed on their own.
+    """
+    _, error = resolve(operation['method'], operation['path'])
+    if error is not None:
+        return error
+    
+    # Set per request by conditional_response; must not leak between sub-requests
+    g.pop('resource_version', None)
+    g.pop('skip_response_cache', None)
+    with current_app.test_request_context(operation['path'], method=operation['method'],
+                                          json=operation['body'], headers=headers,
+                                          base_url=request.host_url):
+        try:
+            try:
+                rv = current_app.dispatch_request()
+            except Exception as e:
+                rv = current_app.handle_user_exception(e)
+            response = current_app.make_response(rv)
+        except Exception as e:
+            current_app.logger.error(f"Batch sub-request {operation['method']} {operation['path']} failed: {str(e)}")
+            return {'status': 500, 'body': {'error': 'Internal server error'}}
+    
+    body = response.get_json(silent=True) if response.is_json else response.get_data(as_text=True)
+    return {'status': response.status_code, 'body': body}
+
+@batch_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def run_batch():
+    """Run several API requests in one round trip.
+    
+    Sub-requests run in order with the caller's credentials. With
+    ``atomic: true`` they share one transaction: the first failing
+    sub-request stops the batch and rolls back every earlier write.
+    """
+    session = db.session
+    try:
+        user_id = get_current_user_id()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        operations, error = parse_operations(data)
+        if error:
+            return jsonify({'error': error}), 400
+        atomic = data.get('atomic', False)
+        if not isinstance(atomic, bool):
+            return jsonify({'error': 'Atomic must be a boolean value'}), 400
+        
+        headers = {
+            'Authorization': request.headers['Authorization'],
+            'Accept': 'application/json',
+            'Accept-Encoding': 'identity'
+        }
+        results = []
+        
+        if not atomic:
+            for operation in operations:
+                # Let each sub-request make its own replica decision
+                session.info.pop('use_replica', None)
+                results.append(run_operation(operation, headers))
+            return jsonify({'results': results, 'atomic': False})
+        
+        use_primary()
+        session.info['defer_commit'] = True
+        try:
+            for operation in operations:
+                result = run_operation(operation, headers)
+                results.append(result)
+                if result['status'] >= 400:
+                    break
+        finally:
+            session.info.pop('defer_commit', None)
+        
+        committed = results[-1]['status'] < 400
+        if committed:
+            session.commit()
+        else:
+            session.rollback()
+            # Earlier results describe writes that no longer exist
+            failed = len(results) - 1
+            results = [{'status': 424, 'body': {'error': 'Rolled back: a later request failed'}}
+                       for _ in range(failed)] + results[failed:]
+            results += [{'status': 424, 'body': {'error': 'Not run: an earlier request failed'}}
+                        for _ in range(len(operations) - len(results))]
+        
+        # Sub-requests may have cached reads of uncommitted state
+        invalidate_user_cache(user_id)
+        invalidate_identity(user_id)
+        return jsonify({'results': results, 'atomic': True, 'committed': committed})
+    
+    except Exception as e:
+        session.rollback()
+        current_app.logger.error(f"Error running batch: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
@@ -1,48 +1,260 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
-from app.models import User, Todo
-from app.utils.email import send_todo_creation_email
+import json
+from datetime import datetime, timedelta
+from app.models import Todo, TodoTombstone
+from app.utils.notifications import notify_todos_created
+from app.utils.identity import get_identity
+from app.utils.batching import chunked, statement_chunk_size
+from app.utils.cache import cached_response, invalidate_user_cache
+from app.utils.conditional import conditional_response
+from app.utils.export import EXPORT_FORMATS, coalesce
+from app.utils.importer import IMPORT_FORMATS
+from app.utils.encoding import parse_fields, parse_shape, shape_rows, encode_response
+from app.utils.filters import (
+    parse_list_query, compile_plan, page_cursor, parse_filters, apply_filters, sort_keys
+)
+from app.utils.search import search_supported, query_terms, search_statement, highlight
+from app.utils.pagination import (
+    encode_cursor, decode_cursor, parse_limit, encode_sync_token, decode_sync_token
+)
+from app.utils.stats import (
+    adjust_todo_stats, refresh_todo_stats, get_stats_summary,
+    get_activity, get_median_completion_seconds, get_backlog_age,
+    get_collection_version
+)
 
 todos_bp = Blueprint('todos', __name__)
 
+# Columns selected when building responses from rows instead of ORM objects
+TODO_COLUMNS = (Todo.id, Todo.title, Todo.description, Todo.completed,
+                Todo.created_at, Todo.updated_at, Todo.user_id)
+TODO_FIELDS = tuple(column.key for column in TODO_COLUMNS)
+TODO_COLUMNS_BY_FIELD = dict(zip(TODO_FIELDS, TODO_COLUMNS))
+
+# Optional aggregates for /todos/stats
+STATS_INCLUDES = {'activity', 'completion_time', 'backlog_age'}
+
+# Aggregates measured against the current time; they change without any write
+TIME_RELATIVE_INCLUDES = {'activity', 'backlog_age'}
+
+def rows_to_dicts(rows):
+    """Build response dicts straight from TODO_COLUMNS result rows.
+    
+    Skips ORM hydration and leaves datetimes to the JSON provider, which
+    writes them as ISO 8601 like ``Todo.to_dict()``.
+    """
+    return [dict(zip(TODO_FIELDS, row)) for row in rows]
+
+def projected_columns(fields, plan_shape):
+    """Columns to select for the requested fields, followed by any sort keys
+    the cursor needs that were not requested."""
+    extra = [field for field, _ in sort_keys(plan_shape.sort) if field not in fields]
+    return tuple(TODO_COLUMNS_BY_FIELD[field] for field in fields + tuple(extra))
+
 def get_current_user_id():
     """Get current user ID as integer from JWT token."""
     return int(get_jwt_identity())
 
+def validate_new_todo(data):
+    """Validate the fields of a todo to be created.
+    
+    Returns ``(fields, None)`` with the cleaned title and description, or
+    ``(None, error_message)``.
+    """
+    if not isinstance(data, dict):
+        return None, 'Todo must be an object'
+    
+    title = data.get('title') or ''
+    description = data.get('description') or ''
+    if not isinstance(title, str) or not isinstance(description, str):
+        return None, 'Title and description must be strings'
+    
+    title = title.strip()
+    if not title:
+        return None, 'Title is required'
+    
+    if len(title) > 200:
+        return None, 'Title must be 200 characters or less'
+    
+    return {'title': title, 'description': description.strip()}, None
+
+def validate_todo_ids(todo_ids):
+    """Return True if todo_ids is a non-empty list of integer IDs."""
+    return isinstance(todo_ids, list) and bool(todo_ids) and all(
+        isinstance(todo_id, int) and not isinstance(todo_id, bool) for todo_id in todo_ids
+    )
+
+def insert_todo_rows(rows):
+    """Insert todo rows with chunked multi-row INSERTs in the current transaction.
+    
+    Returns result rows with the to_dict() columns of the new todos.
+    """
+    chunk_size = current_app.config['BULK_CHUNK_SIZE']
+    created = []
+    for chunk in chunked(rows, chunk_size):
+        created.extend(db.session.execute(
+            db.insert(Todo).returning(*TODO_COLUMNS, sort_by_parameter_order=True),
+            chunk
+        ).all())
+    return created
+
+def delete_todo_rows(user_id, todo_ids):
+    """Delete a user's todos by ID in chunks, logging a tombstone for each.
+    
+    Returns ``(id, completed)`` rows for the todos that were deleted.
+    """
+    dialect = db.session.get_bind().dialect
+    chunk_size = statement_chunk_size(dialect, current_app.config['BULK_CHUNK_SIZE'])
+    deleted = []
+    for chunk in chunked(todo_ids, chunk_size or len(todo_ids)):
+        condition = db.and_(Todo.user_id == user_id, Todo.id.in_(chunk))
+        statement = db.delete(Todo).where(condition).execution_options(synchronize_session=False)
+        if dialect.delete_returning:
+            deleted.extend(db.session.execute(statement.returning(Todo.id, Todo.completed)).all())
+        else:
+            deleted.extend(db.session.query(Todo.id, Todo.completed).filter(condition).all())
+            db.session.execute(statement)
+    
+    if deleted:
+        now = datetime.utcnow()
+        db.session.execute(db.insert(TodoTombstone), [
+            {'todo_id': row.id, 'user_id': user_id, 'deleted_at': now} for row in deleted
+        ])
+    return deleted
+
+def import_todo_records(user_id, records, batch_size, max_errors):
+    """Validate and insert parsed import records, committing every batch.
+    
+    Yields progress events as dictionaries: an ``error`` event for each
+    rejected line (up to ``max_errors``), a ``progress`` event after each
+    committed batch, and a final ``done`` or ``aborted`` event.
+    """
+    imported = 0
+    failed = 0
+    batches = 0
+    pending = []
+    
+    def flush():
+        rows = list(pending)
+        pending.clear()
+        insert_todo_rows(rows)
+        adjust_todo_stats(user_id, total=len(rows))
+        db.session.commit()
+        invalidate_user_cache(user_id)
+        return len(rows)
+    
+    try:
+        for line_number, record, error in records:
+            if error is None:
+                fields, error = validate_new_todo(record)
+            if error:
+                failed += 1
+                if failed <= max_errors:
+                    yield {'event': 'error', 'line': line_number, 'error': error}
+                continue
+            
+            now = datetime.utcnow()
+            pending.append(dict(fields, user_id=user_id, completed=False,
+                                created_at=now, updated_at=now))
+            if len(pending) >= batch_size:
+                imported += flush()
+                batches += 1
+                yield {'event': 'progress', 'line': line_number, 'imported': imported, 'failed': failed}
+        
+        if pending:
+            imported += flush()
+            batches += 1
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Import todos error: {str(e)}")
+        yield {'event': 'aborted', 'imported': imported, 'failed': failed, 'batches': batches,
+               'error': 'Import stopped by a server error; earlier batches were saved'}
+        return
+    
+    yield {'event': 'done', 'imported': imported, 'failed': failed, 'batches': batches}
+
+def todos_collection_version(user_id):
+    """Version of the user's whole todo list, from the stats summary row."""
+    return get_collection_version(user_id)
+
+def parse_stats_include(args):
+    """The set of aggregates named by the comma-separated ``include`` parameter."""
+    return {item.strip() for item in args.get('include', '').split(',') if item.strip()}
+
+def todo_stats_version(user_id):
+    """Version of the stats response, or None when it depends on the clock.
+    
+    Activity windows and backlog ages move as time passes, so responses
+    including them are neither revalidated nor cached.
+    """
+    if parse_stats_include(request.args) & TIME_RELATIVE_INCLUDES:
+        return None
+    return todos_collection_version(user_id)
+
+def todo_item_version(user_id, todo_id):
+    """Version of a single todo, read from the index without loading the row."""
+    updated_at = db.session.query(Todo.updated_at).filter_by(id=todo_id, user_id=user_id).scalar()
+    if updated_at is None:
+        return None
+    return updated_at.isoformat(), updated_at
+
 @todos_bp.route('/todos', methods=['GET'])
 @jwt_required()
+@conditional_response(todos_collection_version)
+@cached_response
 def get_todos():
-    """Get all todos for the current user."""
+    """Get todos for the current user.
+    
+    Filters are passed as ``field[op]=value``: ``created_at`` and
+    ``updated_at`` take ``gt``/``gte``/``lt``/``lte`` with ISO 8601 dates,
+    ``title`` takes ``eq`` or a case-insensitive ``prefix``, ``id[in]`` a
+    comma-separated list and ``completed`` a boolean.
+    ``sort=-created_at,title`` sorts by up to three fields (``-`` for
+    descending); ``sort_by``/``order`` still work.
+    
+    Passing ``limit`` and/or ``cursor`` switches to keyset pagination: each
+    page is read with a range scan on the ``(user_id, <sort_by>, id)`` index
+    and the response carries a ``next_cursor`` for the following page.
+    
+    ``fields=id,title`` selects only those columns, ``shape=columns``
+    returns one array per field instead of one object per todo, and
+    ``Accept: application/msgpack`` returns MessagePack.
+    """
     try:
         current_user_id = get_current_user_id()
         
-        # Get query parameters for filtering/sorting
-        completed = request.args.get('completed')
-        sort_by = request.args.get('sort_by', 'created_at')
-        order = request.args.get('order', 'desc')
-        
-        # Build query
-        query = Todo.query.filter_by(user_id=current_user_id)
+        cursor = request.args.get('cursor')
         
-        # Filter by completion status if specified
-        if completed is not None:
-            is_completed = completed.lower() in ['true', '1', 'yes']
-            query = query.filter_by(completed=is_completed)
-        
-        # Sort todos
-        if sort_by in ['title', 'created_at', 'updated_at', 'completed']:
-            if order.lower() == 'asc':
-                query = query.order_by(getattr(Todo, sort_by).asc())
-            else:
-                query = query.order_by(getattr(Todo, sort_by).desc())
-        
-        todos = query.all()
-        
-        return jsonify({
-            'todos': [todo.to_dict() for todo in todos],
-            'count': len(todos)
-        }), 200
+        paginate = cursor is not None or 'limit' in request.args
+        try:
+            limit = parse_limit(
+                request.args.get('limit'),
+                current_app.config['TODOS_PAGE_SIZE'],
+                current_app.config['TODOS_MAX_PAGE_SIZE']
+            )
+            list_query = parse_list_query(request.args, current_user_id,
+                                          limit=limit if paginate else None, cursor=cursor or None)
+            fields = parse_fields(request.args.get('fields'), TODO_FIELDS)
+            shape = parse_shape(request.args.get('shape'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # The statement is cached per filter shape; only the values are bound here
+        statement = compile_plan(list_query.shape, projected_columns(fields, list_query.shape))
+        todos = db.session.execute(statement, list_query.params).all()
+        
+        next_cursor = None
+        if paginate and len(todos) > limit:
+            todos = todos[:limit]
+            next_cursor = page_cursor(list_query.shape, todos[-1])
+        
+        return encode_response({
+            'todos': shape_rows(todos, fields, shape),
+            'count': len(todos),
+            'next_cursor': next_cursor
+        })
         
     except Exception as e:
         current_app.logger.error(f"Get todos error: {str(e)}")
@@ -59,18 +271,15 @@ def create_todo():
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        title = data.get('title', '').strip()
-        description = data.get('description', '').strip()
-        
         # Validate input
-        if not title:
-            return jsonify({'error': 'Title is required'}), 400
-        
-        if len(title) > 200:
-            return jsonify({'error': 'Title must be 200 characters or less'}), 400
-        
-        # Get user for email notification
-        user = User.query.get(current_user_id)
+        fields, error = validate_new_todo(data)
+        if error:
+            return jsonify({'error': error}), 400
+        title = fields['title']
+        description = fields['description']
+        
+        # Email and notification mode come from the identity cache
+        user = get_identity(current_user_id)
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
@@ -82,15 +291,19 @@ def create_todo():
         )
         
         db.session.add(todo)
-        db.session.commit()
+        db.session.flush()
+        adjust_todo_stats(current_user_id, total=1)
         
-        # Send email notification
+        # Queue email notification in the same transaction as the todo
         try:
-            send_todo_creation_email(user.email, title)
+            notify_todos_created(user, [title])
         except Exception as email_error:
             current_app.logger.error(f"Email sending error: {str(email_error)}")
             # Don't fail the request if email fails
         
+        db.session.commit()
+        invalidate_user_cache(current_user_id)
+        
         return jsonify({
             'message': 'Todo created successfully',
             'todo': todo.to_dict()
@@ -101,19 +314,376 @@ def create_todo():
         current_app.logger.error(f"Create todo error: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@todos_bp.route('/todos/batch', methods=['POST'])
+@jwt_required()
+def create_todos_batch():
+    """Create many todos in one request.
+    
+    Valid items are inserted with multi-row INSERTs in bounded chunks
+    inside a single transaction; invalid items are reported by index in
+    ``errors``. One summary email is sent for the whole batch.
+    """
+    try:
+        current_user_id = get_current_user_id()
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        items = data.get('todos')
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'Todos must be a non-empty list'}), 400
+        
+        max_items = current_app.config['BATCH_MAX_ITEMS']
+        if len(items) > max_items:
+            return jsonify({'error': f'A batch may contain at most {max_items} todos'}), 400
+        
+        now = datetime.utcnow()
+        rows = []
+        errors = []
+        for index, item in enumerate(items):
+            fields, error = validate_new_todo(item)
+            if error:
+                errors.append({'index': index, 'error': error})
+                continue
+            rows.append(dict(fields, user_id=current_user_id, completed=False,
+                             created_at=now, updated_at=now))
+        
+        if not rows:
+            return jsonify({'error': 'No valid todos provided', 'errors': errors}), 400
+        
+        # Email and notification mode come from the identity cache
+        user = get_identity(current_user_id)
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        created = insert_todo_rows(rows)
+        adjust_todo_stats(current_user_id, total=len(created))
+        
+        # Queue one summary notification for the whole batch
+        try:
+            notify_todos_created(user, [row['title'] for row in rows])
+        except Exception as email_error:
+            current_app.logger.error(f"Email sending error: {str(email_error)}")
+        
+        db.session.commit()
+        invalidate_user_cache(current_user_id)
+        
+        return jsonify({
+            'message': f'{len(created)} todos created successfully',
+            'todos': rows_to_dicts(created),
+            'count': len(created),
+            'errors': errors
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Batch create todos error: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@todos_bp.route('/todos/batch', methods=['DELETE'])
+@jwt_required()
+def delete_todos_batch():
+    """Delete many todos in one request with chunked multi-row DELETEs."""
+    try:
+        current_user_id = get_current_user_id()
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        todo_ids = data.get('todo_ids')
+        if not validate_todo_ids(todo_ids):
+            return jsonify({'error': 'Todo IDs must be a non-empty list of integers'}), 400
+        
+        max_items = current_app.config['BATCH_MAX_ITEMS']
+        if len(todo_ids) > max_items:
+            return jsonify({'error': f'A batch may contain at most {max_items} todos'}), 400
+        
+        unique_ids = list(dict.fromkeys(todo_ids))
+        deleted = delete_todo_rows(current_user_id, unique_ids)
+        
+        if not deleted:
+            db.session.rollback()
+            return jsonify({'error': 'No todos found'}), 404
+        
+        adjust_todo_stats(
+            current_user_id,
+            total=-len(deleted),
+            completed=-sum(1 for row in deleted if row.completed)
+        )
+        db.session.commit()
+        invalidate_user_cache(current_user_id)
+        
+        deleted_ids = [row.id for row in deleted]
+        found = set(deleted_ids)
+        return jsonify({
+            'message': f'{len(deleted_ids)} todos deleted successfully',
+            'todo_ids': deleted_ids,
+            'count': len(deleted_ids),
+            'not_found': [todo_id for todo_id in unique_ids if todo_id not in found]
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Batch delete todos error: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@todos_bp.route('/todos/import', methods=['POST'])
+@jwt_required()
+def import_todos():
+    """Import todos from an NDJSON or CSV request body.
+    
+    The body is read line by line and inserted in transactions of
+    ``batch_size`` rows, so uploads larger than memory are fine. Each
+    record is validated like ``create_todo``. With ``Accept:
+    application/x-ndjson`` the progress and per-line error events are
+    streamed back as they happen; otherwise a JSON summary is returned.
+    """
+    try:
+        current_user_id = get_current_user_id()
+        
+        import_format = request.args.get('format')
+        if import_format is None:
+            import_format = 'csv' if request.mimetype == 'text/csv' else 'ndjson'
+        if import_format not in IMPORT_FORMATS:
+            return jsonify({'error': f"Format must be one of: {', '.join(IMPORT_FORMATS)}"}), 400
+        
+        try:
+            batch_size = parse_limit(
+                request.args.get('batch_size'),
+                current_app.config['IMPORT_BATCH_SIZE'],
+                current_app.config['IMPORT_MAX_BATCH_SIZE']
+            )
+        except ValueError as e:
+            return jsonify({'error': f'Invalid batch_size: {e}'}), 400
+        
+        max_errors = current_app.config['IMPORT_MAX_ERRORS']
+        records = IMPORT_FORMATS[import_format](request.stream)
+        events = import_todo_records(current_user_id, records, batch_size, max_errors)
+        
+        if request.accept_mimetypes.best == 'application/x-ndjson':
+            return Response(
+                stream_with_context(json.dumps(event) + '\n' for event in events),
+                mimetype='application/x-ndjson'
+            )
+        
+        errors = []
+        summary = {}
+        for event in events:
+            if event['event'] == 'error':
+                errors.append({'line': event['line'], 'error': event['error']})
+            elif event['event'] in ['done', 'aborted']:
+                summary = event
+        
+        summary['errors'] = errors
+        summary['errors_truncated'] = summary['failed'] > len(errors)
+        status = 500 if summary.pop('event') == 'aborted' else 200
+        return jsonify(summary), status
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Import todos error: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@todos_bp.route('/todos/export', methods=['GET'])
+@jwt_required()
+def export_todos():
+    """Stream all of the user's todos as NDJSON, CSV or JSON.
+    
+    Rows are read from a server-side cursor in ``EXPORT_BATCH_SIZE``
+    batches and written out as they arrive, so memory use does not grow
+    with the number of todos. Accepts the same filter and sort parameters
+    as the list endpoint.
+    """
+    try:
+        current_user_id = get_current_user_id()
+        export_format = request.args.get('format', 'ndjson').lower()
+        
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': f"Format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+        mimetype, extension, serialize = EXPORT_FORMATS[export_format]
+        
+        try:
+            list_query = parse_list_query(request.args, current_user_id)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        statement = compile_plan(list_query.shape, TODO_COLUMNS).execution_options(
+            yield_per=current_app.config['EXPORT_BATCH_SIZE']
+        )
+        
+        def generate():
+            result = db.session.execute(statement, list_query.params)
+            try:
+                yield from coalesce(serialize(Todo.row_to_dict(row) for row in result))
+            finally:
+                result.close()
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename=todos.{extension}'}
+        )
+        
+    except Exception as e:
+        current_app.logger.error(f"Export todos error: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@todos_bp.route('/todos/changes', methods=['GET'])
+@jwt_required()
+def get_todo_changes():
+    """Get todos created, updated or deleted since a sync token.
+    
+    Without ``since`` every todo is returned as a full snapshot. The
+    response's ``next_since`` token is passed back on the next call. Both
+    lookups are range scans on ``(user_id, updated_at)`` and
+    ``(user_id, deleted_at)``, so cost follows churn, not list size.
+    Changes from the last few seconds may be repeated in the next sync;
+    clients should apply them idempotently.
+    """
+    try:
+        current_user_id = get_current_user_id()
+        since_token = request.args.get('since')
+        
+        since = None
+        if since_token:
+            try:
+                since = decode_sync_token(since_token)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        
+        started_at = datetime.utcnow()
+        
+        query = Todo.query.filter(Todo.user_id == current_user_id)
+        if since is not None:
+            query = query.filter(Todo.updated_at > since)
+        todos = query.order_by(Todo.updated_at.asc(), Todo.id.asc()).all()
+        
+        deleted = []
+        if since is not None:
+            deleted = db.session.query(TodoTombstone.todo_id, TodoTombstone.deleted_at).filter(
+                TodoTombstone.user_id == current_user_id,
+                TodoTombstone.deleted_at > since
+            ).order_by(TodoTombstone.deleted_at.asc()).all()
+        
+        # Advance to the newest change seen, but never past the overlap window,
+        # so rows flushed before a still-open commit are picked up next time
+        horizon = started_at - timedelta(seconds=current_app.config['TODOS_SYNC_OVERLAP_SECONDS'])
+        seen = [todo.updated_at for todo in todos if todo.updated_at] + [row.deleted_at for row in deleted]
+        next_since = min(max(seen), horizon) if seen else horizon
+        if since is not None:
+            next_since = max(next_since, since)
+        
+        return jsonify({
+            'todos': [todo.to_dict() for todo in todos],
+            'deleted': [row.todo_id for row in deleted],
+            'full_snapshot': since is None,
+            'next_since': encode_sync_token(next_since)
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Get todo changes error: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@todos_bp.route('/todos/search', methods=['GET'])
+@jwt_required()
+@conditional_response(todos_collection_version)
+@cached_response
+def search_todos():
+    """Full-text search over the current user's todo titles and descriptions.
+    
+    Results are ordered by relevance, with title matches ranked above
+    description matches, and carry the title and a description snippet
+    with matches wrapped in ``<mark>`` (the rest is HTML-escaped). Uses
+    ``limit``/``cursor`` pagination and accepts the same filters as
+    ``GET /todos``.
+    """
+    try:
+        current_user_id = get_current_user_id()
+        
+        q = request.args.get('q', '')
+        terms = query_terms(q)
+        if not terms:
+            return jsonify({'error': 'Search query must contain at least one word'}), 400
+        if not search_supported():
+            return jsonify({'error': 'Search is not supported on this database'}), 501
+        
+        cursor = request.args.get('cursor')
+        try:
+            limit = parse_limit(
+                request.args.get('limit'),
+                current_app.config['TODOS_PAGE_SIZE'],
+                current_app.config['TODOS_MAX_PAGE_SIZE']
+            )
+            filters, params = parse_filters(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        statement, rank = search_statement(terms, current_app.config['SEARCH_SNIPPET_WORDS'])
+        statement = statement.add_columns(*TODO_COLUMNS).where(Todo.user_id == current_user_id)
+        statement = apply_filters(statement, filters)
+        
+        # Cursors are tied to the query, as ranks from another query mean nothing
+        cursor_key = 'rank:' + ' '.join(terms).lower()
+        if cursor:
+            try:
+                after = decode_cursor(cursor, cursor_key, 'desc')
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            statement = statement.where(db.tuple_(rank, Todo.id) < db.tuple_(*after))
+        
+        # Fetch one extra row to know whether another page exists
+        rows = db.session.execute(
+            statement.order_by(rank.desc(), Todo.id.desc()).limit(limit + 1), params
+        ).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(cursor_key, 'desc', [rows[-1].search_rank, rows[-1].id])
+        
+        results = []
+        for row in rows:
+            todo = {field: getattr(row, field) for field in TODO_FIELDS}
+            todo['rank'] = row.search_rank
+            todo['highlights'] = {
+                'title': highlight(row.title_highlight),
+                'description': highlight(row.description_highlight) if row.description else None
+            }
+            results.append(todo)
+        
+        return jsonify({
+            'todos': results,
+            'count': len(results),
+            'next_cursor': next_cursor
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Search todos error: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @todos_bp.route('/todos/<int:todo_id>', methods=['GET'])
 @jwt_required()
+@conditional_response(todo_item_version)
+@cached_response
 def get_todo(todo_id):
-    """Get a specific todo."""
+    """Get a specific todo (accepts ``fields`` and MessagePack like the list)."""
     try:
         current_user_id = get_current_user_id()
         
-        todo = Todo.query.filter_by(id=todo_id, user_id=current_user_id).first()
+        try:
+            fields = parse_fields(request.args.get('fields'), TODO_FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        todo = db.session.execute(
+            db.select(*(TODO_COLUMNS_BY_FIELD[field] for field in fields))
+            .where(Todo.id == todo_id, Todo.user_id == current_user_id)
+        ).first()
         
         if not todo:
             return jsonify({'error': 'Todo not found'}), 404
         
-        return jsonify({'todo': todo.to_dict()}), 200
+        return encode_response({'todo': dict(zip(fields, todo))})
         
     except Exception as e:
         current_app.logger.error(f"Get todo error: {str(e)}")
@@ -147,12 +717,17 @@ def update_todo(todo_id):
         if 'description' in data:
             todo.description = data['description'].strip()
         
+        completed_delta = 0
         if 'completed' in data:
             if not isinstance(data['completed'], bool):
                 return jsonify({'error': 'Completed must be a boolean value'}), 400
-            todo.completed = data['completed']
+            completed_delta = int(data['completed']) - int(todo.completed)
+            todo.set_completed(data['completed'])
         
+        db.session.flush()
+        adjust_todo_stats(current_user_id, completed=completed_delta)
         db.session.commit()
+        invalidate_user_cache(current_user_id)
         
         return jsonify({
             'message': 'Todo updated successfully',
@@ -176,8 +751,13 @@ def delete_todo(todo_id):
         if not todo:
             return jsonify({'error': 'Todo not found'}), 404
         
+        was_completed = todo.completed
         db.session.delete(todo)
+        db.session.add(TodoTombstone(todo_id=todo.id, user_id=current_user_id))
+        db.session.flush()
+        adjust_todo_stats(current_user_id, total=-1, completed=-int(was_completed))
         db.session.commit()
+        invalidate_user_cache(current_user_id)
         
         return jsonify({'message': 'Todo deleted successfully'}), 200
         
@@ -189,7 +769,13 @@ def delete_todo(todo_id):
 @todos_bp.route('/todos/bulk-update', methods=['PUT'])
 @jwt_required()
 def bulk_update_todos():
-    """Bulk update todos (e.g., mark multiple as completed)."""
+    """Bulk update todos (e.g., mark multiple as completed).
+    
+    Runs as set-based ``UPDATE ... WHERE user_id = ? AND id IN (...)``
+    statements (one on PostgreSQL, bounded chunks on SQLite) with
+    ``RETURNING`` where the database supports it. Pass ``"return": "ids"``
+    to get only the affected IDs and a count instead of full todos.
+    """
     try:
         current_user_id = get_current_user_id()
         data = request.get_json()
@@ -199,41 +785,92 @@ def bulk_update_todos():
         
         todo_ids = data.get('todo_ids', [])
         updates = data.get('updates', {})
+        return_mode = data.get('return', 'todos')
         
         if not todo_ids or not updates:
             return jsonify({'error': 'Todo IDs and updates are required'}), 400
         
+        if not validate_todo_ids(todo_ids):
+            return jsonify({'error': 'Todo IDs must be a list of integers'}), 400
+        
+        if return_mode not in ['todos', 'ids']:
+            return jsonify({'error': 'Return must be todos or ids'}), 400
+        
+        if not isinstance(updates, dict):
+            return jsonify({'error': 'Updates must be an object'}), 400
+        
         # Validate updates
         valid_fields = ['completed', 'title', 'description']
         for field in updates.keys():
             if field not in valid_fields:
                 return jsonify({'error': f'Invalid field: {field}'}), 400
         
-        # Update todos
-        todos = Todo.query.filter(
-            Todo.id.in_(todo_ids),
-            Todo.user_id == current_user_id
-        ).all()
+        now = datetime.utcnow()
+        values = {'updated_at': now}
+        if 'completed' in updates:
+            if not isinstance(updates['completed'], bool):
+                return jsonify({'error': 'Completed must be a boolean value'}), 400
+            values['completed'] = updates['completed']
+            # Keep the original completion time for todos that were already done
+            values['completed_at'] = db.case(
+                (Todo.completed.is_(True), Todo.completed_at), else_=now
+            ) if updates['completed'] else None
+        if 'title' in updates:
+            if not isinstance(updates['title'], str):
+                return jsonify({'error': 'Title must be a string'}), 400
+            title = updates['title'].strip()
+            # An empty title leaves the titles unchanged
+            if title:
+                if len(title) > 200:
+                    return jsonify({'error': 'Title must be 200 characters or less'}), 400
+                values['title'] = title
+        if 'description' in updates:
+            if not isinstance(updates['description'], str):
+                return jsonify({'error': 'Description must be a string'}), 400
+            values['description'] = updates['description'].strip()
         
-        if not todos:
+        # Update todos
+        columns = [Todo.id] if return_mode == 'ids' else TODO_COLUMNS
+        
+        dialect = db.session.get_bind().dialect
+        chunk_size = statement_chunk_size(dialect, current_app.config['BULK_CHUNK_SIZE'])
+        unique_ids = list(dict.fromkeys(todo_ids))
+        
+        rows = []
+        for chunk in chunked(unique_ids, chunk_size or len(unique_ids)):
+            statement = db.update(Todo).where(
+                Todo.user_id == current_user_id,
+                Todo.id.in_(chunk)
+            ).values(**values).execution_options(synchronize_session=False)
+            
+            if dialect.update_returning:
+                rows.extend(db.session.execute(statement.returning(*columns)).all())
+            else:
+                db.session.execute(statement)
+                rows.extend(db.session.query(*columns).filter(
+                    Todo.user_id == current_user_id,
+                    Todo.id.in_(chunk)
+                ).all())
+        
+        if not rows:
+            db.session.rollback()
             return jsonify({'error': 'No todos found'}), 404
         
-        updated_todos = []
-        for todo in todos:
-            if 'completed' in updates:
-                todo.completed = updates['completed']
-            if 'title' in updates and updates['title']:
-                todo.title = updates['title']
-            if 'description' in updates:
-                todo.description = updates['description']
-            updated_todos.append(todo.to_dict())
-        
+        if 'completed' in updates:
+            refresh_todo_stats(current_user_id)
+        else:
+            adjust_todo_stats(current_user_id)
         db.session.commit()
+        invalidate_user_cache(current_user_id)
         
-        return jsonify({
-            'message': f'{len(updated_todos)} todos updated successfully',
-            'todos': updated_todos
-        }), 200
+        response = {'message': f'{len(rows)} todos updated successfully'}
+        if return_mode == 'ids':
+            response['todo_ids'] = [row.id for row in rows]
+            response['count'] = len(rows)
+        else:
+            response['todos'] = [Todo.row_to_dict(row) for row in rows]
+        
+        return jsonify(response), 200
         
     except Exception as e:
         db.session.rollback()
@@ -242,23 +879,52 @@ def bulk_update_todos():
 
 @todos_bp.route('/todos/stats', methods=['GET'])
 @jwt_required()
+@conditional_response(todo_stats_version)
+@cached_response
 def get_todo_stats():
-    """Get todo statistics for the current user."""
+    """Get todo statistics for the current user.
+    
+    The counters come from the per-user ``todo_stats`` summary row, so the
+    default response costs one primary-key lookup. Heavier aggregates are
+    computed in SQL on request via ``include`` (comma separated):
+    ``activity`` (created/completed per ``period`` over the last ``days``),
+    ``completion_time`` (median seconds to complete) and ``backlog_age``.
+    Responses with ``activity`` or ``backlog_age`` carry no ETag and are
+    not cached, since they change as time passes.
+    """
     try:
         current_user_id = get_current_user_id()
         
-        total_todos = Todo.query.filter_by(user_id=current_user_id).count()
-        completed_todos = Todo.query.filter_by(user_id=current_user_id, completed=True).count()
-        pending_todos = total_todos - completed_todos
-        
-        completion_rate = (completed_todos / total_todos * 100) if total_todos > 0 else 0
-        
-        return jsonify({
-            'total_todos': total_todos,
-            'completed_todos': completed_todos,
-            'pending_todos': pending_todos,
-            'completion_rate': round(completion_rate, 2)
-        }), 200
+        include = parse_stats_include(request.args)
+        unknown = include - STATS_INCLUDES
+        if unknown:
+            return jsonify({'error': f"Invalid include: {', '.join(sorted(unknown))}"}), 400
+        
+        stats = get_stats_summary(current_user_id)
+        
+        if 'activity' in include:
+            period = request.args.get('period', 'day')
+            if period not in ['day', 'week']:
+                return jsonify({'error': 'Period must be day or week'}), 400
+            try:
+                days = int(request.args.get('days', 30))
+            except ValueError:
+                return jsonify({'error': 'Days must be an integer'}), 400
+            if not 1 <= days <= 366:
+                return jsonify({'error': 'Days must be between 1 and 366'}), 400
+            stats['activity'] = {
+                'period': period,
+                'days': days,
+                'buckets': get_activity(current_user_id, period, days)
+            }
+        
+        if 'completion_time' in include:
+            stats['median_completion_seconds'] = get_median_completion_seconds(current_user_id)
+        
+        if 'backlog_age' in include:
+            stats['backlog_age'] = get_backlog_age(current_user_id)
+        
+        return jsonify(stats), 200
         
     except Exception as e:
         current_app.logger.error(f"Get todo stats error: {str(e)}")
@@ -1,5 +1,9 @@
 # Utility modules
-from .email import send_email, send_todo_creation_email
+from .email import (
+    send_email, send_todo_creation_email, send_todos_batch_email,
+    send_todo_digest_email, send_todo_due_soon_email
+)
 from .google_oauth import GoogleOAuth
 
-__all__ = ['send_email', 'send_todo_creation_email', 'GoogleOAuth']
+__all__ = ['send_email', 'send_todo_creation_email', 'send_todos_batch_email',
+           'send_todo_digest_email', 'send_todo_due_soon_email', 'GoogleOAuth']
@@ -0,0 +1,119 @@
+import asyncio
+import sys
+import tempfile
+
+# Request bodies larger than this are spooled to a temporary file
+MAX_BODY_IN_MEMORY = 1024 * 1024
+
+def build_environ(scope, body):
+    """Build a WSGI environ (PEP 3333) from an ASGI HTTP scope."""
+    script_name = scope.get('root_path', '').encode('utf-8').decode('latin-1')
+    path_info = scope['path'].encode('utf-8').decode('latin-1')
+    if script_name and path_info.startswith(script_name):
+        path_info = path_info[len(script_name):]
+    
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': script_name,
+        'PATH_INFO': path_info,
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+    
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        key = name if name in ('CONTENT_TYPE', 'CONTENT_LENGTH') else f'HTTP_{name}'
+        value = value.decode('latin-1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+class ThreadedWsgiToAsgi:
+    """Serves a WSGI app over ASGI, running each request on ``executor``.
+    
+    The request body is read before the WSGI app is called; the response
+    is sent chunk by chunk as the app produces it, so streamed exports
+    reach the client as they are generated.
+    """
+    
+    def __init__(self, wsgi_application, executor):
+        self.wsgi_application = wsgi_application
+        self.executor = executor
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+        
+        body = tempfile.SpooledTemporaryFile(max_size=MAX_BODY_IN_MEMORY)
+        try:
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    return
+                body.write(message.get('body', b''))
+                if not message.get('more_body'):
+                    break
+            length = body.tell()
+            body.seek(0)
+            
+            environ = build_environ(scope, body)
+            # The body is fully read, so even chunked requests have a known
+            # length and an input stream that ends at EOF
+            environ.setdefault('CONTENT_LENGTH', str(length))
+            environ['wsgi.input_terminated'] = True
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, self.run_wsgi_app, environ, send, loop)
+        finally:
+            body.close()
+    
+    def run_wsgi_app(self, environ, send, loop):
+        """Call the WSGI app on a pool thread, sending its output on the event loop."""
+        response_start = {}
+        
+        def start_response(status, headers, exc_info=None):
+            if exc_info and response_start.get('sent'):
+                raise exc_info[1].with_traceback(exc_info[2])
+            response_start['message'] = {
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+            }
+        
+        def send_message(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+        
+        def send_start():
+            if not response_start.get('sent'):
+                send_message(response_start['message'])
+                response_start['sent'] = True
+        
+        result = self.wsgi_application(environ, start_response)
+        try:
+            for chunk in result:
+                if chunk:
+                    send_start()
+                    send_message({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            send_start()
+            send_message({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
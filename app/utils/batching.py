@@ -0,0 +1,20 @@
+from itertools import islice
+
+def chunked(iterable, size):
+    """Yield lists of at most ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def statement_chunk_size(dialect, default):
+    """How many rows/IDs to send per statement on the given dialect.
+    
+    PostgreSQL handles large IN lists and multi-row VALUES in one
+    statement; SQLite builds are often limited to 999 bound parameters.
+    """
+    if dialect.name == 'postgresql':
+        return None
+    return default
@@ -0,0 +1,244 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request, current_app, g
+from flask_jwt_extended import get_jwt_identity
+from app.utils.compression import compress_response, negotiate_coding
+from app.utils.encoding import preferred_mimetype
+
+class CacheMetrics:
+    """Thread-safe hit/miss/eviction counters for a cache backend."""
+    
+    FIELDS = ('hits', 'misses', 'sets', 'evictions', 'invalidations')
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+    
+    def incr(self, field, amount=1):
+        with self._lock:
+            self._counts[field] += amount
+    
+    def snapshot(self):
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts['hits'] + counts['misses']
+        counts['hit_rate'] = round(counts['hits'] / lookups, 4) if lookups else 0.0
+        return counts
+
+class NullCache:
+    """Backend that stores nothing; every lookup is a miss."""
+    
+    name = 'null'
+    
+    def __init__(self, metrics):
+        self.metrics = metrics
+    
+    def get(self, key):
+        return None
+    
+    def set(self, key, value):
+        pass
+    
+    def get_version(self, namespace):
+        return 0
+    
+    def incr_version(self, namespace):
+        return 0
+    
+    def size(self):
+        return 0
+
+class LRUCache:
+    """In-process LRU cache with a per-entry TTL.
+    
+    Entries live in this worker's memory only, so writes handled by another
+    gunicorn worker are not seen here; use the Redis backend when running
+    more than one worker.
+    """
+    
+    name = 'lru'
+    
+    def __init__(self, metrics, max_entries=1024, ttl=300):
+        self.metrics = metrics
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        # Version counters are kept apart from entries so they are never evicted
+        self._versions = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.metrics.incr('evictions')
+    
+    def get_version(self, namespace):
+        with self._lock:
+            return self._versions.get(namespace, 0)
+    
+    def incr_version(self, namespace):
+        with self._lock:
+            version = self._versions.get(namespace, 0) + 1
+            self._versions[namespace] = version
+            return version
+    
+    def size(self):
+        with self._lock:
+            return len(self._entries)
+
+class RedisCache:
+    """Shared cache backed by Redis (or any server speaking its protocol)."""
+    
+    name = 'redis'
+    
+    def __init__(self, metrics, url, ttl=300, prefix='todoapp:'):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError('CACHE_BACKEND=redis requires the redis package') from e
+        self.metrics = metrics
+        self.ttl = ttl
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+    
+    def get(self, key):
+        return self._client.get(self.prefix + key)
+    
+    def set(self, key, value):
+        # Redis evicts according to its maxmemory policy; evictions are reported by the server
+        self._client.set(self.prefix + key, value, ex=self.ttl or None)
+    
+    def get_version(self, namespace):
+        value = self._client.get(self.prefix + 'version:' + namespace)
+        return int(value) if value is not None else 0
+    
+    def incr_version(self, namespace):
+        return self._client.incr(self.prefix + 'version:' + namespace)
+    
+    def size(self):
+        return None
+
+def make_backend(app, max_entries, ttl, prefix='todoapp:', backend=None):
+    """Build the backend selected by ``CACHE_BACKEND`` (or ``backend``) with its own metrics."""
+    metrics = CacheMetrics()
+    backend = backend or app.config.get('CACHE_BACKEND', 'lru')
+    
+    if backend == 'redis':
+        return RedisCache(metrics, app.config['CACHE_REDIS_URL'], ttl=ttl, prefix=prefix)
+    if backend == 'lru':
+        return LRUCache(metrics, max_entries, ttl=ttl)
+    if backend == 'null':
+        return NullCache(metrics)
+    raise ValueError(f'Unknown CACHE_BACKEND: {backend}')
+
+class ResponseCache:
+    """Per-user cache of serialized GET responses.
+    
+    Keys embed a per-user version counter, so a write only has to bump the
+    counter to make every cached response for that user unreachable.
+    """
+    
+    def __init__(self, app=None):
+        self.backend = None
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        self.backend = make_backend(
+            app,
+            max_entries=app.config.get('CACHE_MAX_ENTRIES', 1024),
+            ttl=app.config.get('CACHE_TTL', 300)
+        )
+        app.extensions['response_cache'] = self
+    
+    @staticmethod
+    def _namespace(user_id):
+        return f'user:{user_id}'
+    
+    def make_key(self, user_id, path, args, resource_version=None, mimetype=None, coding=None):
+        """Build a cache key from the user, their version, and the request."""
+        version = self.backend.get_version(self._namespace(user_id))
+        query = '&'.join(f'{k}={v}' for k, v in sorted(args.items(multi=True)))
+        representation = f'{path}?{query}#{resource_version}#{mimetype}#{coding}'
+        digest = hashlib.sha1(representation.encode('utf-8')).hexdigest()
+        return f'resp:{user_id}:{version}:{digest}'
+    
+    def get(self, key):
+        value = self.backend.get(key)
+        self.backend.metrics.incr('hits' if value is not None else 'misses')
+        return value
+    
+    def set(self, key, value):
+        self.backend.set(key, value)
+        self.backend.metrics.incr('sets')
+    
+    def invalidate_user(self, user_id):
+        """Drop every cached response for a user by bumping their version."""
+        self.backend.incr_version(self._namespace(user_id))
+        self.backend.metrics.incr('invalidations')
+    
+    def metrics(self):
+        stats = self.backend.metrics.snapshot()
+        stats['backend'] = self.backend.name
+        stats['entries'] = self.backend.size()
+        return stats
+
+def invalidate_user_cache(user_id):
+    """Invalidate the current app's cached responses for a user."""
+    current_app.extensions['response_cache'].invalidate_user(user_id)
+
+def cached_response(view):
+    """Serve a JWT-protected GET view from the response cache.
+    
+    Must be applied below ``jwt_required`` so the identity is available.
+    When ``conditional_response`` runs first, the database version it read
+    is part of the key, so a cached body always matches the ETag sent with
+    it. The negotiated response type and content-coding are part of the
+    key too, and entries are stored already compressed, so hits skip both
+    serialization and compression. Only 200 responses are stored, and
+    nothing is cached when ``conditional_response`` found no version.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if g.pop('skip_response_cache', False):
+            return view(*args, **kwargs)
+        cache = current_app.extensions['response_cache']
+        coding = negotiate_coding()
+        key = cache.make_key(get_jwt_identity(), request.path, request.args,
+                             g.get('resource_version'), preferred_mimetype(), coding)
+        
+        cached = cache.get(key)
+        if cached is not None:
+            header, _, body = cached.partition(b'\n')
+            mimetype, _, stored_coding = header.decode('ascii').partition(' ')
+            response = current_app.response_class(body, status=200, mimetype=mimetype)
+            if stored_coding:
+                response.headers['Content-Encoding'] = stored_coding
+            return response
+        
+        response = current_app.make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            stored_coding = compress_response(response, coding, current_app.config['COMPRESS_MIN_SIZE'])
+            header = f"{response.mimetype} {stored_coding or ''}".strip()
+            cache.set(key, header.encode('ascii') + b'\n' + response.get_data())
+        return response
+    return wrapper
@@ -0,0 +1,169 @@
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Fast levels suited to compressing on every request
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+# Response types worth compressing
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/x-ndjson', 'application/msgpack', 'text/csv', 'text/plain', 'text/html'
+}
+
+class GzipStream:
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    
+    def compress(self, data):
+        return self._compressor.compress(data)
+    
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self):
+        return self._compressor.flush()
+
+class BrotliStream:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    
+    def compress(self, data):
+        return self._compressor.process(data)
+    
+    def flush(self):
+        return self._compressor.flush()
+    
+    def finish(self):
+        return self._compressor.finish()
+
+class ZstdStream:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    
+    def compress(self, data):
+        return self._compressor.compress(data)
+    
+    def flush(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+    
+    def finish(self):
+        return self._compressor.flush()
+
+# Content-coding -> stream class, for the codings whose library is installed
+CODINGS = {'gzip': GzipStream}
+if brotli is not None:
+    CODINGS['br'] = BrotliStream
+if zstandard is not None:
+    CODINGS['zstd'] = ZstdStream
+
+def compress(data, coding):
+    """Compress a whole body with a content-coding from ``CODINGS``."""
+    stream = CODINGS[coding]()
+    return stream.compress(data) + stream.finish()
+
+def iter_compressed(chunks, coding):
+    """Compress a streamed body chunk by chunk.
+    
+    Each chunk is flushed as it is produced, so a client reading progress
+    events sees them without waiting for the end of the stream.
+    """
+    stream = CODINGS[coding]()
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = stream.compress(chunk) + stream.flush()
+        if data:
+            yield data
+    yield stream.finish()
+
+def negotiate_coding():
+    """The content-coding to use for this request, or None for identity.
+    
+    Picks the client's highest-quality coding among ``COMPRESS_ALGORITHMS``
+    that are installed, preferring the configured order on ties.
+    """
+    available = [coding for coding in current_app.config['COMPRESS_ALGORITHMS'] if coding in CODINGS]
+    if not available or not request.accept_encodings:
+        return None
+    return request.accept_encodings.best_match(available)
+
+def compress_response(response, coding, min_size):
+    """Compress a buffered response body in place.
+    
+    Returns the coding applied, or None if the body was left as is.
+    """
+    if coding is None or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return None
+    data = response.get_data()
+    if len(data) < min_size:
+        return None
+    response.set_data(compress(data, coding))
+    response.headers['Content-Encoding'] = coding
+    return coding
+
+def _weaken_etag(response):
+    # A strong ETag names one exact byte sequence; compressed bodies differ
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+class Compression:
+    """Compresses responses according to ``Accept-Encoding``.
+    
+    Bodies of ``COMPRESSIBLE_MIMETYPES`` are compressed with gzip, or with
+    brotli and zstd when their packages are installed, once they reach
+    ``COMPRESS_MIN_SIZE`` bytes. Streamed responses are compressed as they
+    are generated. Responses that already carry a ``Content-Encoding``,
+    such as precompressed entries from the response cache, pass through.
+    """
+    
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        self.min_size = app.config['COMPRESS_MIN_SIZE']
+        app.after_request(self.after_request)
+        app.extensions['compression'] = self
+    
+    def after_request(self, response):
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES or response.direct_passthrough:
+            return response
+        response.vary.add('Accept-Encoding')
+        if 'no-transform' in response.headers.get('Cache-Control', ''):
+            return response
+        
+        if 'Content-Encoding' in response.headers:
+            _weaken_etag(response)
+            return response
+        
+        coding = negotiate_coding()
+        if coding is None or request.method == 'HEAD':
+            return response
+        if response.status_code == 304:
+            # Matches the ETag the compressed 200 carried
+            _weaken_etag(response)
+            return response
+        if response.status_code < 200 or response.status_code in (204, 206):
+            return response
+        
+        if response.is_streamed:
+            response.response = iter_compressed(response.response, coding)
+            response.headers.pop('Content-Length', None)
+            response.headers['Content-Encoding'] = coding
+        elif compress_response(response, coding, self.min_size) is None:
+            return response
+        
+        _weaken_etag(response)
+        return response
@@ -0,0 +1,63 @@
+import hashlib
+from functools import wraps
+from flask import request, jsonify, current_app, g
+from flask_jwt_extended import get_jwt_identity
+from app.utils.encoding import preferred_mimetype
+
+def _not_modified(etag, last_modified):
+    """Return True if the request's validators match the current state."""
+    if request.if_none_match:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+def conditional_response(version_func):
+    """Answer GET requests with 304 when the client's copy is current.
+    
+    ``version_func(user_id, **view_args)`` must cheaply return a
+    ``(version, last_modified)`` pair without loading the resource, or
+    ``None`` to let the view run unversioned (e.g. so it can return 404,
+    or because the body depends on the clock); ``cached_response`` then
+    bypasses the cache as well. The ETag is
+    derived from the version, the query string and the negotiated response
+    type, since each produces a different body. Apply below ``jwt_required``.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            user_id = int(get_jwt_identity())
+            try:
+                current = version_func(user_id, **kwargs)
+            except Exception as e:
+                current_app.logger.error(f"Resource version error: {str(e)}")
+                return jsonify({'error': 'Internal server error'}), 500
+            if current is None:
+                g.skip_response_cache = True
+                return view(*args, **kwargs)
+            
+            version, last_modified = current
+            # Lets the response cache key on the same version as the ETag
+            g.resource_version = version
+            query = request.query_string.decode('utf-8', 'replace')
+            representation = f'{user_id}:{version}:{request.path}?{query}#{preferred_mimetype()}'
+            etag = hashlib.sha1(representation.encode('utf-8')).hexdigest()
+            
+            if _not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            # Clients must revalidate, but may keep the body for conditional requests
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            response.vary.add('Accept')
+            return response
+        return wrapper
+    return decorator
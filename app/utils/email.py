@@ -1,60 +1,44 @@
-from flask_mail import Message
 from flask import current_app
-from app import mail
-import threading
-
-def send_async_email(app, msg):
-    """Send email asynchronously."""
-    with app.app_context():
-        try:
-            mail.send(msg)
-        except Exception as e:
-            current_app.logger.error(f"Failed to send email: {str(e)}")
+from app import db
+from app.models import EmailOutbox
+from app.utils.email_templates import render_notification
 
 def send_email(subject, sender, recipients, text_body, html_body=None):
-    """Send email with the given parameters."""
-    msg = Message(subject, sender=sender, recipients=recipients)
-    msg.body = text_body
-    if html_body:
-        msg.html = html_body
+    """Queue an email in the outbox as part of the current transaction.
     
-    # Send email asynchronously
-    thread = threading.Thread(
-        target=send_async_email,
-        args=(current_app._get_current_object(), msg)
-    )
-    thread.start()
+    Nothing is sent until the caller commits; the outbox worker then
+    delivers it. A rollback discards the email with the rest of the change.
+    """
+    db.session.add(EmailOutbox(
+        subject=subject,
+        sender=sender,
+        recipients=','.join(recipients),
+        text_body=text_body,
+        html_body=html_body
+    ))
+    db.session.info['outbox_pending'] = True
+
+def send_notification(name, user_email, **context):
+    """Render a notification template and queue it for one recipient."""
+    subject, text_body, html_body = render_notification(name, **context)
+    sender = current_app.config['MAIL_USERNAME']
+    send_email(subject, sender, [user_email], text_body, html_body)
 
 def send_todo_creation_email(user_email, todo_title):
     """Send email notification when a new todo is created."""
-    subject = "New Todo Created - TodoApp"
-    sender = current_app.config['MAIL_USERNAME']
-    recipients = [user_email]
-    
-    text_body = f"""
-    Hello!
-    
-    A new todo has been created in your TodoApp account:
-    
-    Title: {todo_title}
-    
-    You can manage your todos by logging into your account.
-    
-    Best regards,
-    TodoApp Team
-    """
-    
-    html_body = f"""
-    <html>
-      <body>
-        <h2>New Todo Created</h2>
-        <p>Hello!</p>
-        <p>A new todo has been created in your TodoApp account:</p>
-        <p><strong>Title:</strong> {todo_title}</p>
-        <p>You can manage your todos by logging into your account.</p>
-        <p>Best regards,<br>TodoApp Team</p>
-      </body>
-    </html>
-    """
-    
-    send_email(subject, sender, recipients, text_body, html_body)
+    send_notification('todo_created', user_email, title=todo_title)
+
+def send_todos_batch_email(user_email, todo_titles, max_listed=20):
+    """Send one summary email for a batch of newly created todos."""
+    send_notification('todos_created', user_email, titles=todo_titles,
+                      count=len(todo_titles), max_listed=max_listed)
+
+def send_todo_digest_email(user_email, todo_titles, max_listed=20):
+    """Send a digest of todos created since the user's last notification."""
+    send_notification('digest', user_email, titles=todo_titles,
+                      count=len(todo_titles), max_listed=max_listed)
+
+def send_todo_due_soon_email(user_email, todo_titles, max_listed=20):
+    """Send a reminder listing todos that are due soon."""
+    send_notification('due_soon', user_email, titles=todo_titles,
+                      count=len(todo_titles), max_listed=max_listed)
@@ -0,0 +1,131 @@
+from jinja2 import DictLoader, Environment, StrictUndefined, select_autoescape
+
+# Each notification type has a subject, a plain-text body and an HTML body.
+# HTML bodies are autoescaped, so todo titles are always rendered as text.
+TEMPLATES = {
+    'todo_created.subject': "New Todo Created - TodoApp",
+    'todo_created.txt': """Hello!
+
+A new todo has been created in your TodoApp account:
+
+Title: {{ title }}
+
+You can manage your todos by logging into your account.
+
+Best regards,
+TodoApp Team
+""",
+    'todo_created.html': """<html>
+  <body>
+    <h2>New Todo Created</h2>
+    <p>Hello!</p>
+    <p>A new todo has been created in your TodoApp account:</p>
+    <p><strong>Title:</strong> {{ title }}</p>
+    <p>You can manage your todos by logging into your account.</p>
+    <p>Best regards,<br>TodoApp Team</p>
+  </body>
+</html>
+""",
+    
+    'todos_created.subject': "{{ count }} New Todos Created - TodoApp",
+    'todos_created.txt': """Hello!
+
+{{ count }} new todos have been created in your TodoApp account:
+
+{% include 'todo_list.txt' %}
+You can manage your todos by logging into your account.
+
+Best regards,
+TodoApp Team
+""",
+    'todos_created.html': """<html>
+  <body>
+    <h2>{{ count }} New Todos Created</h2>
+    <p>Hello!</p>
+    <p>{{ count }} new todos have been created in your TodoApp account:</p>
+    {% include 'todo_list.html' %}
+    <p>You can manage your todos by logging into your account.</p>
+    <p>Best regards,<br>TodoApp Team</p>
+  </body>
+</html>
+""",
+    
+    'digest.subject': "Your TodoApp Digest: {{ count }} New Todo{{ 's' if count != 1 }}",
+    'digest.txt': """Hello!
+
+Here is what was added to your TodoApp account since your last digest:
+
+{% include 'todo_list.txt' %}
+You can manage your todos by logging into your account.
+
+Best regards,
+TodoApp Team
+""",
+    'digest.html': """<html>
+  <body>
+    <h2>Your TodoApp Digest</h2>
+    <p>Hello!</p>
+    <p>Here is what was added to your TodoApp account since your last digest:</p>
+    {% include 'todo_list.html' %}
+    <p>You can manage your todos by logging into your account.</p>
+    <p>Best regards,<br>TodoApp Team</p>
+  </body>
+</html>
+""",
+    
+    'due_soon.subject': "{{ count }} Todo{{ 's' if count != 1 }} Due Soon - TodoApp",
+    'due_soon.txt': """Hello!
+
+The following todos in your TodoApp account are due soon:
+
+{% include 'todo_list.txt' %}
+You can manage your todos by logging into your account.
+
+Best regards,
+TodoApp Team
+""",
+    'due_soon.html': """<html>
+  <body>
+    <h2>Todos Due Soon</h2>
+    <p>Hello!</p>
+    <p>The following todos in your TodoApp account are due soon:</p>
+    {% include 'todo_list.html' %}
+    <p>You can manage your todos by logging into your account.</p>
+    <p>Best regards,<br>TodoApp Team</p>
+  </body>
+</html>
+""",
+    
+    # Shared list of titles, capped at max_listed
+    'todo_list.txt': """{% for title in titles[:max_listed] %}  - {{ title }}
+{% endfor %}{% if count > max_listed %}  ...and {{ count - max_listed }} more
+{% endif %}""",
+    'todo_list.html': """<ul>{% for title in titles[:max_listed] %}<li>{{ title }}</li>{% endfor %}
+{%- if count > max_listed %}<li>...and {{ count - max_listed }} more</li>{% endif %}</ul>""",
+}
+
+NOTIFICATION_TYPES = ['todo_created', 'todos_created', 'digest', 'due_soon']
+
+def _build_environment():
+    return Environment(
+        loader=DictLoader(TEMPLATES),
+        autoescape=select_autoescape(enabled_extensions=('html',), default_for_string=False),
+        undefined=StrictUndefined,
+        keep_trailing_newline=True,
+        cache_size=-1
+    )
+
+def _compile_all(environment):
+    """Compile every notification template up front."""
+    return {
+        name: tuple(environment.get_template(f'{name}.{part}') for part in ('subject', 'txt', 'html'))
+        for name in NOTIFICATION_TYPES
+    }
+
+_environment = _build_environment()
+_compiled = _compile_all(_environment)
+
+def render_notification(name, **context):
+    """Render a notification type to ``(subject, text_body, html_body)``."""
+    subject, text, html = _compiled[name]
+    return subject.render(**context).strip(), text.render(**context), html.render(**context)
@@ -0,0 +1,73 @@
+from datetime import date, datetime, timezone
+from flask import current_app, jsonify, request
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+MSGPACK_MIMETYPES = (MSGPACK_MIMETYPE, 'application/x-msgpack')
+
+# Values of ``shape``: one object per todo, or one array per field
+SHAPES = ('rows', 'columns')
+
+def preferred_mimetype():
+    """The response type negotiated from ``Accept``.
+    
+    MessagePack when the client prefers it and the ``msgpack`` package is
+    installed, JSON otherwise.
+    """
+    if msgpack is None or not request.accept_mimetypes:
+        return JSON_MIMETYPE
+    best = request.accept_mimetypes.best_match((JSON_MIMETYPE,) + MSGPACK_MIMETYPES, default=JSON_MIMETYPE)
+    return MSGPACK_MIMETYPE if best in MSGPACK_MIMETYPES else JSON_MIMETYPE
+
+def parse_fields(value, allowed):
+    """Parse ``fields=id,title`` into a tuple of field names in request order.
+    
+    Returns ``allowed`` when no fields were requested. Raises ValueError for
+    unknown fields.
+    """
+    if value is None:
+        return tuple(allowed)
+    fields = []
+    for field in value.split(','):
+        field = field.strip()
+        if field not in allowed:
+            raise ValueError(f"Fields must be from: {', '.join(allowed)}")
+        if field not in fields:
+            fields.append(field)
+    return tuple(fields)
+
+def parse_shape(value):
+    shape = value or 'rows'
+    if shape not in SHAPES:
+        raise ValueError(f"Shape must be one of: {', '.join(SHAPES)}")
+    return shape
+
+def shape_rows(rows, fields, shape='rows'):
+    """Build the todos part of a list response from result rows.
+    
+    Only the first ``len(fields)`` values of each row are used, so rows may
+    carry extra columns (such as sort keys for the cursor) after them.
+    """
+    if shape == 'columns':
+        return {field: [row[index] for row in rows] for index, field in enumerate(fields)}
+    return [dict(zip(fields, row)) for row in rows]
+
+def _msgpack_default(obj):
+    # Naive datetimes are stored in UTC; msgpack's timestamp type needs a timezone
+    if isinstance(obj, datetime):
+        return msgpack.Timestamp.from_datetime(obj.replace(tzinfo=timezone.utc) if obj.tzinfo is None else obj)
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f'Cannot serialize {type(obj).__name__}')
+
+def encode_response(payload, status=200):
+    """Serialize ``payload`` as MessagePack or JSON, whichever the client prefers."""
+    if preferred_mimetype() == MSGPACK_MIMETYPE:
+        body = msgpack.packb(payload, default=_msgpack_default)
+        return current_app.response_class(body, status=status, mimetype=MSGPACK_MIMETYPE)
+    return jsonify(payload), status
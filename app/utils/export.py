@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+
+EXPORT_FIELDS = ['id', 'title', 'description', 'completed', 'created_at', 'updated_at', 'user_id']
+
+def iter_ndjson(records):
+    """Yield one JSON document per line."""
+    for record in records:
+        yield json.dumps(record, separators=(',', ':')) + '\n'
+
+def iter_json(records):
+    """Yield a single ``{"todos": [...]}`` document piece by piece."""
+    yield '{"todos":['
+    first = True
+    for record in records:
+        prefix = '' if first else ','
+        first = False
+        yield prefix + json.dumps(record, separators=(',', ':'))
+    yield ']}'
+
+def iter_csv(records):
+    """Yield a CSV header followed by one line per record."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction='ignore')
+    
+    writer.writeheader()
+    yield buffer.getvalue()
+    
+    for record in records:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(record)
+        yield buffer.getvalue()
+
+def coalesce(chunks, min_size=64 * 1024):
+    """Join small string chunks into pieces of at least ``min_size`` characters.
+    
+    Fewer, larger writes also compress better when the response is
+    compressed on the fly.
+    """
+    buffer = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= min_size:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+# format -> (mimetype, file extension, generator)
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson', iter_ndjson),
+    'csv': ('text/csv', 'csv', iter_csv),
+    'json': ('application/json', 'json', iter_json)
+}
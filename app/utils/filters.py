@@ -0,0 +1,233 @@
+from collections import namedtuple
+from datetime import datetime, timezone
+from functools import lru_cache
+import re
+from app import db
+from app.models import Todo
+from app.utils.pagination import encode_cursor, decode_cursor
+
+RANGE_OPERATORS = {'gt', 'gte', 'lt', 'lte'}
+
+# Sortable fields
+SORT_FIELDS = {
+    'id': Todo.id,
+    'title': Todo.title,
+    'created_at': Todo.created_at,
+    'updated_at': Todo.updated_at,
+    'completed': Todo.completed
+}
+
+# Sort fields whose cursor values are datetimes
+DATETIME_FIELDS = {'created_at', 'updated_at'}
+
+MAX_SORT_KEYS = 3
+MAX_ID_FILTER = 500
+
+# Cached compiled plans, one per filter shape
+PLAN_CACHE_SIZE = 256
+
+ListQuery = namedtuple('ListQuery', ['shape', 'params'])
+PlanShape = namedtuple('PlanShape', ['filters', 'sort', 'after', 'paginate'])
+
+def parse_bool(value):
+    return value.lower() in ['true', '1', 'yes']
+
+def parse_datetime(value):
+    """Parse an ISO 8601 date or datetime into naive UTC, like the stored values."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'Invalid date: {value}')
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def parse_ids(value):
+    try:
+        ids = [int(item) for item in value.split(',') if item.strip()]
+    except ValueError:
+        raise ValueError('IDs must be integers')
+    if not ids:
+        raise ValueError('At least one ID is required')
+    if len(ids) > MAX_ID_FILTER:
+        raise ValueError(f'At most {MAX_ID_FILTER} IDs can be filtered on')
+    return ids
+
+def escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+# Filterable fields: column, allowed operators and value parser
+FILTER_FIELDS = {
+    'id': (Todo.id, {'in'}, parse_ids),
+    'completed': (Todo.completed, {'eq'}, parse_bool),
+    'title': (Todo.title, {'eq', 'prefix'}, str),
+    'created_at': (Todo.created_at, RANGE_OPERATORS, parse_datetime),
+    'updated_at': (Todo.updated_at, RANGE_OPERATORS, parse_datetime)
+}
+
+FILTER_PARAM = re.compile(r'^(\w+)\[(\w+)\]$')
+
+def parse_filters(args):
+    """Read ``field[op]=value`` filters (and plain ``field=value`` equality).
+    
+    Plain ``field=value`` only applies to fields with ``eq`` or ``in``; for
+    range-only fields such as ``created_at`` it is ignored, as it always was.
+    
+    Returns ``(filters, params)`` with the sorted ``(field, op)`` pairs and
+    the parsed values keyed by bind parameter name. Raises ValueError for
+    fields or operators outside the whitelist.
+    """
+    filters = {}
+    for key, value in args.items():
+        match = FILTER_PARAM.match(key)
+        if match:
+            field, op = match.groups()
+        elif key in FILTER_FIELDS and FILTER_FIELDS[key][1] & {'eq', 'in'}:
+            field, op = key, 'eq' if 'eq' in FILTER_FIELDS[key][1] else 'in'
+        else:
+            continue
+        
+        if field not in FILTER_FIELDS:
+            raise ValueError(f'Cannot filter on {field}')
+        operators, parser = FILTER_FIELDS[field][1:]
+        if op not in operators:
+            raise ValueError(f"Operator for {field} must be one of: {', '.join(sorted(operators))}")
+        filters[(field, op)] = parser(value)
+    
+    params = {}
+    for (field, op), value in filters.items():
+        params[f'{field}_{op}'] = escape_like(value) if op == 'prefix' else value
+    return tuple(sorted(filters)), params
+
+def parse_sort(args):
+    """Read ``sort=-created_at,title`` (``-`` for descending) into ``(field, order)`` pairs.
+    
+    Without ``sort`` the legacy ``sort_by``/``order`` parameters are used,
+    with unknown values falling back to ``created_at desc``.
+    """
+    spec = args.get('sort')
+    if spec is None:
+        sort_by = args.get('sort_by', 'created_at')
+        if sort_by not in SORT_FIELDS or sort_by == 'id':
+            sort_by = 'created_at'
+        order = 'asc' if args.get('order', 'desc').lower() == 'asc' else 'desc'
+        return ((sort_by, order),)
+    
+    sort = []
+    for item in spec.split(','):
+        item = item.strip()
+        field, order = (item[1:], 'desc') if item.startswith('-') else (item, 'asc')
+        if field not in SORT_FIELDS:
+            raise ValueError(f"Sort field must be one of: {', '.join(SORT_FIELDS)}")
+        if field in (key for key, _ in sort):
+            raise ValueError(f'Duplicate sort field: {field}')
+        sort.append((field, order))
+    if not 1 <= len(sort) <= MAX_SORT_KEYS:
+        raise ValueError(f'Sort by 1 to {MAX_SORT_KEYS} fields')
+    return tuple(sort)
+
+def sort_keys(sort):
+    """The sort with the id appended as tie-breaker, so the order is total."""
+    if any(field == 'id' for field, _ in sort):
+        return sort
+    return sort + (('id', sort[-1][1]),)
+
+def cursor_key(sort):
+    """The ``(sort_by, order)`` pair a cursor is issued for.
+    
+    Matches the single-field cursors issued before multi-key sorts.
+    """
+    return ','.join(field for field, _ in sort), ','.join(order for _, order in sort)
+
+def parse_list_query(args, user_id, limit=None, cursor=None):
+    """Parse a list request into a plan shape and its bind parameters.
+    
+    Raises ValueError for invalid filters, sorts or cursors.
+    """
+    filters, params = parse_filters(args)
+    sort = parse_sort(args)
+    params['user_id'] = user_id
+    
+    after = cursor is not None
+    if after:
+        keys = sort_keys(sort)
+        positions = [index for index, (field, _) in enumerate(keys) if field in DATETIME_FIELDS]
+        values = decode_cursor(cursor, *cursor_key(sort), positions)
+        if len(values) != len(keys):
+            raise ValueError('Invalid cursor')
+        for index, value in enumerate(values):
+            params[f'after_{index}'] = value
+    
+    if limit is not None:
+        # One extra row tells whether another page exists
+        params['limit'] = limit + 1
+    return ListQuery(PlanShape(filters, sort, after, limit is not None), params)
+
+def _filter_clause(field, op):
+    column = FILTER_FIELDS[field][0]
+    param = db.bindparam(f'{field}_{op}', type_=column.type, expanding=(op == 'in'))
+    if op == 'eq':
+        return column == param
+    if op == 'in':
+        return column.in_(param)
+    if op == 'prefix':
+        return column.ilike(param, escape='\\')
+    return {'gt': column > param, 'gte': column >= param,
+            'lt': column < param, 'lte': column <= param}[op]
+
+def apply_filters(statement, filters):
+    """Add the WHERE clauses for parsed ``(field, op)`` filters to a statement."""
+    for field, op in filters:
+        statement = statement.where(_filter_clause(field, op))
+    return statement
+
+def _after_clause(keys):
+    """Keyset condition for rows after the cursor in the given order.
+    
+    Uses a row-value comparison when all keys share a direction, which
+    the composite indexes can serve as a range scan, and the expanded
+    ``a > x OR (a = x AND b > y) ...`` form for mixed directions.
+    """
+    columns = [SORT_FIELDS[field] for field, _ in keys]
+    params = [db.bindparam(f'after_{index}', type_=column.type) for index, column in enumerate(columns)]
+    orders = {order for _, order in keys}
+    if len(orders) == 1:
+        if orders == {'asc'}:
+            return db.tuple_(*columns) > db.tuple_(*params)
+        return db.tuple_(*columns) < db.tuple_(*params)
+    
+    clauses = []
+    for index, (column, (_, order)) in enumerate(zip(columns, keys)):
+        beyond = column > params[index] if order == 'asc' else column < params[index]
+        equal = [columns[prior] == params[prior] for prior in range(index)]
+        clauses.append(db.and_(*equal, beyond))
+    return db.or_(*clauses)
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def compile_plan(shape, columns):
+    """Build the SELECT for a plan shape, with bind parameters for all values.
+    
+    Cached per shape, so a repeated filter combination skips building the
+    statement; the values are supplied at execution.
+    """
+    keys = sort_keys(shape.sort)
+    statement = db.select(*columns).where(Todo.user_id == db.bindparam('user_id'))
+    statement = apply_filters(statement, shape.filters)
+    if shape.after:
+        statement = statement.where(_after_clause(keys))
+    statement = statement.order_by(*(
+        SORT_FIELDS[field].asc() if order == 'asc' else SORT_FIELDS[field].desc()
+        for field, order in keys
+    ))
+    if shape.paginate:
+        statement = statement.limit(db.bindparam('limit', type_=db.Integer))
+    return statement
+
+def page_cursor(shape, last):
+    """Cursor for the page after the row ``last``."""
+    values = [getattr(last, field) for field, _ in sort_keys(shape.sort)]
+    return encode_cursor(*cursor_key(shape.sort), values)
+
+def plan_cache_metrics():
+    info = compile_plan.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'max_size': info.maxsize}
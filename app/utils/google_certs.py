@@ -0,0 +1,107 @@
+import json
+import threading
+import time
+import requests
+from flask import current_app
+from google.auth import jwt as google_jwt
+from werkzeug.http import parse_cache_control_header
+
+GOOGLE_ISSUERS = ['accounts.google.com', 'https://accounts.google.com']
+
+class GoogleCertCache:
+    """Process-wide cache of Google's ID token signing certificates.
+    
+    Certificates are fetched over a pooled HTTP session and kept for the
+    ``max-age`` Google sends in ``Cache-Control``. Concurrent misses share a
+    single fetch. A token signed with an unknown key id triggers one early
+    refresh (at most every ``min_refresh_interval`` seconds) to pick up key
+    rotation, and a failed refresh keeps serving the previous certificates.
+    Pointing ``url`` at a ``file://`` path verifies fully offline.
+    """
+    
+    def __init__(self, url, default_max_age=3600, timeout=5, min_refresh_interval=60, http=None):
+        self.url = url
+        self.default_max_age = default_max_age
+        self.timeout = timeout
+        self.min_refresh_interval = min_refresh_interval
+        self.fetches = 0
+        self._certs = None
+        self._expires_at = 0
+        self._fetched_at = None
+        self._lock = threading.Lock()
+        # Anything with requests' get(), e.g. the app's HTTPClient
+        self._http = http or requests.Session()
+    
+    def _fetch(self):
+        if self.url.startswith('file://'):
+            with open(self.url[len('file://'):], encoding='utf-8') as f:
+                return json.load(f), None
+        
+        response = self._http.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        max_age = parse_cache_control_header(response.headers.get('Cache-Control')).max_age
+        return response.json(), max_age
+    
+    def _refresh(self):
+        certs, max_age = self._fetch()
+        now = time.monotonic()
+        self.fetches += 1
+        self._certs = certs
+        self._fetched_at = now
+        self._expires_at = now + (max_age if max_age is not None else self.default_max_age)
+    
+    def get_certs(self, force=False):
+        """Return ``{key id: certificate}``, fetching when expired or forced."""
+        certs = self._certs
+        if certs is not None and not force and time.monotonic() < self._expires_at:
+            return certs
+        
+        with self._lock:
+            now = time.monotonic()
+            # Another thread may have refreshed while this one waited for the lock
+            if self._certs is not None:
+                if force and now - self._fetched_at < self.min_refresh_interval:
+                    return self._certs
+                if not force and now < self._expires_at:
+                    return self._certs
+            try:
+                self._refresh()
+            except (requests.RequestException, OSError, ValueError) as e:
+                if self._certs is None:
+                    raise
+                current_app.logger.warning(f"Google certs refresh failed, using cached keys: {str(e)}")
+            return self._certs
+    
+    def verify(self, token, audience, clock_skew=10):
+        """Verify a Google ID token and return its claims; raises ValueError."""
+        key_id = google_jwt.decode_header(token).get('kid')
+        certs = self.get_certs()
+        if key_id is not None and key_id not in certs:
+            certs = self.get_certs(force=True)
+        
+        claims = google_jwt.decode(token, certs=certs, audience=audience, clock_skew_in_seconds=clock_skew)
+        if claims.get('iss') not in GOOGLE_ISSUERS:
+            raise ValueError('Wrong issuer.')
+        return claims
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_cert_cache(url=None):
+    """Return the shared cert cache for ``GOOGLE_CERTS_URL`` (one per URL)."""
+    config = current_app.config
+    url = url or config['GOOGLE_CERTS_URL']
+    with _caches_lock:
+        cache = _caches.get(url)
+        if cache is None:
+            cache = _caches[url] = GoogleCertCache(
+                url,
+                default_max_age=config['GOOGLE_CERTS_DEFAULT_MAX_AGE'],
+                timeout=config['GOOGLE_CERTS_TIMEOUT'],
+                http=current_app.extensions.get('http_client')
+            )
+        return cache
+
+def verify_google_id_token(token):
+    """Verify a Google ID token against the cached certs for this app's client id."""
+    return get_cert_cache().verify(token, current_app.config['GOOGLE_CLIENT_ID'])
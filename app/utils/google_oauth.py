@@ -1,7 +1,7 @@
 import requests
 from flask import current_app, url_for
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token
+from app.utils.google_certs import verify_google_id_token
+from app.utils.http import get_http_client
 import json
 
 class GoogleOAuth:
@@ -10,7 +10,7 @@ class GoogleOAuth:
     @staticmethod
     def get_authorization_url():
         """Get the Google OAuth authorization URL."""
-        base_url = "https://accounts.google.com/o/oauth2/v2/auth"
+        base_url = current_app.config['GOOGLE_AUTH_URL']
         params = {
             "client_id": current_app.config['GOOGLE_CLIENT_ID'],
             "redirect_uri": url_for('auth.google_callback', _external=True),
@@ -26,7 +26,7 @@ class GoogleOAuth:
     @staticmethod
     def exchange_code_for_token(code):
         """Exchange authorization code for access token."""
-        token_url = "https://oauth2.googleapis.com/token"
+        token_url = current_app.config['GOOGLE_TOKEN_URL']
         data = {
             "client_id": current_app.config['GOOGLE_CLIENT_ID'],
             "client_secret": current_app.config['GOOGLE_CLIENT_SECRET'],
@@ -36,7 +36,7 @@ class GoogleOAuth:
         }
         
         try:
-            response = requests.post(token_url, data=data)
+            response = get_http_client().post(token_url, data=data)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -46,10 +46,11 @@ class GoogleOAuth:
     @staticmethod
     def get_user_info(access_token):
         """Get user information from Google API."""
-        user_info_url = f"https://www.googleapis.com/oauth2/v1/userinfo?access_token={access_token}"
+        user_info_url = current_app.config['GOOGLE_USERINFO_URL']
         
         try:
-            response = requests.get(user_info_url)
+            # Bearer header rather than a query parameter, which would end up in access logs
+            response = get_http_client().get(user_info_url, headers={'Authorization': f'Bearer {access_token}'})
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -60,16 +61,8 @@ class GoogleOAuth:
     def verify_id_token(id_token_str):
         """Verify Google ID token."""
         try:
-            # Verify the token
-            idinfo = id_token.verify_oauth2_token(
-                id_token_str, 
-                google_requests.Request(), 
-                current_app.config['GOOGLE_CLIENT_ID']
-            )
-            
-            # Additional verification
-            if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
-                raise ValueError('Wrong issuer.')
+            # Signature, audience, expiry and issuer, against the cached certs
+            idinfo = verify_google_id_token(id_token_str)
             
             return idinfo
         except ValueError as e:
@@ -0,0 +1,128 @@
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of calling a host whose circuit breaker is open."""
+
+class CircuitBreaker:
+    """Stops calling an upstream after repeated failures.
+    
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast for ``reset_timeout`` seconds. Then one trial call is
+    let through: success closes the circuit, failure opens it again.
+    """
+    
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+    
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+class HTTPClient:
+    """Shared keep-alive session for outbound calls (Google OAuth and certs).
+    
+    Connections are pooled per host, every call has connect and read
+    timeouts, idempotent requests and connection failures are retried with
+    exponential backoff, and each host has its own circuit breaker.
+    """
+    
+    def __init__(self, app=None):
+        self.session = None
+        self._breakers = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        config = app.config
+        self.timeout = (config['HTTP_CONNECT_TIMEOUT'], config['HTTP_READ_TIMEOUT'])
+        self.failure_threshold = config['HTTP_CIRCUIT_FAILURES']
+        self.reset_timeout = config['HTTP_CIRCUIT_RESET_SECONDS']
+        
+        # Connection errors are retried for any method since nothing was sent;
+        # 5xx responses only for GET, as a token exchange is not idempotent
+        retry = Retry(
+            total=config['HTTP_RETRIES'],
+            backoff_factor=config['HTTP_BACKOFF_FACTOR'],
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_maxsize=config['HTTP_POOL_MAXSIZE'], max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        app.extensions['http_client'] = self
+    
+    def breaker(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return breaker
+    
+    def request(self, method, url, **kwargs):
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            raise CircuitOpenError(f'Circuit open for {urlsplit(url).netloc}')
+        
+        kwargs.setdefault('timeout', self.timeout)
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            # Any failure, so a half-open trial always ends
+            breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+    
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+    
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+def get_http_client():
+    return current_app.extensions['http_client']
@@ -0,0 +1,93 @@
+import json
+from collections import namedtuple
+from flask import current_app
+from app import db
+from app.models import User
+from app.utils.cache import make_backend
+
+class UserIdentity(namedtuple('UserIdentity', ['id', 'email', 'created_at', 'notification_mode'])):
+    """Read-only snapshot of the user fields authenticated requests need.
+    
+    ``created_at`` is kept as an ISO string so the snapshot serializes
+    as-is; ``to_dict`` matches ``User.to_dict``.
+    """
+    
+    __slots__ = ()
+    
+    @classmethod
+    def from_row(cls, row):
+        return cls(
+            id=row.id,
+            email=row.email,
+            created_at=row.created_at.isoformat() if row.created_at else None,
+            notification_mode=row.notification_mode
+        )
+    
+    def to_dict(self):
+        return {'id': self.id, 'email': self.email, 'created_at': self.created_at}
+
+class IdentityCache:
+    """TTL cache of ``UserIdentity`` snapshots keyed by the JWT subject.
+    
+    Uses the same backend as the response cache. Invalidation bumps a
+    per-user version that is part of the key, so account changes are seen
+    at once by every worker sharing the backend; with the per-process LRU
+    backend other workers catch up within ``IDENTITY_CACHE_TTL``.
+    """
+    
+    def __init__(self, app=None):
+        self.backend = None
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        self.backend = make_backend(
+            app,
+            max_entries=app.config.get('IDENTITY_CACHE_MAX_ENTRIES', 4096),
+            ttl=app.config.get('IDENTITY_CACHE_TTL', 60),
+            prefix='todoapp:identity:'
+        )
+        app.extensions['identity_cache'] = self
+    
+    def _key(self, user_id):
+        version = self.backend.get_version(f'identity:{user_id}')
+        return f'identity:{user_id}:{version}'
+    
+    def get(self, user_id):
+        """Return the identity for a user id, loading it on a miss (None if gone)."""
+        key = self._key(user_id)
+        cached = self.backend.get(key)
+        if cached is not None:
+            self.backend.metrics.incr('hits')
+            return UserIdentity(*json.loads(cached))
+        self.backend.metrics.incr('misses')
+        
+        row = db.session.query(
+            User.id, User.email, User.created_at, User.notification_mode
+        ).filter(User.id == user_id).first()
+        if row is None:
+            return None
+        
+        identity = UserIdentity.from_row(row)
+        self.backend.set(key, json.dumps(identity).encode('utf-8'))
+        self.backend.metrics.incr('sets')
+        return identity
+    
+    def invalidate(self, user_id):
+        """Drop the cached identity after the user's account changed."""
+        self.backend.incr_version(f'identity:{user_id}')
+        self.backend.metrics.incr('invalidations')
+    
+    def metrics(self):
+        stats = self.backend.metrics.snapshot()
+        stats['backend'] = self.backend.name
+        stats['entries'] = self.backend.size()
+        return stats
+
+def get_identity(user_id):
+    """Return the current app's cached identity for a JWT subject."""
+    return current_app.extensions['identity_cache'].get(int(user_id))
+
+def invalidate_identity(user_id):
+    """Invalidate a user's cached identity; call after committing account changes."""
+    current_app.extensions['identity_cache'].invalidate(int(user_id))
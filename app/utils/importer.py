@@ -0,0 +1,38 @@
+import csv
+import json
+
+def _decode_lines(lines):
+    """Decode byte lines lazily, replacing undecodable bytes."""
+    for line in lines:
+        yield line.decode('utf-8', 'replace') if isinstance(line, bytes) else line
+
+def iter_ndjson_records(lines):
+    """Yield ``(line_number, record, error)`` for each non-blank NDJSON line."""
+    for line_number, line in enumerate(_decode_lines(lines), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except ValueError as e:
+            yield line_number, None, f'Invalid JSON: {e}'
+
+def iter_csv_records(lines):
+    """Yield ``(line_number, record, error)`` for each CSV row after the header.
+    
+    Quoted fields may span several physical lines; the line number is where
+    the record ends.
+    """
+    reader = csv.DictReader(_decode_lines(lines))
+    try:
+        for record in reader:
+            if None in record:
+                yield reader.line_num, None, 'Too many fields'
+                continue
+            yield reader.line_num, record, None
+    except csv.Error as e:
+        yield reader.line_num, None, f'Invalid CSV: {e}'
+
+IMPORT_FORMATS = {
+    'ndjson': iter_ndjson_records,
+    'csv': iter_csv_records
+}
@@ -0,0 +1,57 @@
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class TodoJSONProvider(DefaultJSONProvider):
+    """Stdlib JSON provider that writes dates as ISO 8601, like ``to_dict()``.
+    
+    Flask's default would use HTTP dates, so rows can be serialized with
+    their raw datetime values and still match the ORM responses.
+    """
+    
+    @staticmethod
+    def default(obj):
+        if isinstance(obj, date):
+            return obj.isoformat()
+        return DefaultJSONProvider.default(obj)
+
+class OrjsonProvider(TodoJSONProvider):
+    """JSON provider backed by orjson, which also formats datetimes natively."""
+    
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj, **kwargs).decode('utf-8')
+    
+    def dumps_bytes(self, obj, sort_keys=None, indent=None, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            self.dumps_bytes(obj, indent=indent) + b'\n', mimetype=self.mimetype
+        )
+
+JSON_PROVIDERS = {'orjson': OrjsonProvider, 'stdlib': TodoJSONProvider}
+
+def make_json_provider(app):
+    """Build the provider named by ``JSON_PROVIDER`` (auto picks orjson if installed)."""
+    name = app.config.get('JSON_PROVIDER', 'auto')
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'stdlib'
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f'Unknown JSON_PROVIDER: {name}')
+    if name == 'orjson' and orjson is None:
+        raise RuntimeError('JSON_PROVIDER=orjson requires the orjson package')
+    return JSON_PROVIDERS[name](app)
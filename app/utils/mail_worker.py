@@ -0,0 +1,199 @@
+import smtplib
+import threading
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app, has_app_context
+from flask_mail import Message
+from app import db, mail
+from app.models import EmailOutbox
+from app.utils.notifications import flush_due_digests
+
+_listening = False
+
+def _notify_after_commit(session):
+    """Wake the current app's outbox worker when a commit queued mail."""
+    if session.info.pop('outbox_pending', False) and has_app_context():
+        worker = current_app.extensions.get('outbox_worker')
+        if worker is not None:
+            worker.notify()
+
+class OutboxWorker:
+    """Bounded pool of threads that deliver queued email from the outbox.
+    
+    Each thread claims a batch of due messages, sends them over one SMTP
+    connection that stays open while there is a backlog, and records the
+    outcome. Failed sends are retried with exponential backoff until
+    ``MAIL_OUTBOX_MAX_ATTEMPTS``. Claims expire after
+    ``MAIL_OUTBOX_CLAIM_TIMEOUT`` seconds, so messages held by a worker
+    that died are picked up again (delivery is at least once).
+    """
+    
+    def __init__(self, app=None):
+        self.app = None
+        self._threads = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        self.app = app
+        app.extensions['outbox_worker'] = self
+        
+        if app.config['MAIL_OUTBOX_IN_PROCESS']:
+            # Started on the first request rather than here, so scripts that
+            # only build the app (init_db, migrations) never spawn threads
+            app.before_request(self._ensure_started)
+        
+        global _listening
+        if not _listening:
+            db.event.listen(db.session, 'after_commit', _notify_after_commit)
+            _listening = True
+    
+    def _ensure_started(self):
+        if not self.running:
+            self.start()
+    
+    @property
+    def running(self):
+        return any(thread.is_alive() for thread in self._threads)
+    
+    def start(self):
+        """Start the worker threads if they are not already running."""
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._threads = [
+                threading.Thread(target=self._run, name=f'outbox-worker-{i}', daemon=True)
+                for i in range(self.app.config['MAIL_OUTBOX_WORKERS'])
+            ]
+            for thread in self._threads:
+                thread.start()
+    
+    def stop(self, timeout=None):
+        """Ask the worker threads to finish and wait for them."""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+    
+    def notify(self):
+        """Wake idle workers so newly committed mail goes out without waiting a poll."""
+        self._wake.set()
+    
+    def _run(self):
+        poll_interval = self.app.config['MAIL_OUTBOX_POLL_INTERVAL']
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    flush_due_digests()
+                    self.drain()
+            except Exception as e:
+                self.app.logger.error(f"Outbox worker error: {str(e)}")
+            self._wake.wait(poll_interval)
+            self._wake.clear()
+    
+    def drain(self):
+        """Deliver due messages until none are left; returns the number sent."""
+        sent = 0
+        batch = self.claim_batch()
+        if not batch:
+            return sent
+        
+        # One SMTP session for the whole backlog instead of one per message
+        try:
+            with mail.connect() as connection:
+                while batch and not self._stop.is_set():
+                    sent += self.deliver_batch(connection, batch)
+                    batch = self.claim_batch()
+        except (smtplib.SMTPException, OSError) as e:
+            # Connection-level failure: back off every message still held by this worker
+            db.session.rollback()
+            for item in batch:
+                if item.claim_token is not None:
+                    self._record_failure(item, e, self.app.config)
+            db.session.commit()
+            raise
+        
+        # Release anything still claimed if the drain was interrupted
+        if batch:
+            self.release(batch)
+        return sent
+    
+    def claim_batch(self):
+        """Atomically claim up to MAIL_OUTBOX_BATCH_SIZE due messages."""
+        config = self.app.config
+        now = datetime.utcnow()
+        token = str(uuid.uuid4())
+        stale = now - timedelta(seconds=config['MAIL_OUTBOX_CLAIM_TIMEOUT'])
+        
+        due = db.or_(
+            db.and_(EmailOutbox.status == EmailOutbox.STATUS_PENDING, EmailOutbox.next_attempt_at <= now),
+            db.and_(EmailOutbox.status == EmailOutbox.STATUS_SENDING, EmailOutbox.claimed_at < stale)
+        )
+        candidate_ids = db.session.query(EmailOutbox.id).filter(due).order_by(
+            EmailOutbox.id
+        ).limit(config['MAIL_OUTBOX_BATCH_SIZE'])
+        
+        # The due condition is re-checked in the UPDATE so concurrent workers never share a row
+        db.session.execute(
+            db.update(EmailOutbox)
+            .where(EmailOutbox.id.in_(candidate_ids.scalar_subquery()), due)
+            .values(status=EmailOutbox.STATUS_SENDING, claim_token=token, claimed_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        
+        return EmailOutbox.query.filter_by(claim_token=token).order_by(EmailOutbox.id).all()
+    
+    def deliver_batch(self, connection, batch):
+        """Send a claimed batch and record each result; returns the number sent."""
+        config = self.app.config
+        sent = 0
+        
+        for index, item in enumerate(batch):
+            try:
+                message = Message(item.subject, sender=item.sender, recipients=item.recipient_list())
+                message.body = item.text_body
+                if item.html_body:
+                    message.html = item.html_body
+                connection.send(message)
+            except smtplib.SMTPServerDisconnected as e:
+                # The session is gone; give the rest back and reconnect on the next drain
+                self._record_failure(item, e, config)
+                self.release(batch[index + 1:])
+                raise
+            except Exception as e:
+                self._record_failure(item, e, config)
+            else:
+                item.status = EmailOutbox.STATUS_SENT
+                item.sent_at = datetime.utcnow()
+                item.attempts += 1
+                item.last_error = None
+                sent += 1
+            item.claim_token = None
+        
+        db.session.commit()
+        return sent
+    
+    def _record_failure(self, item, error, config):
+        item.attempts += 1
+        item.last_error = str(error)[:1000]
+        item.claim_token = None
+        if item.attempts >= config['MAIL_OUTBOX_MAX_ATTEMPTS']:
+            item.status = EmailOutbox.STATUS_FAILED
+            self.app.logger.error(f"Giving up on email {item.id} after {item.attempts} attempts: {error}")
+        else:
+            delay = config['MAIL_OUTBOX_BACKOFF_SECONDS'] * 2 ** (item.attempts - 1)
+            item.status = EmailOutbox.STATUS_PENDING
+            item.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+            self.app.logger.warning(f"Email {item.id} failed, retrying in {delay}s: {error}")
+    
+    def release(self, items):
+        """Return claimed but unsent messages to the pending queue."""
+        for item in items:
+            item.status = EmailOutbox.STATUS_PENDING
+            item.claim_token = None
+        db.session.commit()
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from app import db
+from app.models import User, PendingNotification
+from app.utils.email import send_todo_creation_email, send_todos_batch_email, send_todo_digest_email
+
+def notify_todos_created(user, todo_titles):
+    """Notify a user about newly created todos according to their preference.
+    
+    Instant mode queues one email (a summary when there are several
+    titles), digest mode buffers the titles for the outbox worker to send
+    once the count threshold or the time window is reached, and off sends
+    nothing. Everything is added to the caller's transaction.
+    """
+    if not todo_titles or user.notification_mode == 'off':
+        return
+    
+    if user.notification_mode == 'digest':
+        db.session.execute(db.insert(PendingNotification), [
+            {'user_id': user.id, 'todo_title': title, 'created_at': datetime.utcnow()}
+            for title in todo_titles
+        ])
+        # Wake the outbox worker after commit in case the threshold was reached
+        db.session.info['outbox_pending'] = True
+        return
+    
+    if len(todo_titles) == 1:
+        send_todo_creation_email(user.email, todo_titles[0])
+    else:
+        send_todos_batch_email(user.email, todo_titles)
+
+def flush_digest(user):
+    """Queue a digest email for the user's buffered notifications.
+    
+    Returns False without queuing anything when another worker flushed
+    the same rows first; the caller must then roll back.
+    """
+    pending = PendingNotification.query.filter_by(user_id=user.id).order_by(
+        PendingNotification.created_at, PendingNotification.id
+    ).all()
+    if not pending:
+        return True
+    
+    ids = [item.id for item in pending]
+    deleted = db.session.execute(
+        db.delete(PendingNotification)
+        .where(PendingNotification.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if deleted != len(ids):
+        return False
+    
+    send_todo_digest_email(user.email, [item.todo_title for item in pending])
+    return True
+
+def discard_digest(user):
+    """Drop the user's buffered notifications without sending them."""
+    db.session.execute(
+        db.delete(PendingNotification)
+        .where(PendingNotification.user_id == user.id)
+        .execution_options(synchronize_session=False)
+    )
+
+def flush_due_digests():
+    """Send digests that reached the count threshold or the time window.
+    
+    Called by the outbox worker before each drain. Returns the number of
+    digests queued.
+    """
+    config = current_app.config
+    cutoff = datetime.utcnow() - timedelta(seconds=config['NOTIFICATION_DIGEST_WINDOW_SECONDS'])
+    
+    user_ids = [row.user_id for row in db.session.query(PendingNotification.user_id).group_by(
+        PendingNotification.user_id
+    ).having(db.or_(
+        db.func.min(PendingNotification.created_at) <= cutoff,
+        db.func.count(PendingNotification.id) >= config['NOTIFICATION_DIGEST_MAX_ITEMS']
+    )).all()]
+    
+    flushed = 0
+    for user_id in user_ids:
+        user = db.session.get(User, user_id)
+        if user is None or not flush_digest(user):
+            db.session.rollback()
+            continue
+        db.session.commit()
+        flushed += 1
+    return flushed
@@ -0,0 +1,63 @@
+import base64
+import json
+from datetime import datetime
+
+def encode_cursor(sort_by, order, values):
+    """Encode the last row's sort key into an opaque cursor string."""
+    payload = {
+        's': sort_by,
+        'o': order,
+        'v': [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, sort_by, order, datetime_fields=()):
+    """Decode a cursor produced by encode_cursor.
+    
+    Raises ValueError if the cursor is malformed or was issued for a
+    different sort order than the current request.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values = list(payload['v'])
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError('Invalid cursor') from e
+    
+    if payload.get('s') != sort_by or payload.get('o') != order:
+        raise ValueError('Cursor does not match the requested sort order')
+    
+    for index in datetime_fields:
+        try:
+            values[index] = datetime.fromisoformat(values[index])
+        except (IndexError, TypeError, ValueError) as e:
+            raise ValueError('Invalid cursor') from e
+    
+    return values
+
+def parse_limit(value, default, maximum):
+    """Parse a page size query parameter, clamping it to [1, maximum]."""
+    if value is None:
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError('Limit must be an integer')
+    if limit < 1:
+        raise ValueError('Limit must be a positive integer')
+    return min(limit, maximum)
+
+def encode_sync_token(timestamp):
+    """Encode a change-feed position as an opaque token."""
+    raw = json.dumps({'t': timestamp.isoformat()}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_sync_token(token):
+    """Decode a token from encode_sync_token, raising ValueError if invalid."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(payload['t'])
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError('Invalid sync token') from e
@@ -0,0 +1,144 @@
+import multiprocessing
+import os
+import threading
+from functools import cached_property
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+from app import db
+from app.models import User
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hashes are already queued for the process pool."""
+
+def _pool_context():
+    # Forking copies locks held by request, outbox or rehash threads into the
+    # child, where nothing will release them; start workers from a clean process
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+class PasswordHasher:
+    """Hashes and verifies passwords in a bounded pool of processes.
+    
+    ``PASSWORD_HASH_METHOD`` takes any Werkzeug method string, e.g.
+    ``pbkdf2:sha256:600000`` or ``scrypt:32768:8:1``. Hashing runs in up to
+    ``PASSWORD_HASH_WORKERS`` processes, which caps the CPU a login storm can
+    take from todo requests. At most ``PASSWORD_HASH_MAX_PENDING`` hashes may
+    be in flight; further callers wait up to ``PASSWORD_HASH_TIMEOUT`` seconds
+    and then get ``PasswordHasherBusy``. With zero workers hashing is inline.
+    
+    Rehashes after login run on a thread pool as small as the process pool,
+    one per user at a time, and only take a hashing slot when one is free.
+    """
+    
+    def __init__(self, app=None):
+        self.app = None
+        self._executor = None
+        self._executor_pid = None
+        self._rehash_executor = None
+        self._rehash_executor_pid = None
+        self._rehashing = set()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        self.app = app
+        config = app.config
+        self.method = config['PASSWORD_HASH_METHOD']
+        self.salt_length = config['PASSWORD_HASH_SALT_LENGTH']
+        self.workers = config['PASSWORD_HASH_WORKERS']
+        self.timeout = config['PASSWORD_HASH_TIMEOUT']
+        self.max_pending = max(config['PASSWORD_HASH_MAX_PENDING'], 1)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        app.extensions['password_hasher'] = self
+    
+    def _get_executor(self):
+        # Created lazily and per process, so each forked gunicorn worker gets its own pool
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context())
+                self._executor_pid = os.getpid()
+            return self._executor
+    
+    def _get_rehash_executor(self):
+        with self._lock:
+            if self._rehash_executor is None or self._rehash_executor_pid != os.getpid():
+                self._rehash_executor = ThreadPoolExecutor(max_workers=max(self.workers, 1),
+                                                           thread_name_prefix='password-rehash')
+                self._rehash_executor_pid = os.getpid()
+            return self._rehash_executor
+    
+    def _run(self, func, *args, wait=True):
+        if not self.workers:
+            return func(*args)
+        acquired = self._slots.acquire(timeout=self.timeout) if wait else self._slots.acquire(blocking=False)
+        if not acquired:
+            raise PasswordHasherBusy('Too many password hashes in progress')
+        try:
+            return self._get_executor().submit(func, *args).result(timeout=self.timeout)
+        except FutureTimeoutError as e:
+            raise PasswordHasherBusy('Password hashing timed out') from e
+        finally:
+            self._slots.release()
+    
+    def hash(self, password, wait=True):
+        return self._run(generate_password_hash, password, self.method, self.salt_length, wait=wait)
+    
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+    
+    @cached_property
+    def prefix(self):
+        # Werkzeug fills in defaults ("scrypt" -> "scrypt:32768:8:1"); compare against the full form
+        return generate_password_hash('', self.method, 1).split('$', 1)[0]
+    
+    def needs_rehash(self, pwhash):
+        """True if the hash was made with a different method or cost."""
+        return bool(pwhash) and pwhash.split('$', 1)[0] != self.prefix
+    
+    def rehash_in_background(self, user_id, pwhash, password):
+        """Upgrade a verified password to the configured method after the response.
+        
+        The new hash is only stored if the old one is still current, so a
+        password change made in the meantime is never overwritten. Skipped
+        while the same user's rehash is still queued, or when
+        ``PASSWORD_HASH_MAX_PENDING`` rehashes are; the next login retries.
+        Returns the future, or None if nothing was queued.
+        """
+        if not self.needs_rehash(pwhash):
+            return None
+        with self._lock:
+            if user_id in self._rehashing or len(self._rehashing) >= self.max_pending:
+                return None
+            self._rehashing.add(user_id)
+        try:
+            return self._get_rehash_executor().submit(self._rehash, user_id, pwhash, password)
+        except Exception:
+            with self._lock:
+                self._rehashing.discard(user_id)
+            raise
+    
+    def _rehash(self, user_id, pwhash, password):
+        with self.app.app_context():
+            try:
+                # Logins come first: give up rather than wait for a hashing slot
+                new_hash = self.hash(password, wait=False)
+                db.session.execute(
+                    db.update(User)
+                    .where(User.id == user_id, User.password_hash == pwhash)
+                    .values(password_hash=new_hash)
+                    .execution_options(synchronize_session=False)
+                )
+                db.session.commit()
+            except PasswordHasherBusy:
+                self.app.logger.info(f"Password rehash skipped for user {user_id}: hashing pool is busy")
+            except Exception as e:
+                db.session.rollback()
+                self.app.logger.warning(f"Password rehash failed for user {user_id}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._rehashing.discard(user_id)
+
+def get_password_hasher():
+    return current_app.extensions['password_hasher']
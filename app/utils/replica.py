@@ -0,0 +1,127 @@
+from flask import current_app, has_app_context, has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from app import db
+from app.utils.cache import make_backend
+
+# Blueprints whose GET handlers may read from the replica
+REPLICA_BLUEPRINTS = {'auth', 'todos'}
+
+_listening = False
+
+def _request_user_id():
+    """The JWT subject of the current request, or None if it has none."""
+    try:
+        identity = get_jwt_identity()
+    except RuntimeError:
+        return None
+    return str(identity) if identity is not None else None
+
+def _written_user_ids(session):
+    from app.models import User
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        user_id = obj.id if isinstance(obj, User) else getattr(obj, 'user_id', None)
+        if user_id is not None:
+            yield str(user_id)
+
+def _after_flush(session, flush_context):
+    session.info.setdefault('written_users', set()).update(_written_user_ids(session))
+    session.info['wrote'] = True
+
+def _after_execute(orm_execute_state):
+    # Bulk INSERT/UPDATE/DELETE statements bypass the flush
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info['wrote'] = True
+
+def _after_commit(session):
+    written = session.info.pop('written_users', set())
+    if not session.info.pop('wrote', False) or not has_app_context():
+        return
+    router = current_app.extensions.get('replica_router')
+    if router is None or not router.enabled:
+        return
+    if has_request_context():
+        user_id = _request_user_id()
+        if user_id is not None:
+            written.add(user_id)
+    for user_id in written:
+        router.mark_write(user_id)
+    # Later reads in this request must see the write too
+    session.info['use_replica'] = False
+
+def _after_rollback(session):
+    session.info.pop('written_users', None)
+    session.info.pop('wrote', None)
+
+class ReplicaRouter:
+    """Sends reads from authenticated GET requests to the ``replica`` bind.
+    
+    Enabled when ``SQLALCHEMY_BINDS`` has a ``replica`` entry. Only SELECTs
+    issued outside a flush are routed, and only while handling GET/HEAD
+    requests in ``REPLICA_BLUEPRINTS`` with a JWT identity. After a user
+    commits a write, their reads stay on the primary for
+    ``DB_REPLICA_STICKY_SECONDS`` so they always see their own changes.
+    Stickiness lives in the cache backend, so use ``CACHE_BACKEND=redis``
+    to share it between processes.
+    """
+    
+    def __init__(self, app=None):
+        self.enabled = False
+        self.backend = None
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        self.enabled = 'replica' in (app.config.get('SQLALCHEMY_BINDS') or {})
+        self.backend = make_backend(
+            app,
+            max_entries=app.config.get('CACHE_MAX_ENTRIES', 1024),
+            ttl=app.config['DB_REPLICA_STICKY_SECONDS'],
+            prefix='todoapp:sticky:',
+            # Stickiness is needed for correctness, so never use the null cache
+            backend='lru' if app.config.get('CACHE_BACKEND') == 'null' else None
+        )
+        app.extensions['replica_router'] = self
+        
+        global _listening
+        if not _listening:
+            db.event.listen(db.session, 'after_flush', _after_flush)
+            db.event.listen(db.session, 'do_orm_execute', _after_execute)
+            db.event.listen(db.session, 'after_commit', _after_commit)
+            db.event.listen(db.session, 'after_rollback', _after_rollback)
+            _listening = True
+    
+    @property
+    def engine(self):
+        return db.engines['replica']
+    
+    def mark_write(self, user_id):
+        self.backend.set(f'sticky:{user_id}', b'1')
+    
+    def is_sticky(self, user_id):
+        return self.backend.get(f'sticky:{user_id}') is not None
+    
+    def _request_allows_replica(self):
+        if request.method not in ('GET', 'HEAD') or request.blueprint not in REPLICA_BLUEPRINTS:
+            return False
+        user_id = _request_user_id()
+        return user_id is not None and not self.is_sticky(user_id)
+    
+    def routes_to_replica(self, session, clause):
+        """True if this statement should run on the replica."""
+        if not self.enabled or session._flushing or not has_request_context():
+            return False
+        # Only plain SELECTs; DML, raw SQL and SELECT ... FOR UPDATE stay on the primary
+        if not isinstance(clause, db.Select) or clause._for_update_arg is not None:
+            return False
+        
+        decision = session.info.get('use_replica')
+        if decision is None:
+            decision = session.info['use_replica'] = self._request_allows_replica()
+        return decision
+
+def use_primary():
+    """Send the rest of this request's reads to the primary.
+    
+    Call before reading data that the request is about to write back.
+    """
+    db.session.info['use_replica'] = False
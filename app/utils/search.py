@@ -0,0 +1,113 @@
+import html
+import re
+from app import db
+from app.models import Todo
+
+# Text search configuration baked into the Postgres index; queries must match it
+TEXT_SEARCH_CONFIG = 'english'
+
+# At most this many words of a query are searched for
+MAX_QUERY_TERMS = 16
+
+# Markers put around matches by the database, replaced after HTML escaping
+MATCH_START = '\x02'
+MATCH_END = '\x03'
+
+# Title matches rank above description matches (Postgres weights A and B)
+POSTGRES_DDL = [
+    f"ALTER TABLE todos ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(description, '')), 'B')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_todos_search ON todos USING GIN (search_vector)"
+]
+
+# External-content FTS5 table kept in sync with todos by triggers
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts USING fts5("
+    "title, description, content='todos', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS todos_fts_insert AFTER INSERT ON todos BEGIN "
+    "INSERT INTO todos_fts (rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS todos_fts_delete AFTER DELETE ON todos BEGIN "
+    "INSERT INTO todos_fts (todos_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS todos_fts_update AFTER UPDATE OF title, description ON todos BEGIN "
+    "INSERT INTO todos_fts (todos_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO todos_fts (rowid, title, description) VALUES (new.id, new.title, new.description); END"
+]
+
+SEARCH_DDL = {'postgresql': POSTGRES_DDL, 'sqlite': SQLITE_DDL}
+
+fts = db.table('todos_fts', db.column('rowid'), db.column('title'), db.column('description'))
+
+def install_search_index(connection):
+    """Create the full-text index for the connection's database, if supported.
+    
+    Safe to run again. Returns False for databases without a search index.
+    """
+    statements = SEARCH_DDL.get(connection.dialect.name)
+    if statements is None:
+        return False
+    for statement in statements:
+        connection.execute(db.text(statement))
+    if connection.dialect.name == 'sqlite':
+        # Index the rows that existed before the triggers
+        connection.execute(db.text("INSERT INTO todos_fts (todos_fts) VALUES ('rebuild')"))
+    return True
+
+def _create_search_index(target, connection, **kwargs):
+    install_search_index(connection)
+
+db.event.listen(Todo.__table__, 'after_create', _create_search_index)
+
+def search_supported():
+    return db.session.get_bind().dialect.name in SEARCH_DDL
+
+def query_terms(q):
+    """The words of a search query, without any search syntax."""
+    return re.findall(r'\w+', q or '')[:MAX_QUERY_TERMS]
+
+def highlight(text):
+    """HTML-escape a database snippet and wrap its matches in ``<mark>``."""
+    if text is None:
+        return None
+    return html.escape(text).replace(MATCH_START, '<mark>').replace(MATCH_END, '</mark>')
+
+def _postgres_search(terms, snippet_words):
+    vector = db.literal_column('todos.search_vector')
+    query = db.func.plainto_tsquery(TEXT_SEARCH_CONFIG, ' '.join(terms))
+    options = f'StartSel={MATCH_START}, StopSel={MATCH_END}'
+    # float8 so the rank round-trips exactly through the cursor
+    rank = db.cast(db.func.ts_rank_cd(vector, query), db.Float(precision=53))
+    title = db.func.ts_headline(TEXT_SEARCH_CONFIG, Todo.title, query, options + ', HighlightAll=true')
+    description = db.func.ts_headline(
+        TEXT_SEARCH_CONFIG, db.func.coalesce(Todo.description, ''), query,
+        options + f', MaxWords={snippet_words}, MinWords={max(snippet_words // 2, 1)}'
+    )
+    statement = db.select(rank.label('search_rank'), title.label('title_highlight'),
+                          description.label('description_highlight')).where(vector.op('@@')(query))
+    return statement, rank
+
+def _sqlite_search(terms, snippet_words):
+    match = ' '.join(f'"{term}"' for term in terms)
+    # bm25 is lower for better matches; negate it so both databases rank descending
+    rank = -db.func.bm25(db.literal_column('todos_fts'), 2.5, 1.0)
+    title = db.func.highlight(db.literal_column('todos_fts'), 0, MATCH_START, MATCH_END)
+    description = db.func.snippet(db.literal_column('todos_fts'), 1, MATCH_START, MATCH_END,
+                                  '…', min(snippet_words, 64))
+    statement = db.select(rank.label('search_rank'), title.label('title_highlight'),
+                          description.label('description_highlight')).select_from(fts).join(
+        Todo.__table__, Todo.id == fts.c.rowid
+    ).where(db.literal_column('todos_fts').match(match))
+    return statement, rank
+
+def search_statement(terms, snippet_words):
+    """Build the ranking query for ``terms`` in the session's database.
+    
+    Returns ``(statement, rank)``: a SELECT of the rank and highlighted
+    title and description, to which the caller adds todo columns, filters
+    and ordering, plus the rank expression for keyset pagination.
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return _postgres_search(terms, snippet_words)
+    return _sqlite_search(terms, snippet_words)
@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta
+from sqlalchemy.dialects import postgresql, sqlite
+from app import db
+from app.models import Todo, TodoStats
+from app.utils.replica import use_primary
+
+# Backlog age buckets as (label, minimum age, maximum age)
+BACKLOG_AGE_BUCKETS = [
+    ('under_1_day', None, timedelta(days=1)),
+    ('1_to_7_days', timedelta(days=1), timedelta(days=7)),
+    ('7_to_30_days', timedelta(days=7), timedelta(days=30)),
+    ('over_30_days', timedelta(days=30), None)
+]
+
+def _dialect():
+    return db.session.get_bind().dialect.name
+
+def create_todo_stats(user_id):
+    """Insert a user's zeroed stats row unless one already exists.
+    
+    Uses ``ON CONFLICT DO NOTHING``, so concurrent first writes for the
+    same user cannot fail on the primary key.
+    """
+    insert = postgresql.insert if _dialect() == 'postgresql' else sqlite.insert
+    db.session.execute(
+        insert(TodoStats)
+        .values(user_id=user_id, total_count=0, completed_count=0, version=0, updated_at=datetime.utcnow())
+        .on_conflict_do_nothing(index_elements=[TodoStats.user_id])
+    )
+
+def _count_todos(user_id):
+    """Return (total, completed) counted from the todos table."""
+    return db.session.query(
+        db.func.count(Todo.id),
+        db.func.coalesce(db.func.sum(db.case((Todo.completed.is_(True), 1), else_=0)), 0)
+    ).filter(Todo.user_id == user_id).one()
+
+def refresh_todo_stats(user_id):
+    """Recompute a user's counters from the todos table in one query.
+    
+    Pending changes must be flushed first so they are included.
+    """
+    # The counts are written back, so they must not come from a lagging replica
+    use_primary()
+    total, completed = _count_todos(user_id)
+    create_todo_stats(user_id)
+    db.session.execute(
+        db.update(TodoStats)
+        .where(TodoStats.user_id == user_id)
+        .values(
+            total_count=total,
+            completed_count=completed,
+            version=TodoStats.version + 1,
+            updated_at=datetime.utcnow()
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return db.session.get(TodoStats, user_id, populate_existing=True)
+
+def adjust_todo_stats(user_id, total=0, completed=0):
+    """Apply a delta to a user's counters inside the current transaction.
+    
+    Every todo write should call this, even with no delta, because it also
+    bumps the collection version used for ETags. Falls back to a full
+    recompute when the user has no stats row yet, so callers must flush
+    their todo changes before calling this.
+    """
+    result = db.session.execute(
+        db.update(TodoStats)
+        .where(TodoStats.user_id == user_id)
+        .values(
+            total_count=TodoStats.total_count + total,
+            completed_count=TodoStats.completed_count + completed,
+            version=TodoStats.version + 1,
+            updated_at=datetime.utcnow()
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        refresh_todo_stats(user_id)
+
+def _get_stats(user_id):
+    """Return the user's stats row without writing anything.
+    
+    Rows are created at registration and backfilled by migration 2. If one
+    is still missing, counts are computed on the fly into an unsaved row
+    with version 0, and the next todo write creates the real one.
+    """
+    stats = db.session.get(TodoStats, user_id)
+    if stats is None:
+        total, completed = _count_todos(user_id)
+        stats = TodoStats(user_id=user_id, total_count=total, completed_count=completed, version=0)
+    return stats
+
+def get_stats_summary(user_id):
+    """Return the user's counters."""
+    return _get_stats(user_id).to_dict()
+
+def get_collection_version(user_id):
+    """Return (version, last modified) for the user's todo collection."""
+    stats = _get_stats(user_id)
+    return stats.version, stats.updated_at
+
+def _period_bucket(column, period):
+    """SQL expression truncating a timestamp to its day or ISO week start."""
+    if _dialect() == 'postgresql':
+        if period == 'week':
+            return db.cast(db.func.date_trunc('week', column), db.Date)
+        return db.cast(column, db.Date)
+    if period == 'week':
+        # Move to the following Sunday, then back to that week's Monday
+        return db.func.date(column, 'weekday 0', '-6 days')
+    return db.func.date(column)
+
+def get_activity(user_id, period='day', days=30):
+    """Count todos created and completed per day or week over a window."""
+    since = datetime.utcnow() - timedelta(days=days)
+    timeline = {}
+    
+    for field, column in (('created', Todo.created_at), ('completed', Todo.completed_at)):
+        bucket = _period_bucket(column, period).label('bucket')
+        rows = db.session.query(bucket, db.func.count(Todo.id)).filter(
+            Todo.user_id == user_id,
+            column >= since
+        ).group_by(bucket).all()
+        for key, count in rows:
+            key = key.isoformat() if hasattr(key, 'isoformat') else str(key)
+            entry = timeline.setdefault(key, {'period_start': key, 'created': 0, 'completed': 0})
+            entry[field] = count
+    
+    return [timeline[key] for key in sorted(timeline)]
+
+def _completion_seconds():
+    """SQL expression for the seconds between creation and completion."""
+    if _dialect() == 'postgresql':
+        return db.func.extract('epoch', Todo.completed_at - Todo.created_at)
+    return (db.func.julianday(Todo.completed_at) - db.func.julianday(Todo.created_at)) * 86400.0
+
+def get_median_completion_seconds(user_id):
+    """Median time from creation to completion, or None with no completions."""
+    duration = _completion_seconds()
+    completed = db.session.query(duration.label('seconds')).filter(
+        Todo.user_id == user_id,
+        Todo.completed.is_(True),
+        Todo.completed_at.isnot(None)
+    )
+    
+    if _dialect() == 'postgresql':
+        median = db.session.query(
+            db.func.percentile_cont(0.5).within_group(duration)
+        ).filter(
+            Todo.user_id == user_id,
+            Todo.completed.is_(True),
+            Todo.completed_at.isnot(None)
+        ).scalar()
+        return round(float(median), 1) if median is not None else None
+    
+    # No percentile function in SQLite: read the middle one or two rows
+    count = completed.count()
+    if count == 0:
+        return None
+    middle = completed.order_by(duration).offset((count - 1) // 2).limit(2 - count % 2).all()
+    return round(sum(row.seconds for row in middle) / len(middle), 1)
+
+def get_backlog_age(user_id):
+    """Bucket the user's pending todos by age in one conditional aggregate."""
+    now = datetime.utcnow()
+    columns = []
+    for label, min_age, max_age in BACKLOG_AGE_BUCKETS:
+        conditions = []
+        if min_age is not None:
+            conditions.append(Todo.created_at <= now - min_age)
+        if max_age is not None:
+            conditions.append(Todo.created_at > now - max_age)
+        columns.append(
+            db.func.coalesce(db.func.sum(db.case((db.and_(*conditions), 1), else_=0)), 0).label(label)
+        )
+    
+    row = db.session.query(*columns).filter(
+        Todo.user_id == user_id,
+        Todo.completed.is_(False)
+    ).one()
+    return dict(row._mapping)
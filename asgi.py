@@ -0,0 +1,20 @@
+"""
+ASGI entry point, for serving the API with an ASGI server:
+    
+    uvicorn asgi:app --host 0.0.0.0 --port $PORT
+
+Requests run on a pool of ASGI_THREADS threads, so requests waiting on
+Google or the database overlap instead of queueing behind each other.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from app.utils.asgi import ThreadedWsgiToAsgi
+from run import app as wsgi_app
+
+executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('ASGI_THREADS') or 32),
+    thread_name_prefix='asgi'
+)
+
+app = ThreadedWsgiToAsgi(wsgi_app, executor)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark compressed GET /api/todos responses. For each content-coding,
+reports the body size and requests per second with the response cache
+disabled (serialize and compress every time) and enabled (serve the
+precompressed entry).
+    
+    python benchmarks/bench_compression.py [todos] [requests]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app
+from app.utils.compression import CODINGS
+
+def make_client(count, cache_backend):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+        MAIL_OUTBOX_IN_PROCESS = False
+        CACHE_BACKEND = cache_backend
+        TODOS_MAX_PAGE_SIZE = count
+    
+    client = create_app(BenchConfig).test_client()
+    token = client.post('/api/register', json={'email': 'bench@example.com', 'password': 'secret123'}).get_json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    todos = [{'title': f'Todo number {i}', 'description': f'Details for todo {i}'} for i in range(count)]
+    client.post('/api/todos/batch', json={'todos': todos}, headers=headers)
+    return client, headers
+
+def measure(client, headers, url, total):
+    """Return (requests per second, body bytes)."""
+    size = len(client.get(url, headers=headers).data)
+    start = time.perf_counter()
+    for _ in range(total):
+        client.get(url, headers=headers)
+    return total / (time.perf_counter() - start), size
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    url = f'/api/todos?limit={count}'
+    clients = {backend: make_client(count, backend) for backend in ('null', 'lru')}
+    
+    print(f"GET {count} todos, {total} requests per row")
+    print(f"{'coding':10s} {'bytes':>10s} {'uncached req/s':>15s} {'cached req/s':>13s}")
+    for coding in ['identity'] + list(CODINGS):
+        rates = {}
+        for backend, (client, headers) in clients.items():
+            rates[backend], size = measure(client, dict(headers, **{'Accept-Encoding': coding}), url, total)
+        print(f"{coding:10s} {size:10d} {rates['null']:15.0f} {rates['lru']:13.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark request concurrency when an upstream is slow. Starts the Google
+stub with a fixed delay, runs the app under each serving mode in a
+subprocess and fires concurrent Google OAuth callbacks (token exchange
+plus userinfo, so two slow upstream calls per request) at it.
+    
+    python benchmarks/bench_concurrency.py [requests] [concurrency] [delay ms]
+
+Modes: gunicorn sync (1 worker, 1 thread), gunicorn gthread (1 worker,
+GUNICORN_THREADS threads) and uvicorn with asgi.py (1 worker).
+"""
+
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import requests
+from google_stub import GoogleStub
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def modes(port):
+    gunicorn = [sys.executable, '-m', 'gunicorn', 'run:app', '-c', 'gunicorn.conf.py']
+    yield 'gunicorn sync', gunicorn, {'GUNICORN_WORKERS': '1', 'GUNICORN_THREADS': '1'}
+    yield 'gunicorn gthread', gunicorn, {'GUNICORN_WORKERS': '1', 'GUNICORN_THREADS': '16'}
+    if shutil.which('uvicorn') or _importable('uvicorn'):
+        uvicorn = [sys.executable, '-m', 'uvicorn', 'asgi:app', '--port', str(port),
+                   '--log-level', 'warning', '--lifespan', 'off']
+        yield 'uvicorn asgi', uvicorn, {'ASGI_THREADS': '16'}
+
+def _importable(name):
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+def wait_until_up(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f'Server at {url} did not start')
+
+def run_load(url, total, concurrency):
+    """Return (requests per second, sorted latencies in ms, failures)."""
+    def one(_):
+        start = time.perf_counter()
+        response = requests.get(url, allow_redirects=False, timeout=60)
+        return (time.perf_counter() - start) * 1000, response.status_code == 302
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for latency, _ in results)
+    failures = sum(1 for _, ok in results if not ok)
+    return total / elapsed, latencies, failures
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    delay_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 200
+    
+    stub = GoogleStub().start()
+    stub.delay = delay_ms / 1000
+    print(f"{total} OAuth callbacks, {concurrency} concurrent, upstream delay {delay_ms:.0f} ms per call\n")
+    print(f"{'mode':18s} {'req/s':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'failed':>7s}")
+    
+    for name, command, extra_env in modes(port := free_port()):
+        env = dict(os.environ, PORT=str(port), **extra_env)
+        env.update({
+            'DATABASE_URL': 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'),
+            'GOOGLE_CLIENT_ID': 'bench-client',
+            'GOOGLE_CLIENT_SECRET': 'bench-secret',
+            'GOOGLE_TOKEN_URL': stub.url + '/token',
+            'GOOGLE_USERINFO_URL': stub.url + '/userinfo',
+            'MAIL_OUTBOX_IN_PROCESS': 'False',
+            'GUNICORN_TIMEOUT': '120'
+        })
+        server = subprocess.Popen(command, cwd=ROOT, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            base = f'http://127.0.0.1:{port}'
+            wait_until_up(base + '/')
+            # Create the user first so concurrent callbacks only log in
+            requests.get(base + '/api/auth/google/callback?code=bench', allow_redirects=False, timeout=60)
+            rate, latencies, failures = run_load(base + '/api/auth/google/callback?code=bench', total, concurrency)
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+            print(f"{name:18s} {rate:8.1f} {p50:8.0f} {p95:8.0f} {failures:7d}")
+        finally:
+            server.terminate()
+            server.wait()
+    stub.stop()
+
+if __name__ == '__main__':
+    main()
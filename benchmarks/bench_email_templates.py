@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark email body rendering throughput. Compares the old inline
+f-string bodies, a Jinja2 template compiled on every call, and the
+precompiled notification templates used by the outbox.
+    
+    python benchmarks/bench_email_templates.py [iterations] [titles]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.email_templates import render_notification, _build_environment
+
+def render_fstring(titles, max_listed=20):
+    """The pre-template batch email bodies, built inline."""
+    listed = titles[:max_listed]
+    more = len(titles) - len(listed)
+    subject = f"{len(titles)} New Todos Created - TodoApp"
+    text_items = ''.join(f"  - {title}\n" for title in listed)
+    if more:
+        text_items += f"  ...and {more} more\n"
+    text_body = f"""Hello!
+
+{len(titles)} new todos have been created in your TodoApp account:
+
+{text_items}
+You can manage your todos by logging into your account.
+
+Best regards,
+TodoApp Team
+"""
+    html_items = ''.join(f"<li>{title}</li>" for title in listed)
+    if more:
+        html_items += f"<li>...and {more} more</li>"
+    html_body = f"""<html>
+  <body>
+    <h2>{len(titles)} New Todos Created</h2>
+    <p>Hello!</p>
+    <p>{len(titles)} new todos have been created in your TodoApp account:</p>
+    <ul>{html_items}</ul>
+    <p>You can manage your todos by logging into your account.</p>
+    <p>Best regards,<br>TodoApp Team</p>
+  </body>
+</html>
+"""
+    return subject, text_body, html_body
+
+def render_uncached(titles, max_listed=20):
+    """Build a fresh environment and compile the templates for each email."""
+    environment = _build_environment()
+    context = {'titles': titles, 'count': len(titles), 'max_listed': max_listed}
+    return tuple(
+        environment.get_template(f'todos_created.{part}').render(**context)
+        for part in ('subject', 'txt', 'html')
+    )
+
+def render_precompiled(titles, max_listed=20):
+    return render_notification('todos_created', titles=titles, count=len(titles), max_listed=max_listed)
+
+def measure(func, titles, iterations):
+    """Return emails rendered per second."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(titles)
+    return iterations / (time.perf_counter() - start)
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    titles = [f'Todo <{i}> & friends' for i in range(count)]
+    
+    print(f"Rendering {iterations} emails with {count} titles each")
+    for name, func, runs in (
+        ('f-string (unescaped)', render_fstring, iterations),
+        ('jinja2, compiled per call', render_uncached, max(iterations // 50, 1)),
+        ('jinja2, precompiled', render_precompiled, iterations)
+    ):
+        rate = measure(func, titles, runs)
+        print(f"{name:28s} {rate:10.0f} emails/s")
+
+if __name__ == '__main__':
+    main()
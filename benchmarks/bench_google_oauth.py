@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Google OAuth code exchange against the local stub
+(google_stub.py). Compares a bare requests.post/get per call, which opens
+a new connection each time, with the app's pooled HTTPClient session.
+    
+    python benchmarks/bench_google_oauth.py [exchanges] [stub delay ms]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from config import Config
+from app import create_app
+from app.utils.google_oauth import GoogleOAuth
+from google_stub import GoogleStub
+
+def bare_exchange(stub):
+    """The pre-pooling code path: new connection, no timeout."""
+    token = requests.post(stub.url + '/token', data={'code': 'stub-code'}).json()
+    return requests.get(stub.url + '/userinfo',
+                        headers={'Authorization': f"Bearer {token['access_token']}"}).json()
+
+def pooled_exchange(stub):
+    token = GoogleOAuth.exchange_code_for_token('stub-code')
+    return GoogleOAuth.get_user_info(token['access_token'])
+
+def measure(func, stub, count):
+    """Return (exchanges per second, connections opened)."""
+    connections = stub.connections
+    start = time.perf_counter()
+    for _ in range(count):
+        func(stub)
+    return count / (time.perf_counter() - start), stub.connections - connections
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    stub = GoogleStub().start()
+    stub.delay = (float(sys.argv[2]) if len(sys.argv) > 2 else 0) / 1000
+    
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+        GOOGLE_TOKEN_URL = stub.url + '/token'
+        GOOGLE_USERINFO_URL = stub.url + '/userinfo'
+        MAIL_OUTBOX_IN_PROCESS = False
+    app = create_app(BenchConfig)
+    
+    print(f"{count} code exchanges (token + userinfo) against {stub.url}")
+    with app.test_request_context():
+        for name, func in (('bare requests', bare_exchange), ('pooled session', pooled_exchange)):
+            rate, connections = measure(func, stub, count)
+            print(f"{name:16s} {rate:8.1f} exchanges/s {connections:6d} connections")
+    stub.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark building the todo list response body. Compares loading ORM
+objects and calling to_dict() with the stdlib encoder (the old path)
+against selecting plain columns with the stdlib and orjson providers.
+    
+    python benchmarks/bench_json_serialization.py [sizes...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app, db
+from app.models import Todo, User
+from app.routes.todos import TODO_COLUMNS, rows_to_dicts
+from app.utils.json_provider import JSON_PROVIDERS, orjson
+
+def make_app():
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+        MAIL_OUTBOX_IN_PROCESS = False
+    return create_app(BenchConfig)
+
+def seed(user_id, count):
+    now = datetime.utcnow()
+    db.session.execute(db.insert(Todo), [
+        {'title': f'Todo {i}', 'description': f'Description of todo {i}',
+         'completed': i % 3 == 0, 'created_at': now, 'updated_at': now, 'user_id': user_id}
+        for i in range(count)
+    ])
+    db.session.commit()
+
+def orm_body(app, user_id):
+    todos = Todo.query.filter_by(user_id=user_id).order_by(Todo.id).all()
+    return app.json.dumps({'todos': [todo.to_dict() for todo in todos], 'count': len(todos)})
+
+def columns_body(app, user_id):
+    rows = db.session.query(*TODO_COLUMNS).filter(Todo.user_id == user_id).order_by(Todo.id).all()
+    return app.json.dumps({'todos': rows_to_dicts(rows), 'count': len(rows)})
+
+def measure(func, app, user_id, runs):
+    """Return the best time in ms over ``runs`` calls."""
+    best = None
+    for _ in range(runs):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        func(app, user_id)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    app = make_app()
+    stdlib = JSON_PROVIDERS['stdlib'](app)
+    fast = JSON_PROVIDERS['orjson'](app) if orjson is not None else None
+    
+    with app.app_context():
+        db.create_all()
+        print(f"{'rows':>8s} {'orm + stdlib':>14s} {'cols + stdlib':>14s} {'cols + orjson':>14s}  (ms, best of 3)")
+        for size in sizes:
+            user = User(email=f'bench{size}@example.com')
+            db.session.add(user)
+            db.session.commit()
+            seed(user.id, size)
+            
+            app.json = stdlib
+            results = [measure(orm_body, app, user.id, 3), measure(columns_body, app, user.id, 3)]
+            if fast is not None:
+                app.json = fast
+                results.append(measure(columns_body, app, user.id, 3))
+            print(f"{size:8d} " + ' '.join(f"{ms:14.1f}" for ms in results))
+        
+        if fast is None:
+            print("\norjson is not installed; only the stdlib provider was measured")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark password verification, the CPU cost of a login, for a few
+hash methods. Reports logins per second on one core and across a process
+pool, which is what PASSWORD_HASH_WORKERS configures.
+    
+    python benchmarks/bench_password_hashing.py [seconds] [workers] [method ...]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+
+METHODS = ['pbkdf2:sha256:600000', 'pbkdf2:sha256:260000', 'scrypt:32768:8:1', 'scrypt:16384:8:1']
+
+def serial_rate(pwhash, seconds):
+    """Verifications per second in this process."""
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        check_password_hash(pwhash, 'correct horse battery staple')
+        count += 1
+    return count / (time.perf_counter() - start)
+
+def pool_rate(pwhash, seconds, workers, serial):
+    """Verifications per second across a process pool."""
+    # Size the run from the serial rate so it lasts about ``seconds``
+    total = max(int(serial * workers * seconds), workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Warm the pool so process start-up is not measured
+        list(executor.map(check_password_hash, [pwhash] * workers, ['x'] * workers))
+        start = time.perf_counter()
+        list(executor.map(check_password_hash, [pwhash] * total,
+                          ['correct horse battery staple'] * total, chunksize=1))
+        return total / (time.perf_counter() - start)
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    methods = sys.argv[3:] or METHODS
+    
+    print(f"{'method':24s} {'1 core':>10s} {f'{workers} procs':>10s} {'per core':>10s}  logins/s")
+    for method in methods:
+        pwhash = generate_password_hash('correct horse battery staple', method)
+        serial = serial_rate(pwhash, seconds)
+        pooled = pool_rate(pwhash, seconds, workers, serial)
+        print(f"{method:24s} {serial:10.1f} {pooled:10.1f} {pooled / workers:10.1f}")
+
+if __name__ == '__main__':
+    main()
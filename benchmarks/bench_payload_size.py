@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Compare GET /api/todos payload sizes for the response encodings: full
+JSON objects, a sparse fieldset, the columnar shape and MessagePack, raw
+and gzip-compressed.
+    
+    python benchmarks/bench_payload_size.py [todos]
+"""
+
+import gzip
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app, db
+from app.models import Todo, User
+from app.utils.encoding import msgpack
+
+def make_client(count):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+        MAIL_OUTBOX_IN_PROCESS = False
+        TODOS_MAX_PAGE_SIZE = count
+    
+    app = create_app(BenchConfig)
+    client = app.test_client()
+    token = client.post('/api/register', json={'email': 'bench@example.com', 'password': 'secret123'}).get_json()['access_token']
+    with app.app_context():
+        user = User.query.filter_by(email='bench@example.com').one()
+        now = datetime.utcnow()
+        db.session.execute(db.insert(Todo), [
+            {'title': f'Todo number {i}', 'description': f'Details for todo {i}',
+             'completed': i % 3 == 0, 'created_at': now, 'updated_at': now, 'user_id': user.id}
+            for i in range(count)
+        ])
+        db.session.commit()
+    return client, {'Authorization': f'Bearer {token}'}
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    client, headers = make_client(count)
+    msgpack_headers = dict(headers, Accept='application/msgpack')
+    
+    cases = [
+        ('json, all fields', '', headers),
+        ('json, fields=id,title,completed', 'fields=id,title,completed', headers),
+        ('json columns, all fields', 'shape=columns', headers),
+        ('json columns, 3 fields', 'shape=columns&fields=id,title,completed', headers)
+    ]
+    if msgpack is not None:
+        cases += [
+            ('msgpack, all fields', '', msgpack_headers),
+            ('msgpack columns, 3 fields', 'shape=columns&fields=id,title,completed', msgpack_headers)
+        ]
+    
+    print(f"{count} todos")
+    print(f"{'encoding':34s} {'bytes':>10s} {'gzip':>10s} {'vs full':>8s}")
+    baseline = None
+    for name, query, request_headers in cases:
+        response = client.get(f'/api/todos?limit={count}&{query}', headers=request_headers)
+        assert response.status_code == 200, response.status_code
+        size = len(response.data)
+        baseline = baseline or size
+        print(f"{name:34s} {size:10d} {len(gzip.compress(response.data)):10d} {size / baseline:7.0%}")
+    
+    if msgpack is None:
+        print("\nmsgpack is not installed; MessagePack was not measured")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark the todo access patterns before and after the index migration.
+Builds a throwaway SQLite database (or uses BENCH_DATABASE_URL), loads
+synthetic todos, prints the query plan and timing of each hot query
+without the composite indexes, then applies migration 1 and repeats.
+    
+    python benchmarks/bench_query_plans.py [rows] [users]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from config import Config
+from app import create_app, db
+from app.models import User, Todo
+from migrate_db import add_todo_indexes
+
+QUERIES = {
+    'list page (created_at desc)':
+        "SELECT * FROM todos WHERE user_id = :uid ORDER BY created_at DESC, id DESC LIMIT 50",
+    'list pending page':
+        "SELECT * FROM todos WHERE user_id = :uid AND completed = :done "
+        "ORDER BY created_at DESC, id DESC LIMIT 50",
+    'list page (updated_at asc)':
+        "SELECT * FROM todos WHERE user_id = :uid ORDER BY updated_at ASC, id ASC LIMIT 50",
+    'stats total':
+        "SELECT count(*) FROM todos WHERE user_id = :uid",
+    'stats completed':
+        "SELECT count(*) FROM todos WHERE user_id = :uid AND completed = :done",
+}
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = os.environ.get('BENCH_DATABASE_URL') or \
+        'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+def explain(connection, sql, params):
+    """Return the query plan for a statement as a list of lines."""
+    if connection.dialect.name == 'sqlite':
+        rows = connection.execute(text('EXPLAIN QUERY PLAN ' + sql), params)
+        return [row[-1] for row in rows]
+    rows = connection.execute(text('EXPLAIN ' + sql), params)
+    return [row[0] for row in rows]
+
+def time_query(connection, sql, params, repeat=20):
+    """Return the mean execution time of a statement in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        connection.execute(text(sql), params).fetchall()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def report(connection, label, params):
+    print(f"\n=== {label} ===")
+    for name, sql in QUERIES.items():
+        plan = explain(connection, sql, params)
+        elapsed = time_query(connection, sql, params)
+        print(f"{name:32s} {elapsed:8.3f} ms")
+        for line in plan:
+            print(f"    {line}")
+
+def seed(rows, users):
+    """Insert synthetic users and todos in bulk."""
+    db.session.execute(Todo.__table__.delete())
+    db.session.execute(User.__table__.delete())
+    db.session.execute(User.__table__.insert(), [
+        {'id': i + 1, 'email': f'bench{i}@example.com', 'created_at': datetime.utcnow()}
+        for i in range(users)
+    ])
+    base = datetime.utcnow() - timedelta(days=365)
+    batch = []
+    for i in range(rows):
+        stamp = base + timedelta(seconds=i * 7)
+        batch.append({
+            'title': f'Todo {i}',
+            'description': 'benchmark row',
+            'completed': i % 3 == 0,
+            'created_at': stamp,
+            'updated_at': stamp + timedelta(seconds=i % 11),
+            'user_id': i % users + 1
+        })
+        if len(batch) == 5000:
+            db.session.execute(Todo.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(Todo.__table__.insert(), batch)
+    db.session.commit()
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    app = create_app(BenchConfig)
+    
+    with app.app_context():
+        # Start from the pre-migration schema: no secondary indexes on todos
+        with db.engine.begin() as connection:
+            for index in Todo.__table__.indexes:
+                index.drop(connection, checkfirst=True)
+        
+        print(f"Seeding {rows} todos across {users} users...")
+        seed(rows, users)
+        params = {'uid': 1, 'done': False}
+        
+        with db.engine.connect() as connection:
+            connection.execute(text('ANALYZE'))
+            report(connection, 'before migration', params)
+        
+        with db.engine.begin() as connection:
+            add_todo_indexes(connection)
+        
+        with db.engine.connect() as connection:
+            connection.execute(text('ANALYZE'))
+            report(connection, 'after migration', params)
+
+if __name__ == '__main__':
+    main()
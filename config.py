@@ -15,6 +15,75 @@ class Config:
     SQLALCHEMY_DATABASE_URI = DATABASE_URL or 'sqlite:///todoapp.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Connection pool: pre-ping drops dead connections, recycle closes old ones
+    # before the server or a proxy times them out
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'True').lower() in ['true', '1', 'yes'],
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE') or 1800)
+    }
+    if not SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+        SQLALCHEMY_ENGINE_OPTIONS.update({
+            'pool_size': int(os.environ.get('DB_POOL_SIZE') or 10),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW') or 20),
+            'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT') or 30)
+        })
+    
+    # Optional read replica for GET requests; a user's reads stay on the
+    # primary for DB_REPLICA_STICKY_SECONDS after they write
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    if DATABASE_REPLICA_URL and DATABASE_REPLICA_URL.startswith("postgres://"):
+        DATABASE_REPLICA_URL = DATABASE_REPLICA_URL.replace("postgres://", "postgresql://", 1)
+    SQLALCHEMY_BINDS = {'replica': DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    DB_REPLICA_STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS') or 5)
+    
+    # JSON encoder for responses: auto (orjson if installed), orjson or stdlib
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER') or 'auto'
+    
+    # Response compression: content-codings in order of preference (br and zstd
+    # need the brotli and zstandard packages) and the smallest body to compress
+    COMPRESS_ALGORITHMS = [coding.strip() for coding in
+                           (os.environ.get('COMPRESS_ALGORITHMS') or 'zstd,br,gzip').split(',') if coding.strip()]
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE') or 1024)
+    
+    # Pagination Configuration
+    TODOS_PAGE_SIZE = int(os.environ.get('TODOS_PAGE_SIZE') or 100)
+    TODOS_MAX_PAGE_SIZE = int(os.environ.get('TODOS_MAX_PAGE_SIZE') or 500)
+    # Words of description context around search matches
+    SEARCH_SNIPPET_WORDS = int(os.environ.get('SEARCH_SNIPPET_WORDS') or 12)
+    # Rows/IDs per statement for bulk operations on databases with parameter limits
+    BULK_CHUNK_SIZE = int(os.environ.get('BULK_CHUNK_SIZE') or 500)
+    BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS') or 5000)
+    # Sub-requests allowed in one POST /api/batch call
+    BATCH_MAX_OPERATIONS = int(os.environ.get('BATCH_MAX_OPERATIONS') or 20)
+    # Rows fetched per round trip from the server-side cursor during exports
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE') or 1000)
+    # Rows committed per transaction during imports, and per-line errors reported
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE') or 1000)
+    IMPORT_MAX_BATCH_SIZE = int(os.environ.get('IMPORT_MAX_BATCH_SIZE') or 10000)
+    IMPORT_MAX_ERRORS = int(os.environ.get('IMPORT_MAX_ERRORS') or 1000)
+    # Changes this recent are repeated in the next sync to cover in-flight commits
+    TODOS_SYNC_OVERLAP_SECONDS = int(os.environ.get('TODOS_SYNC_OVERLAP_SECONDS') or 2)
+    
+    # Response Cache Configuration (lru is per process; use redis with multiple workers)
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND') or 'lru'
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES') or 1024)
+    CACHE_TTL = int(os.environ.get('CACHE_TTL') or 300)
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL') or 'redis://localhost:6379/0'
+    # Authenticated user lookups (email, notification mode) cached per JWT subject
+    IDENTITY_CACHE_MAX_ENTRIES = int(os.environ.get('IDENTITY_CACHE_MAX_ENTRIES') or 4096)
+    IDENTITY_CACHE_TTL = int(os.environ.get('IDENTITY_CACHE_TTL') or 60)
+    # Serve /api/metrics/cache (process-wide counters; keep off on public deployments)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'False').lower() in ['true', '1', 'yes']
+    
+    # Password Hashing (any Werkzeug method, e.g. scrypt:32768:8:1); hashes made
+    # with other parameters are upgraded on the next successful login
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'pbkdf2:sha256:600000'
+    PASSWORD_HASH_SALT_LENGTH = int(os.environ.get('PASSWORD_HASH_SALT_LENGTH') or 16)
+    # Processes per app worker that run hashes (0 hashes in the request thread)
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS') or 2)
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING') or 16)
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT') or 10)
+    
     # JWT Configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-string'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
@@ -22,6 +91,25 @@ class Config:
     # Google OAuth Configuration
     GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
     GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET')
+    # Endpoints are configurable so a local stub can stand in for Google
+    GOOGLE_AUTH_URL = os.environ.get('GOOGLE_AUTH_URL') or 'https://accounts.google.com/o/oauth2/v2/auth'
+    GOOGLE_TOKEN_URL = os.environ.get('GOOGLE_TOKEN_URL') or 'https://oauth2.googleapis.com/token'
+    GOOGLE_USERINFO_URL = os.environ.get('GOOGLE_USERINFO_URL') or 'https://www.googleapis.com/oauth2/v1/userinfo'
+    # ID token signing certs; a file:// URL verifies offline against a local key set
+    GOOGLE_CERTS_URL = os.environ.get('GOOGLE_CERTS_URL') or 'https://www.googleapis.com/oauth2/v1/certs'
+    # Used when the certs response has no Cache-Control max-age
+    GOOGLE_CERTS_DEFAULT_MAX_AGE = int(os.environ.get('GOOGLE_CERTS_DEFAULT_MAX_AGE') or 3600)
+    GOOGLE_CERTS_TIMEOUT = float(os.environ.get('GOOGLE_CERTS_TIMEOUT') or 5)
+    
+    # Outbound HTTP (Google): pooled keep-alive session, timeouts in seconds,
+    # retries with exponential backoff and a per-host circuit breaker
+    HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT') or 3.05)
+    HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT') or 10)
+    HTTP_RETRIES = int(os.environ.get('HTTP_RETRIES') or 2)
+    HTTP_BACKOFF_FACTOR = float(os.environ.get('HTTP_BACKOFF_FACTOR') or 0.3)
+    HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE') or 10)
+    HTTP_CIRCUIT_FAILURES = int(os.environ.get('HTTP_CIRCUIT_FAILURES') or 5)
+    HTTP_CIRCUIT_RESET_SECONDS = float(os.environ.get('HTTP_CIRCUIT_RESET_SECONDS') or 30)
     
     # Mail Configuration
     MAIL_SERVER = os.environ.get('MAIL_SERVER') or 'smtp.gmail.com'
@@ -31,6 +119,20 @@ class Config:
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     
+    # Email Outbox Worker Configuration
+    # Set MAIL_OUTBOX_IN_PROCESS=False when a separate `python worker.py` drains the outbox
+    MAIL_OUTBOX_IN_PROCESS = os.environ.get('MAIL_OUTBOX_IN_PROCESS', 'True').lower() in ['true', '1', 'yes']
+    MAIL_OUTBOX_WORKERS = int(os.environ.get('MAIL_OUTBOX_WORKERS') or 2)
+    MAIL_OUTBOX_BATCH_SIZE = int(os.environ.get('MAIL_OUTBOX_BATCH_SIZE') or 50)
+    MAIL_OUTBOX_POLL_INTERVAL = float(os.environ.get('MAIL_OUTBOX_POLL_INTERVAL') or 5)
+    MAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('MAIL_OUTBOX_MAX_ATTEMPTS') or 5)
+    MAIL_OUTBOX_BACKOFF_SECONDS = int(os.environ.get('MAIL_OUTBOX_BACKOFF_SECONDS') or 30)
+    MAIL_OUTBOX_CLAIM_TIMEOUT = int(os.environ.get('MAIL_OUTBOX_CLAIM_TIMEOUT') or 300)
+    
+    # Digest notifications: flush after this many buffered todos or this many seconds
+    NOTIFICATION_DIGEST_MAX_ITEMS = int(os.environ.get('NOTIFICATION_DIGEST_MAX_ITEMS') or 20)
+    NOTIFICATION_DIGEST_WINDOW_SECONDS = int(os.environ.get('NOTIFICATION_DIGEST_WINDOW_SECONDS') or 3600)
+    
     # CORS Configuration - Allow production URLs
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '').split(',') if os.environ.get('CORS_ORIGINS') else [
         "http://localhost:3000", 
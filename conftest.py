@@ -0,0 +1,37 @@
+"""
+Shared setup for the offline tests.
+The tests run as scripts or under pytest, and import their app and client
+factories from here.
+"""
+
+import os
+import tempfile
+
+from config import Config
+from app import create_app
+
+def make_app(**overrides):
+    """Create an app on a fresh SQLite file with email and the in-process
+    outbox turned off and the cache metrics on. Keyword arguments override
+    config values."""
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test.db')
+        MAIL_SUPPRESS_SEND = True
+        MAIL_OUTBOX_IN_PROCESS = False
+        METRICS_ENABLED = True
+    
+    for name, value in overrides.items():
+        setattr(TestConfig, name, value)
+    return create_app(TestConfig)
+
+def register(client, email='test@example.com', password='secret123'):
+    """Register a user and return the Authorization headers for them."""
+    response = client.post('/api/register', json={'email': email, 'password': password})
+    assert response.status_code == 201, response.get_json()
+    return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+def make_client(email='test@example.com', **overrides):
+    """Create an app and register a user; returns ``(client, headers)``."""
+    client = make_app(**overrides).test_client()
+    return client, register(client, email)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Minimal local stand-in for Google's OAuth endpoints, for development,
+tests and benchmarks. It serves the token exchange, userinfo and signing
+certs endpoints over keep-alive HTTP/1.1 and counts requests and connections.
+    
+    python google_stub.py [port]
+
+Then run the app with
+GOOGLE_TOKEN_URL=http://127.0.0.1:<port>/token
+GOOGLE_USERINFO_URL=http://127.0.0.1:<port>/userinfo
+GOOGLE_CERTS_URL=http://127.0.0.1:<port>/certs
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class GoogleStubHandler(BaseHTTPRequestHandler):
+    """Answers /token (POST), /userinfo and /certs (GET)."""
+    
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this keep-alive
+    # responses stall on delayed ACKs
+    disable_nagle_algorithm = True
+    
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def handle_request(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        status = self.server.next_status()
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        if status != 200:
+            return self.send_json(status, {'error': 'stub failure'})
+        
+        path = self.path.split('?', 1)[0]
+        if self.command == 'POST' and path == '/token':
+            self.send_json(200, {'access_token': 'stub-access-token', 'token_type': 'Bearer', 'expires_in': 3599})
+        elif self.command == 'GET' and path == '/userinfo':
+            if self.headers.get('Authorization') != 'Bearer stub-access-token':
+                return self.send_json(401, {'error': 'invalid_token'})
+            self.send_json(200, self.server.user_info)
+        elif self.command == 'GET' and path == '/certs':
+            self.send_json(200, self.server.certs, {'Cache-Control': f'public, max-age={self.server.max_age}'})
+        else:
+            self.send_json(404, {'error': 'not found'})
+    
+    def do_GET(self):
+        self.handle_request()
+    
+    def do_POST(self):
+        self.handle_request()
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class GoogleStub(ThreadingHTTPServer):
+    """Threaded stub; ``fail_next(n, status)`` makes the next n requests fail."""
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, host='127.0.0.1', port=0, verbose=False):
+        super().__init__((host, port), GoogleStubHandler)
+        self.verbose = verbose
+        self.delay = 0
+        self.max_age = 3600
+        self.certs = {}
+        self.user_info = {'id': 'stub-google-id', 'email': 'stub-user@example.com', 'verified_email': True}
+        self.requests = 0
+        self.connections = 0
+        self._failures = []
+        self._lock = threading.Lock()
+    
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+    
+    def verify_request(self, request, client_address):
+        with self._lock:
+            self.connections += 1
+        return True
+    
+    def handle_error(self, request, client_address):
+        # Clients that timed out close the socket before the reply is written
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+    
+    def fail_next(self, count, status=503):
+        with self._lock:
+            self._failures.extend([status] * count)
+    
+    def next_status(self):
+        with self._lock:
+            self.requests += 1
+            return self._failures.pop(0) if self._failures else 200
+    
+    def start(self):
+        """Serve in a background thread and return self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+    
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8085
+    server = GoogleStub(port=port, verbose=True)
+    print(f"Google stub listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,15 @@
+"""
+Gunicorn settings, read from the environment.
+
+With GUNICORN_THREADS above 1 each worker uses gthread, so requests waiting
+on Google OAuth or the database no longer block the whole worker.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('GUNICORN_WORKERS') or 2)
+threads = int(os.environ.get('GUNICORN_THREADS') or 8)
+worker_class = 'gthread' if threads > 1 else 'sync'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT') or 30)
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE') or 5)
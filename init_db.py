@@ -37,5 +37,8 @@ if __name__ == '__main__':
     
     if len(sys.argv) > 1 and sys.argv[1] == 'reset':
         reset_db()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'migrate':
+        from migrate_db import migrate
+        migrate()
     else:
         init_db()
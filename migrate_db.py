@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for TodoApp.
+db.create_all() only creates missing tables; it never adds indexes or
+columns to tables that already exist. Each migration below is applied
+once and recorded in the schema_migrations table.
+"""
+
+from datetime import datetime
+from sqlalchemy import inspect, text
+from app import create_app, db
+from app.models import User, Todo, TodoStats, TodoTombstone, EmailOutbox, PendingNotification
+from app.utils.search import install_search_index
+
+MIGRATIONS = []
+
+def migration(version, description):
+    """Register a migration function under a version number."""
+    def decorator(func):
+        MIGRATIONS.append((version, description, func))
+        return func
+    return decorator
+
+def create_missing_indexes(connection, table, names):
+    """Create the named model indexes that the database lacks."""
+    existing = {index['name'] for index in inspect(connection).get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name in names and index.name not in existing:
+            index.create(connection)
+            print(f"  created index {index.name}")
+
+def add_missing_column(connection, table, column_name):
+    """Add a model column to an existing table if it is not there yet."""
+    existing = {column['name'] for column in inspect(connection).get_columns(table.name)}
+    if column_name in existing:
+        return False
+    column = table.columns[column_name]
+    column_type = column.type.compile(dialect=connection.dialect)
+    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+    print(f"  added column {table.name}.{column.name}")
+    return True
+
+@migration(1, 'Composite indexes on todos for listing, sorting and stats')
+def add_todo_indexes(connection):
+    create_missing_indexes(connection, Todo.__table__, {
+        'ix_todos_user_created_id',
+        'ix_todos_user_updated_id',
+        'ix_todos_user_title_id',
+        'ix_todos_user_completed_id',
+        'ix_todos_user_completed_created'
+    })
+
+@migration(2, 'Todo completion timestamps and the per-user todo_stats summary')
+def add_todo_stats(connection):
+    if add_missing_column(connection, Todo.__table__, 'completed_at'):
+        # Best available guess for todos completed before the column existed
+        connection.execute(text(
+            "UPDATE todos SET completed_at = updated_at WHERE completed = :done"
+        ), {'done': True})
+    create_missing_indexes(connection, Todo.__table__, {'ix_todos_user_completed_at'})
+    TodoStats.__table__.create(connection, checkfirst=True)
+    # New users get their row at registration; backfill everyone else
+    connection.execute(text(
+        "INSERT INTO todo_stats (user_id, total_count, completed_count, version, updated_at) "
+        "SELECT users.id, COUNT(todos.id), "
+        "COALESCE(SUM(CASE WHEN todos.completed = :done THEN 1 ELSE 0 END), 0), 0, :now "
+        "FROM users LEFT JOIN todos ON todos.user_id = users.id "
+        "WHERE NOT EXISTS (SELECT 1 FROM todo_stats WHERE todo_stats.user_id = users.id) "
+        "GROUP BY users.id"
+    ), {'done': True, 'now': datetime.utcnow()})
+
+@migration(3, 'Collection version counter on todo_stats for ETags')
+def add_todo_stats_version(connection):
+    if add_missing_column(connection, TodoStats.__table__, 'version'):
+        connection.execute(text("UPDATE todo_stats SET version = 0"))
+
+@migration(4, 'Deletion log for the todo change feed')
+def add_todo_tombstones(connection):
+    TodoTombstone.__table__.create(connection, checkfirst=True)
+
+@migration(5, 'Email outbox table for durable notification delivery')
+def add_email_outbox(connection):
+    EmailOutbox.__table__.create(connection, checkfirst=True)
+
+@migration(6, 'Per-user notification mode and the digest buffer')
+def add_notification_digests(connection):
+    if add_missing_column(connection, User.__table__, 'notification_mode'):
+        connection.execute(text("UPDATE users SET notification_mode = 'instant'"))
+    PendingNotification.__table__.create(connection, checkfirst=True)
+
+@migration(7, 'Full-text search index on todo titles and descriptions')
+def add_todo_search_index(connection):
+    if install_search_index(connection):
+        print(f"  created search index for {connection.dialect.name}")
+
+def ensure_migrations_table(connection):
+    """Create the bookkeeping table if it does not exist yet."""
+    connection.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, "
+        "description VARCHAR(255) NOT NULL, "
+        "applied_at TIMESTAMP NOT NULL)"
+    ))
+
+def applied_versions(connection):
+    """Return the set of migration versions already applied."""
+    rows = connection.execute(text("SELECT version FROM schema_migrations"))
+    return {row[0] for row in rows}
+
+def migrate():
+    """Apply all pending migrations in version order."""
+    app = create_app()
+    
+    with app.app_context():
+        with db.engine.begin() as connection:
+            ensure_migrations_table(connection)
+            done = applied_versions(connection)
+        
+        pending = [m for m in sorted(MIGRATIONS, key=lambda m: m[0]) if m[0] not in done]
+        if not pending:
+            print("Database schema is up to date.")
+            return
+        
+        for version, description, func in pending:
+            print(f"Applying migration {version}: {description}")
+            # Each migration runs in its own transaction together with its bookkeeping row
+            with db.engine.begin() as connection:
+                func(connection)
+                connection.execute(
+                    text("INSERT INTO schema_migrations (version, description, applied_at) "
+                         "VALUES (:version, :description, :applied_at)"),
+                    {'version': version, 'description': description, 'applied_at': datetime.utcnow()}
+                )
+        
+        print(f"Applied {len(pending)} migration(s).")
+
+def status():
+    """Print which migrations have been applied."""
+    app = create_app()
+    
+    with app.app_context():
+        with db.engine.begin() as connection:
+            ensure_migrations_table(connection)
+            done = applied_versions(connection)
+        
+        for version, description, _ in sorted(MIGRATIONS, key=lambda m: m[0]):
+            marker = 'x' if version in done else ' '
+            print(f"[{marker}] {version:03d} {description}")
+
+if __name__ == '__main__':
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == 'status':
+        status()
+    else:
+        migrate()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Minimal local SMTP server for development and tests.
+It accepts every message and keeps it in memory (printing a summary), so
+the outbox worker can be exercised without a real mail provider.
+    
+    python smtp_stub.py [port]
+
+Then run the app with MAIL_SERVER=localhost MAIL_PORT=<port> MAIL_USE_TLS=False.
+"""
+
+import socketserver
+import threading
+
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP for smtplib: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT."""
+    
+    def reply(self, line):
+        self.wfile.write((line + '\r\n').encode('utf-8'))
+    
+    def handle(self):
+        self.reply('220 localhost SMTP stub ready')
+        sender, recipients = None, []
+        
+        for raw in self.rfile:
+            command = raw.decode('utf-8', 'replace').rstrip('\r\n')
+            verb = command[:4].upper()
+            
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250 localhost')
+            elif verb == 'MAIL':
+                failure = self.server.next_failure()
+                if failure == 'disconnect':
+                    return
+                if failure:
+                    self.reply(failure)
+                    continue
+                sender, recipients = command.split(':', 1)[1].strip(), []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipients.append(command.split(':', 1)[1].strip())
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                for data_line in self.rfile:
+                    if data_line in (b'.\r\n', b'.\n'):
+                        break
+                    lines.append(data_line[1:] if data_line.startswith(b'..') else data_line)
+                self.server.record(sender, recipients, b''.join(lines))
+                sender, recipients = None, []
+                self.reply('250 OK: queued')
+            elif verb == 'RSET':
+                sender, recipients = None, []
+                self.reply('250 OK')
+            elif verb == 'NOOP':
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    """Threaded SMTP stub that stores received messages in ``messages``.
+    
+    ``fail_next(n, reply)`` answers the next n ``MAIL`` commands with an
+    error reply, or drops the connection when ``reply`` is ``'disconnect'``.
+    """
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, host='127.0.0.1', port=0, verbose=False):
+        super().__init__((host, port), SMTPStubHandler)
+        self.messages = []
+        self.connections = 0
+        self.verbose = verbose
+        self._failures = []
+        self._lock = threading.Lock()
+    
+    @property
+    def port(self):
+        return self.server_address[1]
+    
+    def verify_request(self, request, client_address):
+        with self._lock:
+            self.connections += 1
+        return True
+    
+    def fail_next(self, count, reply='451 Temporary failure'):
+        with self._lock:
+            self._failures.extend([reply] * count)
+    
+    def next_failure(self):
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+    
+    def record(self, sender, recipients, data):
+        with self._lock:
+            self.messages.append({'sender': sender, 'recipients': recipients, 'data': data})
+        if self.verbose:
+            subject = next((line for line in data.decode('utf-8', 'replace').splitlines()
+                            if line.startswith('Subject:')), 'Subject: (none)')
+            print(f"{sender} -> {', '.join(recipients)} | {subject}")
+    
+    def start(self):
+        """Serve in a background thread and return self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+    
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+if __name__ == '__main__':
+    import sys
+    
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 1025
+    server = SMTPStub(port=port, verbose=True)
+    print(f"SMTP stub listening on 127.0.0.1:{server.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Offline test for the WSGI-to-ASGI bridge behind asgi.py.
+Drives ThreadedWsgiToAsgi directly with ASGI messages and checks the
+lifespan protocol, environ and header mapping, request bodies spooled to
+disk, chunked streaming, client disconnects, start_response error handling
+and a round trip through the API.
+"""
+
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import app.utils.asgi as bridge
+from app.utils.asgi import ThreadedWsgiToAsgi, build_environ
+from conftest import make_app
+
+executor = ThreadPoolExecutor(max_workers=4)
+
+def http_scope(method='GET', path='/', query=b'', headers=(), root_path=''):
+    return {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': method, 'scheme': 'http', 'path': path, 'root_path': root_path,
+        'query_string': query, 'headers': list(headers),
+        'client': ('10.0.0.1', 54321), 'server': ('testserver', 8000)
+    }
+
+def call(application, scope, messages=({'type': 'http.request', 'body': b''},)):
+    """Run one ASGI call and return the messages it sent."""
+    sent = []
+    
+    async def run():
+        queue = list(messages)
+        
+        async def receive():
+            return queue.pop(0) if queue else {'type': 'http.disconnect'}
+        
+        async def send(message):
+            sent.append(message)
+        
+        await application(scope, receive, send)
+    
+    asyncio.run(run())
+    return sent
+
+def response_of(sent):
+    """Split sent messages into status, headers dict and the joined body."""
+    start, bodies = sent[0], sent[1:]
+    assert start['type'] == 'http.response.start'
+    assert all(message['type'] == 'http.response.body' for message in bodies)
+    assert [message['more_body'] for message in bodies][-1] is False
+    return start['status'], dict(start['headers']), b''.join(message['body'] for message in bodies)
+
+def echo_app(environ, start_response):
+    """WSGI app reporting what it received."""
+    body = environ['wsgi.input'].read()
+    report = {key: environ.get(key) for key in (
+        'REQUEST_METHOD', 'SCRIPT_NAME', 'PATH_INFO', 'QUERY_STRING', 'CONTENT_TYPE',
+        'CONTENT_LENGTH', 'HTTP_X_MULTI', 'REMOTE_ADDR', 'SERVER_NAME', 'SERVER_PORT'
+    )}
+    report['body_length'] = len(body)
+    report['rolled_to_disk'] = environ['wsgi.input']._rolled
+    start_response('201 Created', [('Content-Type', 'application/json'), ('X-Echo', 'yes')])
+    return [json.dumps(report).encode('utf-8')]
+
+def test_lifespan_and_scope_types():
+    """Lifespan events are acknowledged; other scope types are refused."""
+    print("Testing lifespan...")
+    application = ThreadedWsgiToAsgi(echo_app, executor)
+    sent = call(application, {'type': 'lifespan'},
+                [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+    assert sent == [{'type': 'lifespan.startup.complete'}, {'type': 'lifespan.shutdown.complete'}]
+    
+    try:
+        call(application, {'type': 'websocket', 'path': '/'})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('websocket scopes should be refused')
+    print("✓ Lifespan is handled and other scopes refused")
+
+def test_environ_and_headers():
+    """Paths, query, client and headers map to the WSGI environ."""
+    print("Testing environ mapping...")
+    application = ThreadedWsgiToAsgi(echo_app, executor)
+    headers = [(b'content-type', b'application/json'), (b'content-length', b'2'),
+               (b'x-multi', b'a'), (b'x-multi', b'b')]
+    sent = call(application, http_scope('POST', '/prefix/api/todos', b'limit=5', headers, root_path='/prefix'),
+                [{'type': 'http.request', 'body': b'{}'}])
+    status, response_headers, body = response_of(sent)
+    report = json.loads(body)
+    
+    assert status == 201 and response_headers[b'x-echo'] == b'yes'
+    assert (report['SCRIPT_NAME'], report['PATH_INFO'], report['QUERY_STRING']) == ('/prefix', '/api/todos', 'limit=5')
+    assert (report['CONTENT_TYPE'], report['CONTENT_LENGTH']) == ('application/json', '2')
+    assert report['HTTP_X_MULTI'] == 'a,b'
+    assert (report['REMOTE_ADDR'], report['SERVER_NAME'], report['SERVER_PORT']) == ('10.0.0.1', 'testserver', '8000')
+    
+    environ = build_environ(http_scope(path='/café'), None)
+    assert environ['PATH_INFO'] == '/café'.encode('utf-8').decode('latin-1')
+    print("✓ Scopes map to PEP 3333 environs")
+
+def test_large_bodies_are_spooled():
+    """Bodies sent in several messages are joined and measured; large ones spill to disk."""
+    print("Testing request body spooling...")
+    application = ThreadedWsgiToAsgi(echo_app, executor)
+    chunks = [{'type': 'http.request', 'body': b'x' * 1000, 'more_body': True} for _ in range(4)]
+    chunks.append({'type': 'http.request', 'body': b'', 'more_body': False})
+    
+    original = bridge.MAX_BODY_IN_MEMORY
+    bridge.MAX_BODY_IN_MEMORY = 2048
+    try:
+        large = json.loads(response_of(call(application, http_scope('POST'), chunks))[2])
+        small = json.loads(response_of(call(application, http_scope('POST'), chunks[:1] + chunks[-1:]))[2])
+    finally:
+        bridge.MAX_BODY_IN_MEMORY = original
+    assert (large['body_length'], large['rolled_to_disk'], large['CONTENT_LENGTH']) == (4000, True, '4000')
+    assert (small['body_length'], small['rolled_to_disk']) == (1000, False)
+    print("✓ Large request bodies are spooled to disk")
+
+def test_disconnect_before_body():
+    """A client that leaves while sending its body never reaches the app."""
+    print("Testing early disconnects...")
+    calls = []
+    
+    def app(environ, start_response):
+        calls.append(environ)
+        start_response('200 OK', [])
+        return [b'']
+    
+    sent = call(ThreadedWsgiToAsgi(app, executor), http_scope('POST'),
+                [{'type': 'http.request', 'body': b'part', 'more_body': True}, {'type': 'http.disconnect'}])
+    assert sent == [] and calls == []
+    print("✓ Early disconnects skip the app")
+
+def test_streaming_and_errors():
+    """Chunks are sent as produced; start_response may be replaced until the first chunk."""
+    print("Testing streaming and start_response errors...")
+    closed = []
+    
+    class Streamed:
+        def __iter__(self):
+            yield b'first'
+            yield b''
+            yield b'second'
+        
+        def close(self):
+            closed.append(True)
+    
+    def streaming_app(environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return Streamed()
+    
+    sent = call(ThreadedWsgiToAsgi(streaming_app, executor), http_scope())
+    assert [message.get('body') for message in sent[1:]] == [b'first', b'second', b'']
+    assert [message.get('more_body') for message in sent[1:]] == [True, True, False]
+    assert closed == [True]
+    
+    def replaced_app(environ, start_response):
+        start_response('200 OK', [])
+        try:
+            raise RuntimeError('failed before the body')
+        except RuntimeError:
+            start_response('500 Internal Server Error', [('Content-Type', 'text/plain')], sys.exc_info())
+        return [b'error']
+    
+    assert response_of(call(ThreadedWsgiToAsgi(replaced_app, executor), http_scope()))[:3:2] == (500, b'error')
+    
+    def late_error_app(environ, start_response):
+        start_response('200 OK', [])
+        yield b'partial'
+        try:
+            raise RuntimeError('failed mid-stream')
+        except RuntimeError:
+            start_response('500 Internal Server Error', [], sys.exc_info())
+    
+    try:
+        call(ThreadedWsgiToAsgi(late_error_app, executor), http_scope())
+    except RuntimeError as e:
+        assert str(e) == 'failed mid-stream'
+    else:
+        raise AssertionError('errors after the first chunk should propagate')
+    print("✓ Streaming and start_response errors follow PEP 3333")
+
+def test_api_round_trip():
+    """Register, create, export and a 404 work through the bridge."""
+    print("Testing the API over ASGI...")
+    application = ThreadedWsgiToAsgi(make_app(), executor)
+    json_header = (b'content-type', b'application/json')
+    
+    def request(method, path, payload=None, query=b'', token=None):
+        headers = [json_header, (b'transfer-encoding', b'chunked')] + ([(b'authorization', f'Bearer {token}'.encode())] if token else [])
+        body = json.dumps(payload).encode() if payload is not None else b''
+        # Split the body across two messages like a slow client would
+        messages = [{'type': 'http.request', 'body': body[:5], 'more_body': True},
+                    {'type': 'http.request', 'body': body[5:]}]
+        return response_of(call(application, http_scope(method, path, query, headers), messages))
+    
+    status, _, body = request('POST', '/api/register', {'email': 'asgi@example.com', 'password': 'secret123'})
+    assert status == 201, body
+    token = json.loads(body)['access_token']
+    
+    for i in range(3):
+        assert request('POST', '/api/todos', {'title': f'Todo {i}'}, token=token)[0] == 201
+    status, headers, body = request('GET', '/api/todos/export', query=b'format=ndjson&sort=title', token=token)
+    assert status == 200 and headers[b'content-type'] == b'application/x-ndjson'
+    assert [json.loads(line)['title'] for line in body.splitlines()] == ['Todo 0', 'Todo 1', 'Todo 2']
+    
+    assert request('GET', '/api/nothing-here', token=token)[0] == 404
+    assert request('GET', '/api/todos')[0] == 401
+    print("✓ The API works through the bridge")
+
+def main():
+    """Run all tests."""
+    print("Starting ASGI bridge tests...\n")
+    try:
+        test_lifespan_and_scope_types()
+        test_environ_and_headers()
+        test_large_bodies_are_spooled()
+        test_disconnect_before_body()
+        test_streaming_and_errors()
+        test_api_round_trip()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All ASGI bridge tests passed")
+
+if __name__ == "__main__":
+    main()
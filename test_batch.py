@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Offline test for POST /api/batch.
+Checks that sub-requests run together with the caller's credentials, and
+that an atomic batch rolls back every write when one request fails.
+"""
+
+import sys
+
+from conftest import make_client
+
+def run_batch(client, headers, requests, atomic=False):
+    response = client.post('/api/batch', json={'requests': requests, 'atomic': atomic}, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+def titles(client, headers):
+    return sorted(todo['title'] for todo in client.get('/api/todos', headers=headers).get_json()['todos'])
+
+def test_batch_runs_requests():
+    """Reads and writes run in order and report their own status."""
+    print("Testing batch requests...")
+    client, headers = make_client('batch@example.com')
+    result = run_batch(client, headers, [
+        {'method': 'POST', 'path': '/api/todos', 'body': {'title': 'First'}},
+        {'method': 'GET', 'path': '/api/todos?limit=10'},
+        {'method': 'GET', 'path': '/api/me'},
+        {'method': 'PUT', 'path': '/api/todos/999999', 'body': {'completed': True}},
+        {'method': 'POST', 'path': '/api/login', 'body': {}}
+    ])
+    statuses = [item['status'] for item in result['results']]
+    assert statuses == [201, 200, 200, 404, 400], statuses
+    assert [todo['title'] for todo in result['results'][1]['body']['todos']] == ['First']
+    assert result['results'][2]['body']['user']['email'] == 'batch@example.com'
+    # Without atomic, the write before the failure is kept
+    assert titles(client, headers) == ['First']
+    
+    assert client.post('/api/batch', json={'requests': []}, headers=headers).status_code == 400
+    assert client.post('/api/batch', json={'requests': [{'path': '/health'}]}, headers=headers).status_code == 400
+    assert client.post('/api/batch', json={'requests': [{'path': '/api/todos'}]}).status_code == 401
+    print("✓ Batch requests run with shared credentials")
+
+def test_atomic_batch():
+    """An atomic batch commits all writes or none."""
+    print("Testing atomic batches...")
+    client, headers = make_client('batch@example.com')
+    result = run_batch(client, headers, [
+        {'method': 'POST', 'path': '/api/todos', 'body': {'title': 'Kept'}},
+        {'method': 'POST', 'path': '/api/todos', 'body': {'title': 'Also kept'}}
+    ], atomic=True)
+    assert result['committed'] and [item['status'] for item in result['results']] == [201, 201]
+    assert titles(client, headers) == ['Also kept', 'Kept']
+    
+    todo_id = result['results'][0]['body']['todo']['id']
+    result = run_batch(client, headers, [
+        {'method': 'POST', 'path': '/api/todos', 'body': {'title': 'Discarded'}},
+        {'method': 'PUT', 'path': f'/api/todos/{todo_id}', 'body': {'completed': True}},
+        {'method': 'GET', 'path': '/api/todos'},
+        {'method': 'PUT', 'path': '/api/todos/999999', 'body': {'completed': True}},
+        {'method': 'DELETE', 'path': f'/api/todos/{todo_id}'}
+    ], atomic=True)
+    assert not result['committed']
+    assert [item['status'] for item in result['results']] == [424, 424, 424, 404, 424], result['results']
+    assert titles(client, headers) == ['Also kept', 'Kept']
+    assert client.get(f'/api/todos/{todo_id}', headers=headers).get_json()['todo']['completed'] is False
+    
+    for atomic in ['false', 0, [], None]:
+        response = client.post('/api/batch', json={'requests': [{'path': '/api/todos'}], 'atomic': atomic}, headers=headers)
+        assert response.status_code == 400, atomic
+    print("✓ Atomic batches roll back together")
+
+def main():
+    """Run all tests."""
+    print("Starting batch tests...\n")
+    try:
+        test_batch_runs_requests()
+        test_atomic_batch()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All batch tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Offline test for POST and DELETE /api/todos/batch.
+Checks chunked multi-row inserts and deletes, per-item errors, ownership,
+the stats counters, tombstones and the single summary email.
+"""
+
+import sys
+
+from app.models import EmailOutbox
+from conftest import make_app, register
+
+def test_batch_create():
+    """Valid items are created in request order and invalid ones reported by index."""
+    print("Testing batch create...")
+    app = make_app(BULK_CHUNK_SIZE=2, BATCH_MAX_ITEMS=10)
+    client = app.test_client()
+    headers = register(client, 'batch-create@example.com')
+    
+    items = [{'title': f'Todo {i}', 'description': f'Details {i}'} for i in range(5)]
+    items[1] = {'title': '   '}
+    items.insert(3, 'not an object')
+    response = client.post('/api/todos/batch', json={'todos': items}, headers=headers)
+    assert response.status_code == 201, response.get_json()
+    body = response.get_json()
+    
+    assert body['count'] == 4
+    assert [todo['title'] for todo in body['todos']] == ['Todo 0', 'Todo 2', 'Todo 3', 'Todo 4']
+    assert [error['index'] for error in body['errors']] == [1, 3]
+    assert len({todo['id'] for todo in body['todos']}) == 4
+    assert client.get('/api/todos/stats', headers=headers).get_json()['total_todos'] == 4
+    with app.app_context():
+        assert EmailOutbox.query.count() == 1
+    
+    assert client.post('/api/todos/batch', json={'todos': [{'title': 'x'}] * 11}, headers=headers).status_code == 400
+    assert client.post('/api/todos/batch', json={'todos': [{'title': ''}]}, headers=headers).status_code == 400
+    assert client.post('/api/todos/batch', json={'todos': []}, headers=headers).status_code == 400
+    print("✓ Batch create inserts valid items in order")
+
+def test_batch_delete():
+    """Only the caller's todos are deleted, with tombstones for the change feed."""
+    print("Testing batch delete...")
+    app = make_app(BULK_CHUNK_SIZE=2)
+    client = app.test_client()
+    headers = register(client, 'batch-delete@example.com')
+    other = register(client, 'other@example.com')
+    
+    items = [{'title': f'Todo {i}'} for i in range(5)]
+    ids = [todo['id'] for todo in client.post('/api/todos/batch', json={'todos': items}, headers=headers).get_json()['todos']]
+    foreign = client.post('/api/todos', json={'title': 'Not yours'}, headers=other).get_json()['todo']['id']
+    client.put(f'/api/todos/{ids[0]}', json={'completed': True}, headers=headers)
+    since = client.get('/api/todos/changes', headers=headers).get_json()['next_since']
+    
+    response = client.delete('/api/todos/batch', json={'todo_ids': ids[:3] + [ids[0], foreign, 999999]}, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    body = response.get_json()
+    assert sorted(body['todo_ids']) == sorted(ids[:3]) and body['count'] == 3
+    assert sorted(body['not_found']) == sorted([foreign, 999999])
+    
+    stats = client.get('/api/todos/stats', headers=headers).get_json()
+    assert (stats['total_todos'], stats['completed_todos']) == (2, 0), stats
+    assert client.get(f'/api/todos/{foreign}', headers=other).status_code == 200
+    changes = client.get(f'/api/todos/changes?since={since}', headers=headers).get_json()
+    assert sorted(changes['deleted']) == sorted(ids[:3]), changes
+    
+    assert client.delete('/api/todos/batch', json={'todo_ids': [foreign]}, headers=headers).status_code == 404
+    assert client.delete('/api/todos/batch', json={'todo_ids': ['1']}, headers=headers).status_code == 400
+    print("✓ Batch delete removes only the caller's todos")
+
+def main():
+    """Run all tests."""
+    print("Starting batch todo tests...\n")
+    try:
+        test_batch_create()
+        test_batch_delete()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All batch todo tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Offline test for PUT /api/todos/bulk-update.
+Checks the set-based UPDATE across statement chunks, ownership, completion
+times, the stats counters, the IDs-only return mode and input validation.
+"""
+
+import sys
+
+from app import db
+from app.models import Todo
+from conftest import make_app, register
+
+def bulk_update(client, headers, todo_ids, updates, **extra):
+    return client.put('/api/todos/bulk-update', json=dict(todo_ids=todo_ids, updates=updates, **extra), headers=headers)
+
+def test_bulk_complete():
+    """Only the caller's todos change, in chunks, keeping earlier completion times."""
+    print("Testing bulk completion...")
+    app = make_app(BULK_CHUNK_SIZE=2)
+    client = app.test_client()
+    headers = register(client, 'bulk@example.com')
+    other = register(client, 'other@example.com')
+    ids = [client.post('/api/todos', json={'title': f'Todo {i}'}, headers=headers).get_json()['todo']['id'] for i in range(5)]
+    foreign = client.post('/api/todos', json={'title': 'Not yours'}, headers=other).get_json()['todo']['id']
+    
+    client.put(f'/api/todos/{ids[0]}', json={'completed': True}, headers=headers)
+    with app.app_context():
+        first_completed_at = db.session.get(Todo, ids[0]).completed_at
+    
+    response = bulk_update(client, headers, ids[:4] + [foreign, 999999], {'completed': True})
+    assert response.status_code == 200, response.get_json()
+    todos = response.get_json()['todos']
+    assert sorted(todo['id'] for todo in todos) == sorted(ids[:4])
+    assert all(todo['completed'] for todo in todos)
+    
+    with app.app_context():
+        assert db.session.get(Todo, ids[0]).completed_at == first_completed_at
+        assert db.session.get(Todo, ids[1]).completed_at is not None
+        assert db.session.get(Todo, foreign).completed is False
+    stats = client.get('/api/todos/stats', headers=headers).get_json()
+    assert (stats['total_todos'], stats['completed_todos']) == (5, 4), stats
+    
+    response = bulk_update(client, headers, ids, {'completed': False}, **{'return': 'ids'})
+    assert sorted(response.get_json()['todo_ids']) == sorted(ids) and response.get_json()['count'] == 5
+    assert 'todos' not in response.get_json()
+    assert client.get('/api/todos/stats', headers=headers).get_json()['completed_todos'] == 0
+    
+    assert bulk_update(client, headers, [foreign], {'completed': True}).status_code == 404
+    print("✓ Bulk completion updates only the caller's todos")
+
+def test_bulk_text_fields():
+    """Titles and descriptions are validated and stripped."""
+    print("Testing bulk title and description updates...")
+    app = make_app()
+    client = app.test_client()
+    headers = register(client, 'text@example.com')
+    ids = [client.post('/api/todos', json={'title': f'Todo {i}'}, headers=headers).get_json()['todo']['id'] for i in range(2)]
+    
+    for updates in ({'title': 5}, {'description': ['x']}, {'title': 'x' * 201}, {'owner': 1}):
+        assert bulk_update(client, headers, ids, updates).status_code == 400, updates
+    assert client.put('/api/todos/bulk-update', json={'todo_ids': ids, 'updates': ['title']}, headers=headers).status_code == 400
+    assert bulk_update(client, headers, ['1'], {'completed': True}).status_code == 400
+    
+    todos = bulk_update(client, headers, ids, {'title': '  Same  ', 'description': ' Notes '}).get_json()['todos']
+    assert {(todo['title'], todo['description']) for todo in todos} == {('Same', 'Notes')}
+    # A blank title leaves titles alone
+    todos = bulk_update(client, headers, ids, {'title': '  ', 'description': ''}).get_json()['todos']
+    assert {(todo['title'], todo['description']) for todo in todos} == {('Same', '')}
+    print("✓ Text fields are validated and stripped")
+
+def main():
+    """Run all tests."""
+    print("Starting bulk update tests...\n")
+    try:
+        test_bulk_complete()
+        test_bulk_text_fields()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All bulk update tests passed")
+
+if __name__ == "__main__":
+    main()
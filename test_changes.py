@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Offline test for GET /api/todos/changes.
+Checks the full snapshot, incremental syncs with the next_since token,
+tombstones from single and batch deletes, bulk-update changes, the
+overlap window and the rejection of bad tokens.
+"""
+
+import sys
+
+from conftest import make_app, register
+
+def sync(client, headers, since=None):
+    url = '/api/todos/changes' + (f'?since={since}' if since else '')
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+def make_sync_client(overlap=0):
+    app = make_app(TODOS_SYNC_OVERLAP_SECONDS=overlap)
+    client = app.test_client()
+    return client, register(client, 'changes@example.com'), register(client, 'other@example.com')
+
+def create(client, headers, title):
+    return client.post('/api/todos', json={'title': title}, headers=headers).get_json()['todo']['id']
+
+def test_snapshot_and_incremental_sync():
+    """The first sync is a full snapshot; later ones return only what changed."""
+    print("Testing incremental sync...")
+    client, headers, other = make_sync_client()
+    first, second = create(client, headers, 'First'), create(client, headers, 'Second')
+    create(client, other, 'Not yours')
+    
+    snapshot = sync(client, headers)
+    assert snapshot['full_snapshot'] is True and snapshot['deleted'] == []
+    assert [todo['id'] for todo in snapshot['todos']] == [first, second]
+    
+    empty = sync(client, headers, snapshot['next_since'])
+    assert empty['full_snapshot'] is False and empty['todos'] == [] and empty['deleted'] == []
+    
+    client.put(f'/api/todos/{first}', json={'completed': True}, headers=headers)
+    third = create(client, headers, 'Third')
+    changes = sync(client, headers, empty['next_since'])
+    assert [(todo['id'], todo['completed']) for todo in changes['todos']] == [(first, True), (third, False)]
+    assert sync(client, headers, changes['next_since'])['todos'] == []
+    print("✓ next_since returns only later changes")
+
+def test_deletes_and_bulk_updates():
+    """Single and batch deletes leave tombstones; bulk updates show up as changes."""
+    print("Testing tombstones and bulk updates...")
+    client, headers, other = make_sync_client()
+    ids = [create(client, headers, f'Todo {i}') for i in range(5)]
+    since = sync(client, headers)['next_since']
+    
+    assert client.delete(f'/api/todos/{ids[0]}', headers=headers).status_code == 200
+    assert client.delete('/api/todos/batch', json={'todo_ids': ids[1:3]}, headers=headers).status_code == 200
+    response = client.put('/api/todos/bulk-update', json={'todo_ids': ids[3:], 'updates': {'completed': True}}, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    
+    changes = sync(client, headers, since)
+    assert sorted(changes['deleted']) == ids[:3]
+    assert sorted(todo['id'] for todo in changes['todos']) == ids[3:]
+    assert all(todo['completed'] for todo in changes['todos'])
+    
+    # Other users never see these tombstones
+    assert sync(client, other, since)['deleted'] == []
+    after = sync(client, headers, changes['next_since'])
+    assert after['todos'] == [] and after['deleted'] == []
+    print("✓ Deletes and bulk updates appear in the feed")
+
+def test_overlap_window():
+    """Changes inside TODOS_SYNC_OVERLAP_SECONDS are repeated, never skipped."""
+    print("Testing the overlap window...")
+    client, headers, _ = make_sync_client(overlap=60)
+    todo_id = create(client, headers, 'Recent')
+    
+    first = sync(client, headers)
+    repeated = sync(client, headers, first['next_since'])
+    assert [todo['id'] for todo in repeated['todos']] == [todo_id]
+    # The token does not move past the window
+    assert [todo['id'] for todo in sync(client, headers, repeated['next_since'])['todos']] == [todo_id]
+    print("✓ Recent changes are held back for the next sync")
+
+def test_bad_tokens():
+    """Malformed sync tokens are rejected with 400."""
+    print("Testing bad sync tokens...")
+    client, headers, _ = make_sync_client()
+    for token in ['garbage', 'eyJ0Ijoibm90LWEtZGF0ZSJ9', '%%%']:
+        response = client.get(f'/api/todos/changes?since={token}', headers=headers)
+        assert response.status_code == 400, token
+        assert 'error' in response.get_json()
+    assert client.get('/api/todos/changes').status_code == 401
+    print("✓ Bad tokens return 400")
+
+def main():
+    """Run all tests."""
+    print("Starting change feed tests...\n")
+    try:
+        test_snapshot_and_incremental_sync()
+        test_deletes_and_bulk_updates()
+        test_overlap_window()
+        test_bad_tokens()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All change feed tests passed")
+
+if __name__ == "__main__":
+    main()
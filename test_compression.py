@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Offline test for response compression.
+Checks Accept-Encoding negotiation for gzip (and brotli and zstd when
+their packages are installed), that cached responses are stored compressed
+and served without recompressing, that compressed responses carry weak
+ETags, and that streamed exports are compressed as they are generated.
+"""
+
+import gzip
+import json
+import sys
+
+from app.utils import compression
+from app.utils.compression import CODINGS, brotli, zstandard
+from conftest import make_app, register
+
+# brotli and zstandard are optional; their codings are only tested when installed
+DECODERS = {'gzip': gzip.decompress}
+if brotli is not None:
+    DECODERS['br'] = brotli.decompress
+if zstandard is not None:
+    DECODERS['zstd'] = lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+def make_compression_client(**overrides):
+    app = make_app(COMPRESS_MIN_SIZE=256, **overrides)
+    client = app.test_client()
+    headers = register(client, 'compression@example.com')
+    for i in range(10):
+        client.post('/api/todos', json={'title': f'Todo {i}', 'description': 'Compressible text ' * 5}, headers=headers)
+    return client, headers
+
+def get(client, headers, path, encoding):
+    return client.get(path, headers=dict(headers, **{'Accept-Encoding': encoding}))
+
+def test_negotiation():
+    """The best coding the client accepts is used, with the configured order on ties."""
+    print("Testing coding negotiation...")
+    client, headers = make_compression_client()
+    plain = get(client, headers, '/api/todos', 'identity')
+    assert 'Content-Encoding' not in plain.headers
+    assert 'Accept-Encoding' in plain.headers['Vary']
+    
+    for coding, decode in DECODERS.items():
+        response = get(client, headers, '/api/todos', coding)
+        assert response.headers['Content-Encoding'] == coding, coding
+        assert len(response.data) < len(plain.data), coding
+        assert json.loads(decode(response.data)) == plain.get_json(), coding
+    
+    preferred = next(coding for coding in ('zstd', 'br', 'gzip') if coding in CODINGS)
+    assert get(client, headers, '/api/todos', 'gzip, br, zstd').headers['Content-Encoding'] == preferred
+    assert get(client, headers, '/api/todos', 'gzip;q=1.0, br;q=0.5').headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Encoding' not in get(client, headers, '/api/todos', 'deflate').headers
+    
+    # Bodies under COMPRESS_MIN_SIZE are sent as they are
+    small = get(client, headers, '/api/me', 'gzip')
+    assert 'Content-Encoding' not in small.headers and small.get_json()['user']
+    
+    client, headers = make_compression_client(COMPRESS_ALGORITHMS=['gzip'])
+    assert get(client, headers, '/api/todos', 'br, zstd, gzip;q=0.1').headers['Content-Encoding'] == 'gzip'
+    print("✓ Accept-Encoding picks the right coding")
+
+def test_cache_hits_are_precompressed():
+    """A cache hit returns the stored compressed body without compressing again."""
+    print("Testing precompressed cache hits...")
+    client, headers = make_compression_client()
+    calls = []
+    original = compression.compress
+    
+    def counting_compress(data, coding):
+        calls.append(coding)
+        return original(data, coding)
+    
+    compression.compress = counting_compress
+    try:
+        first = get(client, headers, '/api/todos?limit=5', 'gzip')
+        second = get(client, headers, '/api/todos?limit=5', 'gzip')
+        plain = get(client, headers, '/api/todos?limit=5', 'identity')
+    finally:
+        compression.compress = original
+    
+    assert calls == ['gzip'], calls
+    assert second.headers['Content-Encoding'] == 'gzip' and second.data == first.data
+    assert 'Content-Encoding' not in plain.headers
+    assert json.loads(gzip.decompress(second.data)) == plain.get_json()
+    
+    metrics = client.get('/api/metrics/cache', headers=headers).get_json()
+    assert metrics['hits'] >= 1, metrics
+    print("✓ Cache hits skip compression")
+
+def test_weak_etags():
+    """Compressed responses carry a weak ETag that still revalidates."""
+    print("Testing weak ETags...")
+    client, headers = make_compression_client()
+    
+    strong = get(client, headers, '/api/todos', 'identity').headers['ETag']
+    assert not strong.startswith('W/')
+    weak = get(client, headers, '/api/todos', 'gzip').headers['ETag']
+    assert weak == f'W/{strong}'
+    
+    response = client.get('/api/todos', headers=dict(headers, **{'Accept-Encoding': 'gzip', 'If-None-Match': weak}))
+    assert response.status_code == 304 and response.headers['ETag'] == weak
+    response = client.get('/api/todos', headers=dict(headers, **{'Accept-Encoding': 'identity', 'If-None-Match': strong}))
+    assert response.status_code == 304 and response.headers['ETag'] == strong
+    print("✓ Compressed responses use weak ETags")
+
+def test_streamed_export():
+    """Streamed exports are compressed chunk by chunk and decode to the plain export."""
+    print("Testing compressed streaming...")
+    client, headers = make_compression_client()
+    plain = get(client, headers, '/api/todos/export', 'identity').get_data()
+    
+    for coding, decode in DECODERS.items():
+        response = get(client, headers, '/api/todos/export', coding)
+        assert response.is_streamed and response.headers['Content-Encoding'] == coding, coding
+        assert 'Content-Length' not in response.headers, coding
+        assert decode(response.get_data()) == plain, coding
+    print("✓ Streamed exports are compressed on the fly")
+
+def main():
+    """Run all tests."""
+    print("Starting compression tests...\n")
+    try:
+        test_negotiation()
+        test_cache_hits_are_precompressed()
+        test_weak_etags()
+        test_streamed_export()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All compression tests passed")
+
+if __name__ == "__main__":
+    main()
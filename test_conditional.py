@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Offline test for ETag and Last-Modified revalidation.
+Checks 304 answers for the todo list, a single todo and the stats, that
+writes change the validators, that clock-dependent stats are recomputed, and that a failing version lookup returns
+the API's JSON error.
+"""
+
+import sys
+from datetime import timedelta
+
+import app.routes.todos as todos_routes
+from app import db
+from app.models import Todo
+from conftest import make_client
+
+def test_not_modified():
+    """Sending back the ETag or Last-Modified gets a 304 until something changes."""
+    print("Testing conditional GETs...")
+    client, headers = make_client('etag@example.com')
+    todo_id = client.post('/api/todos', json={'title': 'First'}, headers=headers).get_json()['todo']['id']
+    
+    etags = {}
+    for path in ('/api/todos', f'/api/todos/{todo_id}', '/api/todos/stats'):
+        response = client.get(path, headers=headers)
+        etag = response.headers['ETag']
+        assert response.status_code == 200 and response.last_modified is not None, path
+        
+        cached = client.get(path, headers=dict(headers, **{'If-None-Match': etag}))
+        assert cached.status_code == 304 and cached.data == b'', path
+        assert cached.headers['ETag'] == etag
+        since = client.get(path, headers=dict(headers, **{'If-Modified-Since': response.headers['Last-Modified']}))
+        assert since.status_code == 304, path
+        etags[path] = etag
+    
+    # Another query string is another representation
+    assert client.get('/api/todos?limit=1', headers=headers).headers['ETag'] != etags['/api/todos']
+    
+    client.put(f'/api/todos/{todo_id}', json={'completed': True}, headers=headers)
+    for path, etag in etags.items():
+        response = client.get(path, headers=dict(headers, **{'If-None-Match': etag}))
+        assert response.status_code == 200 and response.headers['ETag'] != etag, path
+    print("✓ ETags revalidate and change on writes")
+
+def test_time_relative_stats():
+    """Stats that depend on the clock are recomputed even without writes."""
+    print("Testing time-relative stats...")
+    client, headers = make_client('aging@example.com')
+    client.post('/api/todos', json={'title': 'Ageing'}, headers=headers)
+    path = '/api/todos/stats?include=backlog_age,activity&days=7'
+    
+    validators = client.get('/api/todos/stats', headers=headers).headers
+    first = client.get(path, headers=headers)
+    assert first.status_code == 200 and 'ETag' not in first.headers
+    assert first.get_json()['backlog_age']['under_1_day'] == 1
+    assert len(first.get_json()['activity']['buckets']) == 1
+    
+    # Time passing without a write: the todo is now ten days old
+    with client.application.app_context():
+        for todo in Todo.query:
+            todo.created_at -= timedelta(days=10)
+        db.session.commit()
+    
+    response = client.get(path, headers=dict(headers, **{'If-None-Match': validators['ETag'],
+                                                         'If-Modified-Since': validators['Last-Modified']}))
+    assert response.status_code == 200, response.status_code
+    body = response.get_json()
+    assert body['backlog_age']['under_1_day'] == 0 and body['backlog_age']['7_to_30_days'] == 1, body
+    assert body['activity']['buckets'] == [], body
+    
+    # Plain counters are still revalidated
+    assert 'ETag' in client.get('/api/todos/stats?include=completion_time', headers=headers).headers
+    print("✓ Time-relative stats are not revalidated or cached")
+
+def test_missing_todo():
+    """A todo that does not exist is still a 404, not a 304."""
+    print("Testing conditional GET of a missing todo...")
+    client, headers = make_client('missing@example.com')
+    response = client.get('/api/todos/12345', headers=dict(headers, **{'If-None-Match': '*'}))
+    assert response.status_code == 404, response.status_code
+    print("✓ Missing todos return 404")
+
+def test_version_lookup_error():
+    """An error reading the version is answered with the JSON 500."""
+    print("Testing version lookup errors...")
+    client, headers = make_client('broken@example.com')
+    
+    def broken(user_id):
+        raise RuntimeError('database unavailable')
+    original = todos_routes.get_collection_version
+    todos_routes.get_collection_version = broken
+    try:
+        response = client.get('/api/todos', headers=headers)
+    finally:
+        todos_routes.get_collection_version = original
+    assert response.status_code == 500 and response.get_json() == {'error': 'Internal server error'}
+    print("✓ Version lookup errors return JSON")
+
+def main():
+    """Run all tests."""
+    print("Starting conditional request tests...\n")
+    try:
+        test_not_modified()
+        test_time_relative_stats()
+        test_missing_todo()
+        test_version_lookup_error()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All conditional request tests passed")
+
+if __name__ == "__main__":
+    main()
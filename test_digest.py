@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Offline test for digest notifications.
+Checks that digest mode buffers created todos instead of queuing emails,
+that flush_due_digests sends one digest per user once the count threshold
+or the time window is reached, and that leaving digest mode flushes or
+discards the buffer.
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import EmailOutbox, PendingNotification
+from app.utils.notifications import flush_due_digests
+from conftest import make_app, register
+
+def make_digest_app():
+    app = make_app(NOTIFICATION_DIGEST_MAX_ITEMS=3, NOTIFICATION_DIGEST_WINDOW_SECONDS=60)
+    client = app.test_client()
+    return app, client
+
+def use_digest(client, email):
+    headers = register(client, email)
+    response = client.put('/api/me/notifications', json={'mode': 'digest'}, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return headers
+
+def create(client, headers, *titles):
+    for title in titles:
+        assert client.post('/api/todos', json={'title': title}, headers=headers).status_code == 201
+
+def test_digest_buffers_and_flushes_on_count():
+    """Titles are buffered and sent as one digest once the threshold is reached."""
+    print("Testing digest count threshold...")
+    app, client = make_digest_app()
+    headers = use_digest(client, 'digest-count@example.com')
+    
+    create(client, headers, 'One', 'Two')
+    with app.app_context():
+        assert EmailOutbox.query.count() == 0
+        assert PendingNotification.query.count() == 2
+        assert flush_due_digests() == 0
+    
+    response = client.post('/api/todos/batch', json={'todos': [{'title': 'Three'}, {'title': '<b>Four</b>'}]}, headers=headers)
+    assert response.status_code == 201
+    with app.app_context():
+        assert EmailOutbox.query.count() == 0
+        assert flush_due_digests() == 1
+        assert PendingNotification.query.count() == 0
+        
+        email = EmailOutbox.query.one()
+        assert email.recipients == 'digest-count@example.com'
+        assert email.subject == 'Your TodoApp Digest: 4 New Todos'
+        assert [line for line in email.text_body.splitlines() if line.startswith('  - ')] == [
+            '  - One', '  - Two', '  - Three', '  - <b>Four</b>'
+        ]
+        assert '&lt;b&gt;Four&lt;/b&gt;' in email.html_body
+        assert flush_due_digests() == 0
+    print("✓ Digest is sent once the count threshold is reached")
+
+def test_digest_flushes_on_window():
+    """A short buffer is sent once its oldest entry is older than the window."""
+    print("Testing digest time window...")
+    app, client = make_digest_app()
+    headers = use_digest(client, 'digest-window@example.com')
+    other = use_digest(client, 'digest-other@example.com')
+    
+    create(client, headers, 'Old')
+    create(client, other, 'Recent')
+    with app.app_context():
+        old = PendingNotification.query.filter_by(todo_title='Old').one()
+        old.created_at = datetime.utcnow() - timedelta(seconds=61)
+        db.session.commit()
+        
+        assert flush_due_digests() == 1
+        email = EmailOutbox.query.one()
+        assert email.recipients == 'digest-window@example.com'
+        assert email.subject == 'Your TodoApp Digest: 1 New Todo'
+        assert [item.todo_title for item in PendingNotification.query] == ['Recent']
+    print("✓ Digest is sent once the time window has passed")
+
+def test_leaving_digest_mode():
+    """Switching to instant sends the buffer; switching to off drops it."""
+    print("Testing leaving digest mode...")
+    app, client = make_digest_app()
+    headers = use_digest(client, 'digest-leave@example.com')
+    
+    create(client, headers, 'Buffered')
+    response = client.put('/api/me/notifications', json={'mode': 'instant'}, headers=headers)
+    assert response.get_json()['mode'] == 'instant'
+    with app.app_context():
+        assert [email.subject for email in EmailOutbox.query] == ['Your TodoApp Digest: 1 New Todo']
+        assert PendingNotification.query.count() == 0
+    
+    create(client, headers, 'Instant')
+    with app.app_context():
+        assert EmailOutbox.query.count() == 2
+    
+    client.put('/api/me/notifications', json={'mode': 'digest'}, headers=headers)
+    create(client, headers, 'Dropped')
+    client.put('/api/me/notifications', json={'mode': 'off'}, headers=headers)
+    create(client, headers, 'Silent')
+    with app.app_context():
+        assert EmailOutbox.query.count() == 2
+        assert PendingNotification.query.count() == 0
+    
+    response = client.put('/api/me/notifications', json={'mode': 'weekly'}, headers=headers)
+    assert response.status_code == 400
+    print("✓ Leaving digest mode flushes or discards the buffer")
+
+def main():
+    """Run all tests."""
+    print("Starting digest tests...\n")
+    try:
+        test_digest_buffers_and_flushes_on_count()
+        test_digest_flushes_on_window()
+        test_leaving_digest_mode()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All digest tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Offline test for the notification email templates.
+Checks that every notification type renders a subject, text and HTML body,
+that titles are escaped in HTML only, that long lists are capped and that
+the templates are compiled once.
+"""
+
+import sys
+
+from jinja2 import UndefinedError
+
+from app.utils import email_templates
+from app.utils.email_templates import NOTIFICATION_TYPES, render_notification
+
+TITLES = ['Buy milk', '<script>alert(1)</script>', 'Tom & Jerry']
+
+def render(name, titles=TITLES, max_listed=20):
+    return render_notification(name, title=titles[0], titles=titles, count=len(titles), max_listed=max_listed)
+
+def test_every_type_renders():
+    """Each notification type has a one-line subject and both bodies."""
+    print("Testing notification types...")
+    for name in NOTIFICATION_TYPES:
+        subject, text_body, html_body = render(name)
+        assert subject and '\n' not in subject, name
+        assert 'Buy milk' in text_body and 'Buy milk' in html_body, name
+        assert html_body.startswith('<html>') and text_body.endswith('TodoApp Team\n'), name
+    
+    assert render('todo_created')[0] == 'New Todo Created - TodoApp'
+    assert render('todos_created')[0] == '3 New Todos Created - TodoApp'
+    assert render('due_soon', titles=['One'])[0] == '1 Todo Due Soon - TodoApp'
+    print("✓ Every notification type renders")
+
+def test_html_is_escaped():
+    """Titles are escaped in HTML bodies and left as typed in text bodies."""
+    print("Testing escaping...")
+    for name in NOTIFICATION_TYPES:
+        subject, text_body, html_body = render(name, titles=TITLES[1:])
+        assert '<script>' not in html_body and '&lt;script&gt;' in html_body, name
+        assert '<script>alert(1)</script>' in text_body, name
+        assert '&amp;' not in subject + text_body, name
+    print("✓ HTML bodies escape titles")
+
+def test_list_is_capped():
+    """Only max_listed titles are listed, followed by a count of the rest."""
+    print("Testing list capping...")
+    titles = [f'Todo {i}' for i in range(5)]
+    _, text_body, html_body = render('digest', titles=titles, max_listed=2)
+    assert [line for line in text_body.splitlines() if line.startswith('  ')] == [
+        '  - Todo 0', '  - Todo 1', '  ...and 3 more'
+    ]
+    assert html_body.count('<li>') == 3 and '...and 3 more' in html_body
+    
+    _, text_body, _ = render('digest', titles=titles, max_listed=5)
+    assert 'more' not in text_body
+    print("✓ Long lists are capped")
+
+def test_templates_are_precompiled():
+    """Rendering reuses the templates compiled at import and rejects missing context."""
+    print("Testing precompiled templates...")
+    assert set(email_templates._compiled) == set(NOTIFICATION_TYPES)
+    compiled = dict(email_templates._compiled)
+    render('todo_created')
+    assert email_templates._compiled == compiled
+    
+    try:
+        render_notification('todos_created', titles=TITLES)
+    except UndefinedError:
+        pass
+    else:
+        raise AssertionError('Missing template variables should raise')
+    print("✓ Templates are compiled once and strict about context")
+
+def main():
+    """Run all tests."""
+    print("Starting email template tests...\n")
+    try:
+        test_every_type_renders()
+        test_html_is_escaped()
+        test_list_is_capped()
+        test_templates_are_precompiled()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All email template tests passed")
+
+if __name__ == "__main__":
+    main()
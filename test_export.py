@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Offline test for GET /api/todos/export.
+Checks that NDJSON, CSV and JSON exports stream the same todos as the list
+endpoint, that list filters and sorts apply, and that bad input is rejected.
+"""
+
+import csv
+import io
+import json
+import sys
+
+from conftest import make_app, register
+
+def make_export_client():
+    """A client whose user has five todos, two of them completed, exported in tiny batches."""
+    app = make_app(EXPORT_BATCH_SIZE=2)
+    client = app.test_client()
+    headers = register(client, 'export@example.com')
+    for i in range(5):
+        todo = client.post('/api/todos', json={'title': f'Todo {i}', 'description': f'Line {i}'}, headers=headers).get_json()['todo']
+        if i % 2:
+            client.put(f"/api/todos/{todo['id']}", json={'completed': True}, headers=headers)
+    return client, headers
+
+def test_export_formats():
+    """Every format carries the list endpoint's todos in the list endpoint's order."""
+    print("Testing export formats...")
+    client, headers = make_export_client()
+    expected = client.get('/api/todos', headers=headers).get_json()['todos']
+    assert len(expected) == 5
+    
+    response = client.get('/api/todos/export', headers=headers)
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.headers['Content-Disposition'] == 'attachment; filename=todos.ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line) for line in lines] == expected
+    
+    response = client.get('/api/todos/export?format=json', headers=headers)
+    assert response.mimetype == 'application/json'
+    assert response.headers['Content-Disposition'] == 'attachment; filename=todos.json'
+    assert json.loads(response.get_data(as_text=True)) == {'todos': expected}
+    
+    response = client.get('/api/todos/export?format=CSV', headers=headers)
+    assert response.mimetype == 'text/csv'
+    assert response.headers['Content-Disposition'] == 'attachment; filename=todos.csv'
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [int(row['id']) for row in rows] == [todo['id'] for todo in expected]
+    assert [row['completed'] for row in rows] == [str(todo['completed']) for todo in expected]
+    assert rows[0]['description'] == expected[0]['description']
+    print("✓ NDJSON, JSON and CSV exports match the list")
+
+def test_export_filters():
+    """Filters and sorts narrow and order the export like the list."""
+    print("Testing export filters...")
+    client, headers = make_export_client()
+    
+    response = client.get('/api/todos/export?completed=true&sort=title', headers=headers)
+    exported = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [todo['title'] for todo in exported] == ['Todo 1', 'Todo 3']
+    assert exported == client.get('/api/todos?completed=true&sort=title', headers=headers).get_json()['todos']
+    
+    response = client.get('/api/todos/export?format=csv&title[prefix]=Todo 4', headers=headers)
+    assert response.get_data(as_text=True).count('Todo 4') == 1
+    
+    empty = client.get('/api/todos/export?format=json&title[prefix]=Nothing', headers=headers)
+    assert json.loads(empty.get_data(as_text=True)) == {'todos': []}
+    print("✓ Export applies list filters and sorts")
+
+def test_export_rejects_bad_input():
+    """Unknown formats and invalid list parameters return 400 before streaming."""
+    print("Testing export validation...")
+    client, headers = make_export_client()
+    
+    response = client.get('/api/todos/export?format=xml', headers=headers)
+    assert response.status_code == 400
+    assert 'ndjson' in response.get_json()['error']
+    assert client.get('/api/todos/export?sort=nope', headers=headers).status_code == 400
+    assert client.get('/api/todos/export?description[eq]=x', headers=headers).status_code == 400
+    assert client.get('/api/todos/export').status_code == 401
+    print("✓ Bad export requests are rejected")
+
+def main():
+    """Run all tests."""
+    print("Starting export tests...\n")
+    try:
+        test_export_formats()
+        test_export_filters()
+        test_export_rejects_bad_input()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All export tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Offline test for sparse fields, the columns shape and MessagePack responses.
+Checks that fields= projects the list and single-todo responses, that
+shape=columns transposes the list, that cursors still work when the sort
+key is not selected, and that MessagePack decodes to the JSON content.
+"""
+
+import sys
+from datetime import datetime, timezone
+
+from app.utils.encoding import msgpack
+from conftest import make_client
+
+MSGPACK = {'Accept': 'application/msgpack'}
+
+def make_fields_client():
+    client, headers = make_client('fields@example.com')
+    for i in range(5):
+        client.post('/api/todos', json={'title': f'Todo {i}', 'description': f'Details {i}'}, headers=headers)
+    return client, headers
+
+def test_fields_projection():
+    """Only the requested fields are returned."""
+    print("Testing fields projection...")
+    client, headers = make_fields_client()
+    full = client.get('/api/todos', headers=headers).get_json()['todos']
+    
+    todos = client.get('/api/todos?fields=title,id,title', headers=headers).get_json()['todos']
+    assert todos == [{'title': todo['title'], 'id': todo['id']} for todo in full]
+    
+    todo = client.get(f"/api/todos/{full[0]['id']}?fields=completed", headers=headers).get_json()['todo']
+    assert todo == {'completed': False}
+    
+    assert client.get('/api/todos?fields=title,secret', headers=headers).status_code == 400
+    assert client.get(f"/api/todos/{full[0]['id']}?fields=user", headers=headers).status_code == 400
+    print("✓ fields= selects the requested columns")
+
+def test_columns_shape():
+    """shape=columns returns one array per field."""
+    print("Testing columns shape...")
+    client, headers = make_fields_client()
+    full = client.get('/api/todos', headers=headers).get_json()['todos']
+    
+    columns = client.get('/api/todos?fields=id,completed&shape=columns', headers=headers).get_json()['todos']
+    assert columns == {'id': [todo['id'] for todo in full], 'completed': [False] * 5}
+    assert client.get('/api/todos?shape=table', headers=headers).status_code == 400
+    print("✓ shape=columns transposes the list")
+
+def test_cursor_without_sort_field():
+    """Pages chain correctly when the sort key is not among the fields."""
+    print("Testing cursors with sparse fields...")
+    client, headers = make_fields_client()
+    
+    titles = []
+    url = '/api/todos?fields=title&sort=-created_at&limit=2'
+    while True:
+        body = client.get(url, headers=headers).get_json()
+        titles += [todo['title'] for todo in body['todos']]
+        assert all(set(todo) == {'title'} for todo in body['todos'])
+        if not body['next_cursor']:
+            break
+        url = f"/api/todos?fields=title&sort=-created_at&limit=2&cursor={body['next_cursor']}"
+    assert titles == [f'Todo {i}' for i in reversed(range(5))], titles
+    print("✓ Cursors work without the sort field selected")
+
+def test_msgpack_responses():
+    """MessagePack carries the same content, with native timestamps."""
+    print("Testing MessagePack responses...")
+    if msgpack is None:
+        print("- Skipped: the optional msgpack package is not installed")
+        return
+    client, headers = make_fields_client()
+    full = client.get('/api/todos', headers=headers).get_json()
+    
+    response = client.get('/api/todos', headers=dict(headers, **MSGPACK))
+    assert response.mimetype == 'application/msgpack'
+    body = msgpack.unpackb(response.data, timestamp=3)
+    assert body['count'] == full['count']
+    for packed, todo in zip(body['todos'], full['todos']):
+        assert packed['created_at'] == datetime.fromisoformat(todo['created_at']).replace(tzinfo=timezone.utc)
+        assert {key: value for key, value in packed.items() if not key.endswith('_at')} == \
+            {key: value for key, value in todo.items() if not key.endswith('_at')}
+    
+    # Cached JSON must not be served to a MessagePack client, or the reverse
+    assert client.get('/api/todos', headers=headers).mimetype == 'application/json'
+    response = client.get('/api/todos?fields=id&shape=columns', headers=dict(headers, Accept='application/x-msgpack'))
+    assert msgpack.unpackb(response.data)['todos'] == {'id': [todo['id'] for todo in full['todos']]}
+    
+    todo_id = full['todos'][0]['id']
+    response = client.get(f'/api/todos/{todo_id}?fields=id,title', headers=dict(headers, **MSGPACK))
+    assert msgpack.unpackb(response.data) == {'todo': {'id': todo_id, 'title': full['todos'][0]['title']}}
+    
+    response = client.get('/api/todos', headers=dict(headers, Accept='application/json, application/msgpack;q=0.5'))
+    assert response.mimetype == 'application/json'
+    print("✓ MessagePack decodes to the JSON content")
+
+def main():
+    """Run all tests."""
+    print("Starting fields and MessagePack tests...\n")
+    try:
+        test_fields_projection()
+        test_columns_shape()
+        test_cursor_without_sort_field()
+        test_msgpack_responses()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All fields and MessagePack tests passed")
+
+if __name__ == "__main__":
+    main()
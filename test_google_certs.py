@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Offline test for Google ID token verification.
+Signs tokens with a locally generated RSA key, serves the matching
+certificate set from a local HTTP server and checks /api/auth/google-verify
+and the cert cache without touching the network.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import rsa
+from google.auth import crypt, jwt as google_jwt
+
+from conftest import make_app
+from app.utils.google_certs import GoogleCertCache
+
+CLIENT_ID = 'test-client.apps.googleusercontent.com'
+
+def make_key(key_id):
+    """Return a (signer, public PEM) pair for a fresh RSA key."""
+    public_key, private_key = rsa.newkeys(1024)
+    signer = crypt.RSASigner.from_string(private_key.save_pkcs1().decode(), key_id=key_id)
+    return signer, public_key.save_pkcs1().decode()
+
+def make_token(signer, **overrides):
+    now = int(time.time())
+    payload = {
+        'iss': 'https://accounts.google.com',
+        'aud': CLIENT_ID,
+        'sub': '1234567890',
+        'email': 'google-user@example.com',
+        'iat': now,
+        'exp': now + 300
+    }
+    payload.update(overrides)
+    return google_jwt.encode(signer, payload).decode()
+
+class CertServer(ThreadingHTTPServer):
+    """Serves a key set with a short max-age and counts requests."""
+    
+    def __init__(self, certs, max_age=1):
+        self.certs = certs
+        self.max_age = max_age
+        self.requests = 0
+        super().__init__(('127.0.0.1', 0), CertHandler)
+    
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/oauth2/v1/certs'
+
+class CertHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests += 1
+        body = json.dumps(self.server.certs).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Cache-Control', f'public, max-age={self.server.max_age}')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+def start_server(certs, max_age=1):
+    server = CertServer(certs, max_age)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def make_client(certs_url):
+    return make_app(GOOGLE_CLIENT_ID=CLIENT_ID, GOOGLE_CERTS_URL=certs_url).test_client()
+
+def test_google_verify_endpoint():
+    """Valid tokens log in; bad audience, issuer or signature are rejected."""
+    print("Testing Google token verification...")
+    signer, public_pem = make_key('key-1')
+    server = start_server({'key-1': public_pem}, max_age=60)
+    client = make_client(server.url)
+    
+    response = client.post('/api/auth/google-verify', json={'credential': make_token(signer)})
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()['user']['email'] == 'google-user@example.com'
+    
+    for bad in (make_token(signer, aud='someone-else'),
+                make_token(signer, iss='https://evil.example.com'),
+                make_token(make_key('key-1')[0])):
+        response = client.post('/api/auth/google-verify', json={'credential': bad})
+        assert response.status_code == 400, response.get_json()
+    
+    # Every request above was served from one fetch
+    assert server.requests == 1, server.requests
+    server.shutdown()
+    print("✓ Google token verification works offline")
+
+def test_cert_cache_max_age():
+    """Certs are refetched only after max-age, or early for an unknown key id."""
+    print("Testing Google cert cache...")
+    signer, public_pem = make_key('key-1')
+    server = start_server({'key-1': public_pem}, max_age=1)
+    cache = GoogleCertCache(server.url, min_refresh_interval=0)
+    
+    cache.verify(make_token(signer), CLIENT_ID)
+    cache.verify(make_token(signer), CLIENT_ID)
+    assert server.requests == 1, server.requests
+    
+    time.sleep(1.1)
+    cache.verify(make_token(signer), CLIENT_ID)
+    assert server.requests == 2, server.requests
+    
+    # Key rotation: a token signed with a new key forces a refresh
+    rotated, rotated_pem = make_key('key-2')
+    server.certs = {'key-1': public_pem, 'key-2': rotated_pem}
+    cache.verify(make_token(rotated), CLIENT_ID)
+    assert server.requests == 3, server.requests
+    server.shutdown()
+    print("✓ Cert cache honours max-age and key rotation")
+
+def test_offline_key_file():
+    """A file:// key set verifies without any HTTP request."""
+    print("Testing offline key file...")
+    signer, public_pem = make_key('key-1')
+    path = os.path.join(tempfile.mkdtemp(), 'certs.json')
+    with open(path, 'w') as f:
+        json.dump({'key-1': public_pem}, f)
+    
+    claims = GoogleCertCache('file://' + path).verify(make_token(signer), CLIENT_ID)
+    assert claims['email'] == 'google-user@example.com'
+    print("✓ Offline key file verification works")
+
+def main():
+    """Run all tests."""
+    print("Starting Google certificate tests...\n")
+    try:
+        test_google_verify_endpoint()
+        test_cert_cache_max_age()
+        test_offline_key_file()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All Google certificate tests passed")
+
+if __name__ == "__main__":
+    main()
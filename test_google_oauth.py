@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Offline test for the Google OAuth code flow.
+Points the token and userinfo endpoints at google_stub.py and checks
+connection reuse, timeouts, retries and the circuit breaker.
+"""
+
+import sys
+import time
+
+import requests
+
+from conftest import make_app
+from app.utils.google_oauth import GoogleOAuth
+from google_stub import GoogleStub
+
+def make_stub_app(stub, **overrides):
+    settings = dict(
+        GOOGLE_CLIENT_ID='test-client',
+        GOOGLE_CLIENT_SECRET='test-secret',
+        GOOGLE_TOKEN_URL=stub.url + '/token',
+        GOOGLE_USERINFO_URL=stub.url + '/userinfo',
+        HTTP_READ_TIMEOUT=0.5,
+        HTTP_BACKOFF_FACTOR=0,
+        HTTP_CIRCUIT_FAILURES=3,
+        HTTP_CIRCUIT_RESET_SECONDS=1
+    )
+    settings.update(overrides)
+    return make_app(**settings)
+
+def test_callback_reuses_connection():
+    """Repeated callbacks log in over one keep-alive connection."""
+    print("Testing Google OAuth callback...")
+    stub = GoogleStub().start()
+    client = make_stub_app(stub).test_client()
+    
+    for _ in range(3):
+        response = client.get('/api/auth/google/callback?code=stub-code')
+        assert response.status_code == 302, response.get_data(as_text=True)
+        assert 'token=' in response.headers['Location']
+    
+    assert stub.requests == 6, stub.requests
+    assert stub.connections == 1, stub.connections
+    stub.stop()
+    print("✓ OAuth callback reuses one connection")
+
+def test_retries_and_timeouts():
+    """GETs are retried on 503, token exchanges are not, slow upstreams time out."""
+    print("Testing retries and timeouts...")
+    stub = GoogleStub().start()
+    app = make_stub_app(stub)
+    
+    with app.test_request_context():
+        stub.fail_next(1)
+        assert GoogleOAuth.get_user_info('stub-access-token')['email'] == 'stub-user@example.com'
+        
+        stub.fail_next(1)
+        assert GoogleOAuth.exchange_code_for_token('stub-code') is None
+        
+        stub.delay = 2
+        start = time.monotonic()
+        assert GoogleOAuth.exchange_code_for_token('stub-code') is None
+        assert time.monotonic() - start < 2, 'read timeout not applied'
+        stub.delay = 0
+    
+    stub.stop()
+    print("✓ Retries and timeouts work")
+
+def test_circuit_breaker():
+    """After repeated failures calls fail fast, then recover after the reset timeout."""
+    print("Testing circuit breaker...")
+    stub = GoogleStub().start()
+    app = make_stub_app(stub, HTTP_RETRIES=0)
+    
+    with app.test_request_context():
+        stub.fail_next(3)
+        for _ in range(3):
+            assert GoogleOAuth.exchange_code_for_token('stub-code') is None
+        
+        requests_before = stub.requests
+        assert GoogleOAuth.exchange_code_for_token('stub-code') is None
+        assert stub.requests == requests_before, 'open circuit still called upstream'
+        
+        time.sleep(1.1)
+        assert GoogleOAuth.exchange_code_for_token('stub-code') is not None
+    
+    stub.stop()
+    print("✓ Circuit breaker opens and recovers")
+
+def test_failed_trial_reopens():
+    """A trial call that fails with any request error reopens the circuit for one timeout."""
+    print("Testing failed half-open trial...")
+    stub = GoogleStub().start()
+    app = make_stub_app(stub, HTTP_RETRIES=0)
+    client = app.extensions['http_client']
+    
+    with app.test_request_context():
+        stub.fail_next(3)
+        for _ in range(3):
+            assert GoogleOAuth.exchange_code_for_token('stub-code') is None
+        time.sleep(1.1)
+        
+        send = client.session.request
+        def redirect_loop(*args, **kwargs):
+            raise requests.TooManyRedirects('redirect loop')
+        client.session.request = redirect_loop
+        assert GoogleOAuth.exchange_code_for_token('stub-code') is None
+        client.session.request = send
+        
+        time.sleep(1.1)
+        assert GoogleOAuth.exchange_code_for_token('stub-code') is not None
+    
+    stub.stop()
+    print("✓ Failed trial reopens the circuit")
+
+def main():
+    """Run all tests."""
+    print("Starting Google OAuth tests...\n")
+    try:
+        test_callback_reuses_connection()
+        test_retries_and_timeouts()
+        test_circuit_breaker()
+        test_failed_trial_reopens()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All Google OAuth tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Offline test for the identity cache.
+Checks that authenticated requests are served from cached user snapshots
+without querying the users table, and that account changes invalidate the
+snapshot at once.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app import db
+from app.models import User
+from app.utils.identity import invalidate_identity
+from conftest import make_app, register
+
+@contextmanager
+def count_user_queries(app):
+    """Count the statements that read the users table while the block runs."""
+    queries = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and 'FROM users' in statement:
+            queries.append(statement)
+    
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+def test_requests_skip_user_lookup():
+    """After the first request, /me, /verify-token and todo routes do not query users."""
+    print("Testing cached identity lookups...")
+    app = make_app()
+    client = app.test_client()
+    headers = register(client, 'identity@example.com')
+    
+    with count_user_queries(app) as queries:
+        first = client.get('/api/me', headers=headers).get_json()['user']
+        for _ in range(3):
+            assert client.get('/api/me', headers=headers).get_json()['user'] == first
+        assert client.get('/api/verify-token', headers=headers).get_json()['user'] == first
+        assert client.post('/api/todos', json={'title': 'Cached'}, headers=headers).status_code == 201
+        assert client.get('/api/todos', headers=headers).status_code == 200
+    assert first['email'] == 'identity@example.com'
+    assert len(queries) <= 1, queries
+    
+    metrics = client.get('/api/metrics/cache', headers=headers).get_json()['identity']
+    assert metrics['hits'] >= 5 and metrics['misses'] <= 1, metrics
+    print("✓ Authenticated requests reuse the cached identity")
+
+def test_account_changes_invalidate():
+    """Changing the notification mode or removing the user is seen by the next request."""
+    print("Testing identity invalidation...")
+    app = make_app()
+    client = app.test_client()
+    headers = register(client, 'identity-change@example.com')
+    
+    assert client.get('/api/me/notifications', headers=headers).get_json()['mode'] == 'instant'
+    assert client.put('/api/me/notifications', json={'mode': 'off'}, headers=headers).status_code == 200
+    assert client.get('/api/me/notifications', headers=headers).get_json()['mode'] == 'off'
+    
+    user_id = client.get('/api/me', headers=headers).get_json()['user']['id']
+    with app.app_context():
+        db.session.execute(db.delete(User).where(User.id == user_id))
+        db.session.commit()
+        # Still cached until invalidated or expired
+        assert client.get('/api/me', headers=headers).status_code == 200
+        invalidate_identity(user_id)
+    assert client.get('/api/me', headers=headers).status_code == 404
+    assert client.get('/api/verify-token', headers=headers).status_code == 404
+    print("✓ Account changes invalidate the cached identity")
+
+def test_identity_expires():
+    """Once the TTL has passed the user is read again."""
+    print("Testing identity TTL...")
+    app = make_app(IDENTITY_CACHE_TTL=0.05)
+    client = app.test_client()
+    headers = register(client, 'identity-ttl@example.com')
+    
+    with count_user_queries(app) as queries:
+        for _ in range(3):
+            assert client.get('/api/me', headers=headers).status_code == 200
+            time.sleep(0.1)
+    assert len(queries) == 3, queries
+    print("✓ Expired identities are reloaded")
+
+def main():
+    """Run all tests."""
+    print("Starting identity cache tests...\n")
+    try:
+        test_requests_skip_user_lookup()
+        test_account_changes_invalidate()
+        test_identity_expires()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All identity cache tests passed")
+
+if __name__ == "__main__":
+    main()
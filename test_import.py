@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Offline test for POST /api/todos/import.
+Checks NDJSON and CSV imports in batches, per-line errors and their cap,
+streamed progress events and the stats counters.
+"""
+
+import json
+import sys
+
+from conftest import make_app, register
+
+NDJSON_BODY = '\n'.join([
+    json.dumps({'title': 'First', 'description': ' spaced '}),
+    '',
+    json.dumps({'title': '   '}),
+    '{not json',
+    json.dumps({'title': 'Second'}),
+    json.dumps(['not', 'an', 'object']),
+    json.dumps({'title': 'Third', 'description': 3}),
+    json.dumps({'title': 'Fourth'})
+]) + '\n'
+
+CSV_BODY = (
+    'title,description\n'
+    'Alpha,"Spans\ntwo lines"\n'
+    ',No title\n'
+    'Beta,\n'
+    'Gamma,x,extra\n'
+)
+
+def make_import_client(**overrides):
+    app = make_app(IMPORT_BATCH_SIZE=2, **overrides)
+    client = app.test_client()
+    return client, register(client, 'import@example.com')
+
+def test_import_ndjson():
+    """Valid lines are inserted in batches; invalid ones are reported by line number."""
+    print("Testing NDJSON import...")
+    client, headers = make_import_client()
+    
+    response = client.post('/api/todos/import', data=NDJSON_BODY,
+                           content_type='application/x-ndjson', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    summary = response.get_json()
+    assert (summary['imported'], summary['failed'], summary['batches']) == (3, 4, 2), summary
+    assert [error['line'] for error in summary['errors']] == [3, 4, 6, 7]
+    assert summary['errors_truncated'] is False
+    
+    todos = client.get('/api/todos?sort=id', headers=headers).get_json()['todos']
+    assert [todo['title'] for todo in todos] == ['First', 'Second', 'Fourth']
+    assert todos[0]['description'] == 'spaced' and todos[0]['completed'] is False
+    assert client.get('/api/todos/stats', headers=headers).get_json()['total_todos'] == 3
+    print("✓ NDJSON import inserts valid lines in batches")
+
+def test_import_csv():
+    """CSV is picked by content type; quoted newlines stay inside one record."""
+    print("Testing CSV import...")
+    client, headers = make_import_client()
+    
+    response = client.post('/api/todos/import?batch_size=10', data=CSV_BODY,
+                           content_type='text/csv', headers=headers)
+    summary = response.get_json()
+    assert (summary['imported'], summary['failed'], summary['batches']) == (2, 2, 1), summary
+    assert [error['error'] for error in summary['errors']] == ['Title is required', 'Too many fields']
+    
+    todos = client.get('/api/todos?sort=id', headers=headers).get_json()['todos']
+    assert [(todo['title'], todo['description']) for todo in todos] == [('Alpha', 'Spans\ntwo lines'), ('Beta', '')]
+    
+    response = client.post('/api/todos/import?format=csv', data='title\nDelta\n',
+                           content_type='application/octet-stream', headers=headers)
+    assert response.get_json()['imported'] == 1
+    print("✓ CSV import handles quoted newlines and extra fields")
+
+def test_import_streamed_progress():
+    """With Accept: application/x-ndjson the events are streamed back."""
+    print("Testing streamed import progress...")
+    client, headers = make_import_client()
+    
+    body = ''.join(json.dumps({'title': f'Todo {i}'}) + '\n' for i in range(5)) + 'oops\n'
+    response = client.post('/api/todos/import', data=body, content_type='application/x-ndjson',
+                           headers=dict(headers, Accept='application/x-ndjson'))
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    
+    assert [event['event'] for event in events] == ['progress', 'progress', 'error', 'done']
+    assert [event['imported'] for event in events[:2]] == [2, 4]
+    assert events[2] == {'event': 'error', 'line': 6, 'error': events[2]['error']}
+    assert events[-1] == {'event': 'done', 'imported': 5, 'failed': 1, 'batches': 3}
+    print("✓ Import streams progress, error and done events")
+
+def test_import_error_cap_and_validation():
+    """Only IMPORT_MAX_ERRORS errors are listed; bad parameters return 400."""
+    print("Testing import error cap and validation...")
+    client, headers = make_import_client(IMPORT_MAX_ERRORS=2, IMPORT_MAX_BATCH_SIZE=50)
+    
+    response = client.post('/api/todos/import', data='{}\n' * 5, content_type='application/x-ndjson', headers=headers)
+    summary = response.get_json()
+    assert summary['failed'] == 5 and len(summary['errors']) == 2
+    assert summary['errors_truncated'] is True
+    
+    for query in ['format=xml', 'batch_size=0', 'batch_size=abc']:
+        response = client.post(f'/api/todos/import?{query}', data='{}\n', headers=headers)
+        assert response.status_code == 400, query
+    
+    # Oversized batches are clamped to IMPORT_MAX_BATCH_SIZE, not rejected
+    body = ''.join(json.dumps({'title': f'Todo {i}'}) + '\n' for i in range(60))
+    response = client.post('/api/todos/import?batch_size=1000', data=body, headers=headers)
+    assert response.get_json()['batches'] == 2
+    assert client.post('/api/todos/import', data='{}\n').status_code == 401
+    print("✓ Import caps listed errors and rejects bad parameters")
+
+def main():
+    """Run all tests."""
+    print("Starting import tests...\n")
+    try:
+        test_import_ndjson()
+        test_import_csv()
+        test_import_streamed_progress()
+        test_import_error_cap_and_validation()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All import tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Offline test for the JSON providers.
+Checks that the orjson provider produces the same documents as the stdlib
+provider, both for raw values and for API responses read from one database.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from datetime import date, datetime
+
+from app.utils.json_provider import OrjsonProvider, TodoJSONProvider, orjson
+from conftest import make_app, register
+
+SAMPLE = {
+    'todo': {
+        'id': 7,
+        'title': 'Café ☕ "quoted" \\ </script>',
+        'completed': False,
+        'description': None,
+        'created_at': datetime(2024, 5, 1, 12, 30, 15, 123456),
+        'updated_at': datetime(2024, 5, 1, 12, 30, 15)
+    },
+    'due': date(2024, 5, 2),
+    'counts': {1: 'one', 2: 'two'},
+    'values': [1.5, -3, True, None, 'x' * 100]
+}
+
+PATHS = ['/api/todos', '/api/todos?completed=true', '/api/todos/stats', '/api/me', '/api/me/notifications']
+
+def test_provider_parity():
+    """Both providers encode the same values, including datetimes and int keys."""
+    print("Testing provider parity...")
+    app = make_app(JSON_PROVIDER='stdlib')
+    stdlib_text = TodoJSONProvider(app).dumps(SAMPLE)
+    orjson_text = OrjsonProvider(app).dumps(SAMPLE)
+    
+    assert json.loads(orjson_text) == json.loads(stdlib_text)
+    decoded = json.loads(orjson_text)
+    assert decoded['todo']['created_at'] == '2024-05-01T12:30:15.123456'
+    assert decoded['todo']['updated_at'] == '2024-05-01T12:30:15'
+    assert decoded['due'] == '2024-05-02'
+    assert OrjsonProvider(app).loads(orjson_text) == json.loads(stdlib_text)
+    
+    sorted_text = OrjsonProvider(app).dumps({'b': 1, 'a': 2}, sort_keys=True)
+    assert sorted_text == '{"a":2,"b":1}'
+    print("✓ orjson and stdlib encode the same documents")
+
+def test_response_parity():
+    """API responses are identical under both providers for the same rows."""
+    print("Testing response parity...")
+    database = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'shared.db')
+    stdlib_client = make_app(JSON_PROVIDER='stdlib', SQLALCHEMY_DATABASE_URI=database).test_client()
+    orjson_client = make_app(JSON_PROVIDER='orjson', SQLALCHEMY_DATABASE_URI=database).test_client()
+    
+    headers = register(stdlib_client, 'json@example.com')
+    for i in range(3):
+        todo = stdlib_client.post('/api/todos', json={'title': f'Todo é {i}', 'description': '<b>x</b>'},
+                                  headers=headers).get_json()['todo']
+    stdlib_client.put(f"/api/todos/{todo['id']}", json={'completed': True}, headers=headers)
+    
+    for path in PATHS + [f"/api/todos/{todo['id']}"]:
+        expected = stdlib_client.get(path, headers=headers)
+        actual = orjson_client.get(path, headers=headers)
+        assert expected.status_code == actual.status_code == 200, path
+        assert actual.mimetype == 'application/json', path
+        assert actual.get_json() == expected.get_json(), path
+    
+    created = orjson_client.post('/api/todos', json={'title': 'From orjson'}, headers=headers)
+    assert created.status_code == 201
+    todo = created.get_json()['todo']
+    assert stdlib_client.get(f"/api/todos/{todo['id']}", headers=headers).get_json()['todo'] == todo
+    print("✓ API responses match under both providers")
+
+def test_unknown_provider():
+    """An unknown JSON_PROVIDER fails at startup."""
+    print("Testing provider selection...")
+    try:
+        make_app(JSON_PROVIDER='simplejson')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('Unknown providers should be rejected')
+    
+    expected = OrjsonProvider if orjson is not None else TodoJSONProvider
+    assert type(make_app(JSON_PROVIDER='auto').json) is expected
+    print("✓ Provider selection is validated")
+
+def main():
+    """Run all tests."""
+    print("Starting JSON provider tests...\n")
+    try:
+        test_provider_parity()
+        test_response_parity()
+        test_unknown_provider()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All JSON provider tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Offline test for the todo list filter language.
+Checks filters, multi-key sorts and keyset pagination over mixed sort
+directions against an in-memory reference ordering.
+"""
+
+import sys
+
+from conftest import make_client
+
+def list_todos(client, headers, query):
+    response = client.get(f'/api/todos?{query}', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+def test_filters():
+    """Prefix, ID list and date range filters combine with AND."""
+    print("Testing list filters...")
+    client, headers = make_client('filters@example.com')
+    todos = [client.post('/api/todos', json={'title': title}, headers=headers).get_json()['todo']
+             for title in ['Buy milk', 'buy_bread', 'Call mom', 'Buy% eggs']]
+    
+    titles = lambda query: sorted(todo['title'] for todo in list_todos(client, headers, query)['todos'])
+    assert titles('title[prefix]=buy') == ['Buy milk', 'Buy% eggs', 'buy_bread']
+    assert titles('title[prefix]=Buy%25') == ['Buy% eggs']
+    assert titles('title[prefix]=buy_') == ['buy_bread']
+    assert titles(f"id[in]={todos[0]['id']},{todos[2]['id']}") == ['Buy milk', 'Call mom']
+    assert titles(f"created_at[gte]={todos[2]['created_at']}&title[prefix]=b") == ['Buy% eggs']
+    # Range-only fields need an operator; a plain parameter is ignored
+    assert len(titles(f"created_at={todos[2]['created_at']}")) == 4
+    
+    for query in ('owner[eq]=1', 'title[gt]=a', 'created_at[lt]=soon', 'sort=secret', 'id[in]=x'):
+        assert client.get(f'/api/todos?{query}', headers=headers).status_code == 400, query
+    print("✓ Filters work and are whitelisted")
+
+def test_multi_key_pagination():
+    """Pages over a mixed-direction sort match the full ordering."""
+    print("Testing multi-key sort pagination...")
+    client, headers = make_client('filters@example.com')
+    for index in range(7):
+        todo = client.post('/api/todos', json={'title': f'Todo {index % 3}'}, headers=headers).get_json()['todo']
+        if index % 2:
+            client.put(f"/api/todos/{todo['id']}", json={'completed': True}, headers=headers)
+    
+    expected = [todo['id'] for todo in list_todos(client, headers, 'sort=-completed,title')['todos']]
+    reference = sorted(list_todos(client, headers, '')['todos'], key=lambda todo: todo['id'])
+    reference.sort(key=lambda todo: todo['title'])
+    reference.sort(key=lambda todo: todo['completed'], reverse=True)
+    assert expected == [todo['id'] for todo in reference], expected
+    
+    paged, cursor = [], None
+    while True:
+        page = list_todos(client, headers, 'sort=-completed,title&limit=2' + (f'&cursor={cursor}' if cursor else ''))
+        paged += [todo['id'] for todo in page['todos']]
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    assert paged == expected, paged
+    print("✓ Multi-key sort pages match the full list")
+
+def main():
+    """Run all tests."""
+    print("Starting list filter tests...\n")
+    try:
+        test_filters()
+        test_multi_key_pagination()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All list filter tests passed")
+
+if __name__ == "__main__":
+    main()
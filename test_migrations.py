@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Offline test for the versioned migrations in migrate_db.py.
+Drops the access-pattern indexes from a database, runs the migrations and
+checks the indexes come back, are applied once, and are used by the list
+query.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from sqlalchemy import inspect, text
+
+from app import db
+from conftest import make_app
+
+TODO_INDEXES = {
+    'ix_todos_user_created_id', 'ix_todos_user_updated_id', 'ix_todos_user_title_id',
+    'ix_todos_user_completed_id', 'ix_todos_user_completed_created'
+}
+
+def run_migrations(database_url, *args):
+    env = dict(os.environ, DATABASE_URL=database_url, MAIL_OUTBOX_IN_PROCESS='False')
+    result = subprocess.run([sys.executable, 'migrate_db.py', *args], env=env,
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+def todo_indexes(app):
+    with app.app_context():
+        return {index['name'] for index in inspect(db.engine).get_indexes('todos')}
+
+def test_migrations_restore_indexes():
+    """Missing indexes are created once and recorded as applied."""
+    print("Testing migrations...")
+    database_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test.db')
+    app = make_app(SQLALCHEMY_DATABASE_URI=database_url)
+    
+    # A database created before the indexes existed
+    with app.app_context():
+        for name in TODO_INDEXES:
+            db.session.execute(text(f'DROP INDEX {name}'))
+        db.session.commit()
+    assert not TODO_INDEXES & todo_indexes(app)
+    
+    output = run_migrations(database_url)
+    assert 'Applying migration 1' in output, output
+    assert TODO_INDEXES <= todo_indexes(app)
+    
+    assert 'up to date' in run_migrations(database_url)
+    status = run_migrations(database_url, 'status')
+    assert '[x] 001' in status and '[ ]' not in status, status
+    print("✓ Migrations create missing indexes once")
+
+def test_list_query_uses_index():
+    """Listing a user's newest todos is a range scan on the composite index."""
+    print("Testing index use...")
+    app = make_app()
+    with app.app_context():
+        plan = db.session.execute(text(
+            'EXPLAIN QUERY PLAN SELECT id FROM todos WHERE user_id = 1 '
+            'ORDER BY created_at DESC, id DESC LIMIT 10'
+        )).all()
+    details = ' '.join(row[-1] for row in plan)
+    assert 'ix_todos_user_created_id' in details and 'TEMP B-TREE' not in details, details
+    print("✓ List query uses ix_todos_user_created_id")
+
+def main():
+    """Run all tests."""
+    print("Starting migration tests...\n")
+    try:
+        test_migrations_restore_indexes()
+        test_list_query_uses_index()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All migration tests passed")
+
+if __name__ == "__main__":
+    main()
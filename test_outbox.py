@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Offline test for the email outbox worker.
+Drains the outbox against smtp_stub.py and checks batching over one SMTP
+connection, retries with backoff, dropped connections and the recovery of
+stale claims.
+"""
+
+import smtplib
+import sys
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import EmailOutbox
+from app.utils.email import send_email
+from conftest import make_app
+from smtp_stub import SMTPStub
+
+def make_outbox_app(stub, **overrides):
+    settings = dict(
+        MAIL_SUPPRESS_SEND=False,
+        MAIL_SERVER='127.0.0.1',
+        MAIL_PORT=stub.port,
+        MAIL_USE_TLS=False,
+        MAIL_USERNAME='noreply@example.com',
+        MAIL_OUTBOX_BATCH_SIZE=2,
+        MAIL_OUTBOX_MAX_ATTEMPTS=2,
+        MAIL_OUTBOX_BACKOFF_SECONDS=30
+    )
+    settings.update(overrides)
+    return make_app(**settings)
+
+def queue(count):
+    for index in range(count):
+        send_email(f'Message {index}', 'noreply@example.com', ['user@example.com'], f'Body {index}')
+    db.session.commit()
+
+def make_due():
+    """Move every pending message's next attempt into the past."""
+    db.session.execute(db.update(EmailOutbox).values(next_attempt_at=datetime.utcnow() - timedelta(seconds=1)))
+    db.session.commit()
+
+def statuses():
+    return [item.status for item in EmailOutbox.query.order_by(EmailOutbox.id)]
+
+def test_drain_delivers_batches():
+    """Every due message is sent, in batches, over one connection."""
+    print("Testing outbox delivery...")
+    stub = SMTPStub().start()
+    app = make_outbox_app(stub)
+    worker = app.extensions['outbox_worker']
+    
+    with app.app_context():
+        queue(5)
+        assert worker.drain() == 5
+        assert statuses() == ['sent'] * 5
+        assert all(item.claim_token is None for item in EmailOutbox.query)
+    
+    assert len(stub.messages) == 5 and stub.connections == 1, (len(stub.messages), stub.connections)
+    stub.stop()
+    print("✓ Outbox drains over one connection")
+
+def test_retry_with_backoff():
+    """Rejected messages back off, are retried, and give up after the last attempt."""
+    print("Testing outbox retries...")
+    stub = SMTPStub().start()
+    app = make_outbox_app(stub)
+    worker = app.extensions['outbox_worker']
+    
+    with app.app_context():
+        queue(1)
+        stub.fail_next(1)
+        assert worker.drain() == 0
+        item = EmailOutbox.query.one()
+        assert (item.status, item.attempts) == ('pending', 1)
+        assert item.next_attempt_at > datetime.utcnow() + timedelta(seconds=25)
+        assert '451' in item.last_error
+        
+        # Not due yet
+        assert worker.drain() == 0
+        make_due()
+        assert worker.drain() == 1
+        assert statuses() == ['sent']
+        
+        queue(1)
+        stub.fail_next(2)
+        worker.drain()
+        make_due()
+        worker.drain()
+        assert statuses() == ['sent', 'failed']
+    
+    stub.stop()
+    print("✓ Failed sends back off and give up")
+
+def test_dropped_connection():
+    """A disconnect fails the current message and returns the rest of the batch."""
+    print("Testing dropped SMTP connections...")
+    stub = SMTPStub().start()
+    app = make_outbox_app(stub)
+    worker = app.extensions['outbox_worker']
+    
+    with app.app_context():
+        queue(2)
+        stub.fail_next(1, 'disconnect')
+        try:
+            worker.drain()
+            assert False, 'disconnect was not raised'
+        except smtplib.SMTPServerDisconnected:
+            pass
+        
+        items = EmailOutbox.query.order_by(EmailOutbox.id).all()
+        assert [(item.status, item.attempts, item.claim_token) for item in items] == [
+            ('pending', 1, None), ('pending', 0, None)
+        ]
+        assert worker.drain() == 1
+        make_due()
+        assert worker.drain() == 1
+        assert statuses() == ['sent', 'sent']
+    
+    stub.stop()
+    print("✓ Dropped connections release the batch")
+
+def test_stale_claims():
+    """Claims are exclusive until they expire, then another worker takes over."""
+    print("Testing stale claims...")
+    stub = SMTPStub().start()
+    app = make_outbox_app(stub, MAIL_OUTBOX_CLAIM_TIMEOUT=60)
+    worker = app.extensions['outbox_worker']
+    
+    with app.app_context():
+        queue(2)
+        claimed = worker.claim_batch()
+        first_token = claimed[0].claim_token
+        assert len(claimed) == 2 and statuses() == ['sending', 'sending']
+        assert worker.claim_batch() == []
+        
+        # The claiming worker died long ago
+        db.session.execute(db.update(EmailOutbox).values(claimed_at=datetime.utcnow() - timedelta(seconds=61)))
+        db.session.commit()
+        reclaimed = worker.claim_batch()
+        assert [item.id for item in reclaimed] == [item.id for item in claimed]
+        assert reclaimed[0].claim_token != first_token
+        
+        worker.release(reclaimed)
+        assert worker.drain() == 2
+    
+    stub.stop()
+    print("✓ Stale claims are recovered")
+
+def main():
+    """Run all tests."""
+    print("Starting outbox tests...\n")
+    try:
+        test_drain_delivers_batches()
+        test_retry_with_backoff()
+        test_dropped_connection()
+        test_stale_claims()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All outbox tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Offline test for keyset cursor pagination of GET /api/todos.
+Checks that pages cover the full ordering exactly once, that writes between
+pages do not shift later pages, and that bad limits and cursors are rejected.
+"""
+
+import sys
+
+from conftest import make_client
+
+def get_page(client, headers, query):
+    response = client.get(f'/api/todos?{query}', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+def collect(client, headers, query, limit):
+    """Follow next_cursor from the first page to the last; returns the IDs."""
+    ids, cursor = [], None
+    while True:
+        page = get_page(client, headers, f'{query}&limit={limit}' + (f'&cursor={cursor}' if cursor else ''))
+        assert page['count'] == len(page['todos']) <= limit
+        ids += [todo['id'] for todo in page['todos']]
+        cursor = page['next_cursor']
+        if not cursor:
+            return ids
+
+def test_pages_cover_ordering():
+    """Paging through any sort order yields the unpaginated list."""
+    print("Testing cursor pagination...")
+    client, headers = make_client('pages@example.com')
+    for index in range(7):
+        client.post('/api/todos', json={'title': f'Todo {index % 3}'}, headers=headers)
+    
+    for query in ('sort_by=created_at&order=desc', 'sort_by=created_at&order=asc', 'sort_by=title&order=asc'):
+        expected = [todo['id'] for todo in get_page(client, headers, query)['todos']]
+        assert len(expected) == 7
+        for limit in (1, 2, 3, 7):
+            assert collect(client, headers, query, limit) == expected, (query, limit)
+    
+    # Titles repeat, so ties must be broken by ID
+    titles = [todo['title'] for todo in get_page(client, headers, 'sort_by=title&order=asc')['todos']]
+    assert titles == sorted(titles)
+    print("✓ Pages cover the full ordering exactly once")
+
+def test_pages_are_stable_under_writes():
+    """A todo created between pages does not duplicate or skip rows."""
+    print("Testing pagination during writes...")
+    client, headers = make_client('stable@example.com')
+    created = [client.post('/api/todos', json={'title': f'Todo {index}'}, headers=headers).get_json()['todo']['id']
+               for index in range(4)]
+    
+    first = get_page(client, headers, 'limit=2')
+    client.post('/api/todos', json={'title': 'Newest'}, headers=headers)
+    second = get_page(client, headers, f"limit=2&cursor={first['next_cursor']}")
+    
+    ids = [todo['id'] for todo in first['todos'] + second['todos']]
+    assert ids == created[::-1], ids
+    assert second['next_cursor'] is None
+    print("✓ Later pages are unaffected by new todos")
+
+def test_invalid_parameters():
+    """Bad limits and cursors are rejected; large limits are clamped."""
+    print("Testing pagination parameters...")
+    client, headers = make_client('params@example.com', TODOS_MAX_PAGE_SIZE=3)
+    for index in range(5):
+        client.post('/api/todos', json={'title': f'Todo {index}'}, headers=headers)
+    
+    assert get_page(client, headers, 'limit=100')['count'] == 3
+    cursor = get_page(client, headers, 'limit=2&sort_by=title&order=asc')['next_cursor']
+    for query in ('limit=0', 'limit=abc', 'cursor=not-a-cursor', f'cursor={cursor}&sort_by=created_at'):
+        assert client.get(f'/api/todos?{query}', headers=headers).status_code == 400, query
+    print("✓ Invalid limits and cursors are rejected")
+
+def main():
+    """Run all tests."""
+    print("Starting pagination tests...\n")
+    try:
+        test_pages_cover_ordering()
+        test_pages_are_stable_under_writes()
+        test_invalid_parameters()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All pagination tests passed")
+
+if __name__ == "__main__":
+    main()
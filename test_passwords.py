@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Offline test for password hashing.
+Runs registration and login with inline hashing and with a one-process
+pool, and checks rehash on login, the bounds on background rehashing and
+the 503 when the pool is saturated.
+"""
+
+import sys
+import threading
+import time
+
+from app import db
+from app.models import User
+from conftest import make_app, register
+
+FAST_METHOD = 'pbkdf2:sha256:1000'
+
+def login(client, email, password='secret123'):
+    return client.post('/api/login', json={'email': email, 'password': password})
+
+def stored_hash(app, email):
+    with app.app_context():
+        return db.session.query(User.password_hash).filter_by(email=email).scalar()
+
+def test_hash_and_verify():
+    """Registration hashes with the configured method and login verifies it."""
+    for workers in (0, 1):
+        print(f"Testing hashing with {workers} worker(s)...")
+        app = make_app(PASSWORD_HASH_METHOD=FAST_METHOD, PASSWORD_HASH_WORKERS=workers)
+        client = app.test_client()
+        register(client, 'hash@example.com')
+        
+        assert stored_hash(app, 'hash@example.com').startswith(FAST_METHOD + '$')
+        assert login(client, 'hash@example.com').status_code == 200
+        assert login(client, 'hash@example.com', 'wrong-password').status_code == 401
+        print(f"✓ Hashing works with {workers} worker(s)")
+
+def test_rehash_on_login():
+    """A login upgrades a hash made with an older method."""
+    print("Testing rehash on login...")
+    app = make_app(PASSWORD_HASH_METHOD=FAST_METHOD, PASSWORD_HASH_WORKERS=0)
+    register(app.test_client(), 'rehash@example.com')
+    
+    upgraded = make_app(SQLALCHEMY_DATABASE_URI=app.config['SQLALCHEMY_DATABASE_URI'],
+                        PASSWORD_HASH_METHOD='pbkdf2:sha256:2000', PASSWORD_HASH_WORKERS=1)
+    assert login(upgraded.test_client(), 'rehash@example.com').status_code == 200
+    
+    deadline = time.monotonic() + 10
+    while not stored_hash(upgraded, 'rehash@example.com').startswith('pbkdf2:sha256:2000$'):
+        assert time.monotonic() < deadline, 'hash was not upgraded'
+        time.sleep(0.05)
+    assert login(upgraded.test_client(), 'rehash@example.com').status_code == 200
+    print("✓ Login rehashes with the new method")
+
+def test_rehash_is_bounded():
+    """Rehashes are queued once per user, capped, and skipped when no slot is free."""
+    print("Testing bounded rehashing...")
+    app = make_app(PASSWORD_HASH_METHOD=FAST_METHOD, PASSWORD_HASH_WORKERS=0)
+    register(app.test_client(), 'bounded@example.com')
+    with app.app_context():
+        user_id, old_hash = db.session.query(User.id, User.password_hash).filter_by(email='bounded@example.com').one()
+    
+    upgraded = make_app(SQLALCHEMY_DATABASE_URI=app.config['SQLALCHEMY_DATABASE_URI'],
+                        PASSWORD_HASH_METHOD='pbkdf2:sha256:2000', PASSWORD_HASH_WORKERS=1,
+                        PASSWORD_HASH_MAX_PENDING=1)
+    hasher = upgraded.extensions['password_hasher']
+    
+    # No free hashing slot: the rehash gives up at once instead of waiting
+    hasher._slots.acquire()
+    try:
+        started = time.monotonic()
+        hasher.rehash_in_background(user_id, old_hash, 'secret123').result(timeout=5)
+        assert time.monotonic() - started < hasher.timeout
+    finally:
+        hasher._slots.release()
+    assert stored_hash(upgraded, 'bounded@example.com') == old_hash
+    
+    # While a rehash is queued, repeats for the user and past the cap are dropped
+    release = threading.Event()
+    blocker = hasher._get_rehash_executor().submit(release.wait)
+    queued = hasher.rehash_in_background(user_id, old_hash, 'secret123')
+    assert queued is not None
+    assert hasher.rehash_in_background(user_id, old_hash, 'secret123') is None
+    assert hasher.rehash_in_background(user_id + 1, old_hash, 'secret123') is None
+    release.set()
+    blocker.result(timeout=5)
+    queued.result(timeout=10)
+    
+    assert stored_hash(upgraded, 'bounded@example.com').startswith('pbkdf2:sha256:2000$')
+    assert hasher._rehashing == set()
+    print("✓ Rehashing is bounded and never waits for a slot")
+
+def test_busy_pool():
+    """Callers get a 503 when every hashing slot stays taken."""
+    print("Testing saturated hashing pool...")
+    app = make_app(PASSWORD_HASH_METHOD=FAST_METHOD, PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_MAX_PENDING=1)
+    client = app.test_client()
+    hasher = app.extensions['password_hasher']
+    
+    # Hold the only slot, as a long-running hash would
+    hasher._slots.acquire()
+    hasher.timeout = 0.2
+    try:
+        response = client.post('/api/register', json={'email': 'busy@example.com', 'password': 'secret123'})
+        assert response.status_code == 503, response.get_json()
+    finally:
+        hasher.timeout = app.config['PASSWORD_HASH_TIMEOUT']
+        hasher._slots.release()
+    
+    register(client, 'busy@example.com')
+    print("✓ Saturated pool answers 503")
+
+def main():
+    """Run all tests."""
+    print("Starting password hashing tests...\n")
+    try:
+        test_hash_and_verify()
+        test_rehash_on_login()
+        test_rehash_is_bounded()
+        test_busy_pool()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All password hashing tests passed")
+
+if __name__ == "__main__":
+    main()
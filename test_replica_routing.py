@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Offline test for read-replica routing.
+Simulates a primary and a lagging replica with two SQLite files and checks
+which one authenticated GET requests read from.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from app import db
+from app.models import Todo
+from conftest import make_app, register
+
+def make_replica_app():
+    directory = tempfile.mkdtemp()
+    app = make_app(
+        SQLALCHEMY_DATABASE_URI='sqlite:///' + os.path.join(directory, 'primary.db'),
+        SQLALCHEMY_BINDS={'replica': 'sqlite:///' + os.path.join(directory, 'replica.db')},
+        DB_REPLICA_STICKY_SECONDS=1,
+        CACHE_BACKEND='null',
+        IDENTITY_CACHE_TTL=0
+    )
+    return app, directory
+
+def replicate(app, directory):
+    """Bring the replica up to date by copying the primary."""
+    with app.app_context():
+        db.engines['replica'].dispose()
+    shutil.copy(os.path.join(directory, 'primary.db'), os.path.join(directory, 'replica.db'))
+
+def titles(client, headers):
+    response = client.get('/api/todos', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return sorted(todo['title'] for todo in response.get_json()['todos'])
+
+def test_replica_routing():
+    """Reads go to the replica except right after the user's own writes."""
+    print("Testing read-replica routing...")
+    app, directory = make_replica_app()
+    client = app.test_client()
+    
+    headers = register(client, 'replica@example.com')
+    client.post('/api/todos', json={'title': 'first'}, headers=headers)
+    replicate(app, directory)
+    
+    # A write the replica has not received yet
+    assert client.post('/api/todos', json={'title': 'second'}, headers=headers).status_code == 201
+    
+    # Read-your-writes: the writer sticks to the primary
+    assert titles(client, headers) == ['first', 'second']
+    assert client.get('/api/me', headers=headers).status_code == 200
+    
+    # Once stickiness expires, reads come from the lagging replica
+    time.sleep(1.1)
+    assert titles(client, headers) == ['first']
+    
+    # Writes never go to the replica
+    with app.app_context():
+        assert Todo.query.count() == 2
+    
+    replicate(app, directory)
+    assert titles(client, headers) == ['first', 'second']
+    print("✓ Read-replica routing works")
+
+def main():
+    """Run all tests."""
+    print("Starting replica routing tests...\n")
+    try:
+        test_replica_routing()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All replica routing tests passed")
+
+if __name__ == "__main__":
+    main()
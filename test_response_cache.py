@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Offline test for the per-user response cache.
+Checks hits, invalidation on writes, isolation between users, and that two
+app instances with per-process caches on one database never serve each
+other's stale lists or stats.
+"""
+
+import os
+import sys
+import tempfile
+
+from conftest import make_app, register
+
+def cache_metrics(client, headers):
+    response = client.get('/api/metrics/cache', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+def titles(client, headers):
+    return [todo['title'] for todo in client.get('/api/todos', headers=headers).get_json()['todos']]
+
+def total(client, headers):
+    return client.get('/api/todos/stats', headers=headers).get_json()['total_todos']
+
+def test_hits_and_invalidation():
+    """Repeated reads hit the cache; writes make cached reads unreachable."""
+    print("Testing response cache hits...")
+    client = make_app().test_client()
+    headers = register(client, 'cache@example.com')
+    todo_id = client.post('/api/todos', json={'title': 'First'}, headers=headers).get_json()['todo']['id']
+    
+    for path in ('/api/todos', f'/api/todos/{todo_id}', '/api/todos/stats'):
+        client.get(path, headers=headers)
+        before = cache_metrics(client, headers)['hits']
+        client.get(path, headers=headers)
+        assert cache_metrics(client, headers)['hits'] == before + 1, path
+    
+    client.put(f'/api/todos/{todo_id}', json={'title': 'Renamed'}, headers=headers)
+    assert titles(client, headers) == ['Renamed']
+    assert client.get(f'/api/todos/{todo_id}', headers=headers).get_json()['todo']['title'] == 'Renamed'
+    client.post('/api/todos', json={'title': 'Second'}, headers=headers)
+    assert total(client, headers) == 2
+    
+    assert client.get('/api/metrics/cache').status_code == 401
+    
+    # Off unless the deployment opts in
+    client = make_app(METRICS_ENABLED=False).test_client()
+    assert client.get('/api/metrics/cache', headers=register(client, 'cache@example.com')).status_code == 404
+    print("✓ Cache hits and invalidation work")
+
+def test_users_are_isolated():
+    """The same URL is cached separately per user."""
+    print("Testing per-user cache keys...")
+    client = make_app().test_client()
+    alice = register(client, 'alice@example.com')
+    bob = register(client, 'bob@example.com')
+    client.post('/api/todos', json={'title': 'Alice todo'}, headers=alice)
+    
+    assert titles(client, alice) == ['Alice todo']
+    assert titles(client, bob) == []
+    print("✓ Users never see each other's cached responses")
+
+def test_instances_share_versions():
+    """A write on one instance is visible on another with its own LRU cache."""
+    print("Testing cache across app instances...")
+    database_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test.db')
+    first = make_app(SQLALCHEMY_DATABASE_URI=database_url).test_client()
+    second = make_app(SQLALCHEMY_DATABASE_URI=database_url).test_client()
+    headers = register(first, 'shared@example.com')
+    
+    assert titles(second, headers) == [] and total(second, headers) == 0
+    first.post('/api/todos', json={'title': 'From first'}, headers=headers)
+    assert titles(second, headers) == ['From first']
+    assert total(second, headers) == 1
+    print("✓ Other instances see writes")
+
+def main():
+    """Run all tests."""
+    print("Starting response cache tests...\n")
+    try:
+        test_hits_and_invalidation()
+        test_users_are_isolated()
+        test_instances_share_versions()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All response cache tests passed")
+
+if __name__ == "__main__":
+    main()
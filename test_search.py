@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Offline test for todo full-text search on the SQLite FTS5 index.
+Checks ranking, highlighting, cursor pagination and that the index follows
+creates, updates, bulk updates and deletes.
+"""
+
+import sys
+
+from conftest import make_client
+
+def search(client, headers, query):
+    response = client.get(f'/api/todos/search?{query}', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+def test_search_ranking_and_pagination():
+    """Title matches rank first, matches are highlighted, cursors page through results."""
+    print("Testing search ranking and pagination...")
+    client, headers = make_client('search@example.com')
+    client.post('/api/todos', json={'title': 'Call the bank', 'description': 'about <milk> money'}, headers=headers)
+    client.post('/api/todos', json={'title': 'Buy milk', 'description': 'semi-skimmed'}, headers=headers)
+    client.post('/api/todos', json={'title': 'Walk the dog'}, headers=headers)
+    
+    result = search(client, headers, 'q=milk')
+    assert [todo['title'] for todo in result['todos']] == ['Buy milk', 'Call the bank'], result
+    assert result['todos'][0]['highlights']['title'] == 'Buy <mark>milk</mark>'
+    assert result['todos'][1]['highlights']['description'] == 'about &lt;<mark>milk</mark>&gt; money'
+    
+    first = search(client, headers, 'q=milk&limit=1')
+    second = search(client, headers, f"q=milk&limit=1&cursor={first['next_cursor']}")
+    assert [todo['title'] for todo in first['todos'] + second['todos']] == ['Buy milk', 'Call the bank']
+    assert second['next_cursor'] is None
+    
+    assert client.get('/api/todos/search?q=%20', headers=headers).status_code == 400
+    print("✓ Search ranks, highlights and paginates")
+
+def test_search_index_stays_in_sync():
+    """Updates, bulk updates and deletes are reflected in search results."""
+    print("Testing search index sync...")
+    client, headers = make_client('search@example.com')
+    todo_id = client.post('/api/todos', json={'title': 'Buy milk'}, headers=headers).get_json()['todo']['id']
+    other_id = client.post('/api/todos', json={'title': 'Walk the dog'}, headers=headers).get_json()['todo']['id']
+    
+    client.put(f'/api/todos/{todo_id}', json={'title': 'Buy bread'}, headers=headers)
+    assert search(client, headers, 'q=milk')['count'] == 0
+    assert search(client, headers, 'q=bread')['count'] == 1
+    
+    client.put('/api/todos/bulk-update', json={'todo_ids': [other_id], 'updates': {'title': 'Walk to the bakery for bread'}}, headers=headers)
+    assert search(client, headers, 'q=bread')['count'] == 2
+    assert search(client, headers, 'q=dog')['count'] == 0
+    
+    client.delete(f'/api/todos/{todo_id}', headers=headers)
+    assert [todo['id'] for todo in search(client, headers, 'q=bread')['todos']] == [other_id]
+    print("✓ Search index follows todo writes")
+
+def main():
+    """Run all tests."""
+    print("Starting search tests...\n")
+    try:
+        test_search_ranking_and_pagination()
+        test_search_index_stays_in_sync()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All search tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Offline test for the per-user todo_stats summary.
+Checks the counters, that the row exists from registration, and that
+concurrent first writes for a user without a row all succeed.
+"""
+
+import sys
+import threading
+
+from sqlalchemy import text
+
+from app import db
+from conftest import make_app, register
+
+def stats(client, headers):
+    response = client.get('/api/todos/stats', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+def test_counters():
+    """Creates, completions and deletes keep the counters right."""
+    print("Testing todo stats counters...")
+    app = make_app()
+    client = app.test_client()
+    headers = register(client, 'stats@example.com')
+    with app.app_context():
+        assert db.session.execute(text("SELECT COUNT(*) FROM todo_stats")).scalar() == 1
+    
+    ids = [client.post('/api/todos', json={'title': f'Todo {i}'}, headers=headers).get_json()['todo']['id'] for i in range(3)]
+    client.put(f'/api/todos/{ids[0]}', json={'completed': True}, headers=headers)
+    client.delete(f'/api/todos/{ids[1]}', headers=headers)
+    assert stats(client, headers) == {
+        'total_todos': 2, 'completed_todos': 1, 'pending_todos': 1, 'completion_rate': 50.0
+    }
+    print("✓ Stats counters follow writes")
+
+def test_concurrent_first_writes():
+    """Requests racing to create a missing stats row do not fail."""
+    print("Testing concurrent first writes...")
+    app = make_app()
+    headers = register(app.test_client(), 'race@example.com')
+    with app.app_context():
+        db.session.execute(text("DELETE FROM todo_stats"))
+        db.session.commit()
+    
+    statuses = []
+    def request(method, path, **kwargs):
+        statuses.append(getattr(app.test_client(), method)(path, headers=headers, **kwargs).status_code)
+    
+    threads = [threading.Thread(target=request, args=('get', path)) for path in ('/api/todos', '/api/todos/stats')]
+    threads += [threading.Thread(target=request, args=('post', '/api/todos'), kwargs={'json': {'title': f'Todo {i}'}})
+                for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert statuses.count(200) == 2 and statuses.count(201) == 4, statuses
+    assert stats(app.test_client(), headers)['total_todos'] == 4
+    print("✓ Concurrent first writes succeed")
+
+def main():
+    """Run all tests."""
+    print("Starting todo stats tests...\n")
+    try:
+        test_counters()
+        test_concurrent_first_writes()
+    except AssertionError as e:
+        print(f"✗ Test failed: {e}")
+        sys.exit(1)
+    print("\n✓ All todo stats tests passed")
+
+if __name__ == "__main__":
+    main()
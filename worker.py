@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Standalone outbox worker for TodoApp.
+Drains the email_outbox table with MAIL_OUTBOX_WORKERS threads. Run it as
+a separate process and set MAIL_OUTBOX_IN_PROCESS=False on the web service.
+"""
+
+import signal
+import threading
+from run import app
+
+def main():
+    worker = app.extensions['outbox_worker']
+    stopped = threading.Event()
+    
+    def shutdown(signum, frame):
+        stopped.set()
+    
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    
+    worker.start()
+    print(f"Outbox worker started with {app.config['MAIL_OUTBOX_WORKERS']} threads")
+    stopped.wait()
+    
+    print("Stopping outbox worker...")
+    worker.stop(timeout=30)
+
+if __name__ == '__main__':
+    main()